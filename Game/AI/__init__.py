@@ -0,0 +1,4 @@
+from .behavior import Node, Selector, Sequence, Condition, Action, Utility
+from .perception import Perception
+from .brain import ThinkContext, COW_BRAIN, INTENT_NAMES
+from .director import AIDirector
@@ -0,0 +1,100 @@
+"""Behavior tree nodes.
+
+A tree is evaluated once per decision (an agent "thinking"), not every tick: leaves read the
+ThinkContext and an Action leaf commits the agent's intent, which the agent then carries out
+every tick until its next decision. Nodes return True (success) or False (failure); nothing
+is left running between decisions, so an agent's whole AI state is its intent.
+"""
+
+
+class Node:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str = ""):
+        self.name = name or type(self).__name__
+
+    def tick(self, ctx) -> bool:
+        raise NotImplementedError
+
+
+class Selector(Node):
+    """Succeeds with the first child that succeeds."""
+
+    __slots__ = ("children",)
+
+    def __init__(self, *children, name: str = ""):
+        super().__init__(name)
+        self.children = children
+
+    def tick(self, ctx) -> bool:
+        for child in self.children:
+            if child.tick(ctx):
+                return True
+        return False
+
+
+class Sequence(Node):
+    """Succeeds when every child succeeds, in order; stops at the first failure."""
+
+    __slots__ = ("children",)
+
+    def __init__(self, *children, name: str = ""):
+        super().__init__(name)
+        self.children = children
+
+    def tick(self, ctx) -> bool:
+        for child in self.children:
+            if not child.tick(ctx):
+                return False
+        return True
+
+
+class Condition(Node):
+    __slots__ = ("test",)
+
+    def __init__(self, test, name: str = ""):
+        super().__init__(name or test.__name__)
+        self.test = test
+
+    def tick(self, ctx) -> bool:
+        return bool(self.test(ctx))
+
+
+class Action(Node):
+    """Leaf that commits an intent; run(ctx) returns False when the action cannot start."""
+
+    __slots__ = ("run",)
+
+    def __init__(self, run, name: str = ""):
+        super().__init__(name or run.__name__)
+        self.run = run
+
+    def tick(self, ctx) -> bool:
+        return bool(self.run(ctx))
+
+
+class Utility(Node):
+    """
+    Utility selector: scores every option with score(ctx) and tries them from the highest score
+    down (declaration order breaks ties), skipping scores <= 0. Succeeds with the first option
+    that succeeds. The scores of the last evaluation are kept in ctx.scores under the option names.
+    """
+
+    __slots__ = ("options",)
+
+    def __init__(self, *options, name: str = ""):
+        super().__init__(name)
+        self.options = options  # (score, node) pairs
+
+    def tick(self, ctx) -> bool:
+        scored = []
+        for order, (score, node) in enumerate(self.options):
+            value = float(score(ctx))
+            ctx.scores[node.name] = value
+            if value > 0.0:
+                scored.append((-value, order, node))
+        scored.sort(key=lambda item: (item[0], item[1]))
+        for _, _, node in scored:
+            if node.tick(ctx):
+                return True
+        return False
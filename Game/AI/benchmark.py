@@ -0,0 +1,69 @@
+"""Benchmark for the AI director: a crowd of AI cows in a headless arena.
+
+Reports the cost per tick of the whole simulation and of the decisions alone, how many decisions
+were made and deferred per tick under the budget, what the crowd ended up doing and how often
+navigation answers came from the shared caches.
+
+Run: python -m Game.AI.benchmark [--bots 300] [--ticks 600] [--max-decisions 24] [--budget-ms 2.0] [--interest]
+"""
+
+import argparse
+import time
+
+from Game.headless import create_headless_arena
+
+
+def run_benchmark(bots: int = 300, ticks: int = 600, max_decisions: int = 24, budget_ms: float = None,
+                  interest: bool = False, world_size=(6000, 4500), seed: int = 1):
+    """Returns (arena, ms per tick, think ms per tick, peak think ms, decisions per tick, peak deferred)."""
+    from Game.Character.ai_cow import AICow
+    from Game.Arena.interest import InterestManager
+
+    arena = create_headless_arena(world_size=world_size, seed=seed)
+    arena.ai.max_decisions = max_decisions
+    arena.ai.budget_ms = budget_ms
+    if interest:
+        arena.interest = InterestManager()
+    w, h = arena.world_dimensions
+    for i in range(bots):
+        arena.add_new_character(AICow((0, 0, 50, 50), f"bot{i}", (i * 7919 % w, i * 104729 % h), camera_display_size=(900, 600),
+                                      world_display_size=(w, h), move_speed=180))
+    if interest:
+        arena.interest.add_observer(arena.characters[0])
+    think_total = 0.0
+    think_peak = 0.0
+    deferred_peak = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        arena.tick()
+        think_total += arena.ai.think_ms
+        think_peak = max(think_peak, arena.ai.think_ms)
+        deferred_peak = max(deferred_peak, arena.ai.deferred)
+    elapsed = (time.perf_counter() - start) * 1000.0
+    return arena, elapsed / ticks, think_total / ticks, think_peak, arena.ai.decisions / ticks, deferred_peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bots", type=int, default=300)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--max-decisions", type=int, default=24, help="decisions per tick")
+    parser.add_argument("--budget-ms", type=float, default=None, help="wall-time budget for decisions per tick")
+    parser.add_argument("--interest", action="store_true", help="tier bots by distance to the first bot's camera")
+    args = parser.parse_args(argv)
+
+    arena, tick_ms, think_ms, think_peak, per_tick, deferred = run_benchmark(
+        args.bots, args.ticks, args.max_decisions, args.budget_ms, args.interest)
+    print(f"{args.bots} bots, {args.ticks} ticks: {tick_ms:.2f} ms/tick, decisions {think_ms:.2f} ms/tick "
+          f"(peak {think_peak:.2f}), {per_tick:.1f} decisions/tick, peak deferred {deferred}")
+    alive = sum(1 for c in arena.characters if not c.is_dead())
+    armed = sum(1 for c in arena.characters if c.has_weapon())
+    print(f"alive {alive}, armed {armed}, projectiles {len(arena.projectiles)}, objects {len(arena.objects)}")
+    print("intents:", ", ".join(f"{name} {count}" for name, count in arena.ai.intent_counts().items()))
+    nav = arena.nav
+    print(f"navigation: {nav.field_builds} flow fields built, {nav.field_hits} field lookups, "
+          f"{nav.path_searches} A* searches, {nav.path_hits} cached path lookups")
+
+
+if __name__ == "__main__":
+    main()
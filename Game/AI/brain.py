@@ -0,0 +1,340 @@
+import math
+
+from Game.AI.behavior import Selector, Action, Utility
+from Game.capabilities import capabilities_of, CAP_ARMED
+
+# Intents: what an agent keeps doing every tick between two decisions
+INTENT_WANDER = 0
+INTENT_EAT = 1
+INTENT_PICKUP = 2
+INTENT_ATTACK = 3
+INTENT_FLEE = 4
+INTENT_POOP = 5
+
+INTENT_NAMES = ("wander", "eat", "pickup", "attack", "flee", "poop")
+
+FIRE_INTERVAL_MS = 400   # simulation ms between an agent's shots
+EAT_INTERVAL_MS = 500    # simulation ms between eat presses while standing in a field (the eat cooldown)
+ATTACK_RANGE = (160, 320)  # keep the target between these distances while shooting
+FLEE_HEALTH = 0.35       # health fraction under which an armed enemy nearby makes the agent run
+THREAT_RANGE = 320
+POOP_SCALE = 1.5         # size_scale at which a cow poops to get fast again
+LOW_AMMO = 5
+_MOVES = {(0, -1): ("up",), (0, 1): ("down",), (-1, 0): ("left",), (1, 0): ("right",),
+          (-1, -1): ("up", "left"), (1, -1): ("up", "right"), (-1, 1): ("down", "left"), (1, 1): ("down", "right")}
+
+
+class ThinkContext:
+    """One agent's decision: its perception queries are asked at most once, whatever the tree tries."""
+
+    __slots__ = ("agent", "director", "perception", "scores", "_enemies", "_threat", "_target", "_pickup")
+    _UNSET = object()
+
+    def __init__(self, agent, director):
+        self.agent = agent
+        self.director = director
+        self.perception = director.perception
+        self.scores = {}
+        self._enemies = None
+        self._threat = self._target = self._pickup = self._UNSET
+
+    def enemies(self) -> list:
+        if self._enemies is None:
+            self._enemies = self.perception.visible_enemies(self.agent)
+        return self._enemies
+
+    def threat(self):
+        """Nearest armed enemy within THREAT_RANGE, or None."""
+        if self._threat is self._UNSET:
+            self._threat = None
+            for enemy in self.enemies():
+                if self.perception.distance(self.agent, enemy.position) > THREAT_RANGE:
+                    break
+                if self.perception.is_armed(enemy):
+                    self._threat = enemy
+                    break
+        return self._threat
+
+    def target(self):
+        """Nearest of the closest few enemies the agent can hit, or None."""
+        if self._target is self._UNSET:
+            self._target = None
+            for enemy in self.enemies()[:4]:
+                if self.perception.line_of_fire(self.agent, enemy):
+                    self._target = enemy
+                    break
+        return self._target
+
+    def pickup(self):
+        if self._pickup is self._UNSET:
+            self._pickup = self.perception.nearest_pickup(self.agent)
+        return self._pickup
+
+    def commit(self, intent: int, point=None, character=None) -> bool:
+        agent = self.agent
+        agent.intent = intent
+        agent.path_start = -1
+        agent.target_index = -1 if character is None else self.director.index_of(character)
+        if point is not None:
+            agent.target_point.update(point)
+        return True
+
+
+# ----- Scores -----
+def _health(agent) -> float:
+    return agent.health / max(1, agent.max_health)
+
+
+def _flee_score(ctx) -> float:
+    return 0.9 if _health(ctx.agent) < FLEE_HEALTH and ctx.threat() is not None else 0.0
+
+
+def _poop_score(ctx) -> float:
+    return 0.7 if ctx.agent.size_scale >= POOP_SCALE else 0.0
+
+
+def _attack_score(ctx) -> float:
+    if not ctx.perception.is_armed(ctx.agent):
+        return 0.0
+    target = ctx.target()
+    if target is None:
+        return 0.0
+    return 0.6 + 0.2 * (1.0 - ctx.perception.distance(ctx.agent, target.position) / ctx.perception.sight)
+
+
+def _pickup_score(ctx) -> float:
+    return 0.0 if ctx.agent.has_weapon() else 0.5
+
+
+def _eat_score(ctx) -> float:
+    agent = ctx.agent
+    return 0.45 if agent.has_weapon() and agent.ammo < LOW_AMMO else 0.15
+
+
+def _golden_score(ctx) -> float:
+    # Eating in a golden field can drop a weapon
+    return 0.0 if ctx.agent.has_weapon() else 0.35
+
+
+def _wander_score(ctx) -> float:
+    return 0.05
+
+
+# ----- Actions -----
+def flee(ctx) -> bool:
+    threat = ctx.threat()
+    return threat is not None and ctx.commit(INTENT_FLEE, character=threat)
+
+
+def poop(ctx) -> bool:
+    return ctx.commit(INTENT_POOP)
+
+
+def attack(ctx) -> bool:
+    target = ctx.target()
+    if target is None:
+        return False
+    ctx.agent.set_aim_direction((target.position.x - ctx.agent.position.x, target.position.y - ctx.agent.position.y))
+    return ctx.commit(INTENT_ATTACK, character=target)
+
+
+def pickup(ctx) -> bool:
+    point = ctx.pickup()
+    return point is not None and ctx.commit(INTENT_PICKUP, point)
+
+
+def eat_grass(ctx) -> bool:
+    point = ctx.perception.nearest_field(ctx.agent)
+    return point is not None and ctx.commit(INTENT_EAT, point)
+
+
+def eat_golden(ctx) -> bool:
+    point = ctx.perception.nearest_field(ctx.agent, golden=True)
+    return point is not None and ctx.commit(INTENT_EAT, point)
+
+
+def wander(ctx) -> bool:
+    return ctx.commit(INTENT_WANDER)
+
+
+# Default cow brain: the highest-scoring option that can start wins; wandering always can
+COW_BRAIN = Selector(
+    Utility(
+        (_flee_score, Action(flee)),
+        (_poop_score, Action(poop)),
+        (_attack_score, Action(attack)),
+        (_pickup_score, Action(pickup)),
+        (_eat_score, Action(eat_grass)),
+        (_golden_score, Action(eat_golden)),
+        (_wander_score, Action(wander)),
+    ),
+    Action(wander),
+)
+
+
+# ----- Acting on an intent -----
+def _sign(value: float, deadzone: float) -> int:
+    if value > deadzone:
+        return 1
+    if value < -deadzone:
+        return -1
+    return 0
+
+
+def steer(perception, agent, goal, away: bool = False) -> tuple:
+    """
+    Move keys that take agent toward goal (or away from it). A step that would run into a blocking
+    obstacle or out of the world slides along one axis, or sidesteps around the obstacle.
+    """
+    dx = goal[0] - agent.position.x
+    dy = goal[1] - agent.position.y
+    if away:
+        dx, dy = -dx, -dy
+    deadzone = max(1.0, agent._current_move_step())
+    sx = _sign(dx, deadzone)
+    sy = _sign(dy, deadzone)
+    if not sx and not sy:
+        return ()
+    # Probe one step ahead: longer look-aheads stop agents short of goals beside obstacles
+    probe = int(math.ceil(deadzone))
+    if not perception.blocked(agent, sx, sy, probe):
+        return _MOVES[(sx, sy)]
+    # Prefer the axis with the longer way to go, then the other, then a sidestep (side by agent slot)
+    side = 1 if agent.ai_slot % 2 else -1
+    if abs(dx) >= abs(dy):
+        candidates = ((sx, 0), (0, sy), (0, side), (0, -side))
+    else:
+        candidates = ((0, sy), (sx, 0), (side, 0), (-side, 0))
+    for cx, cy in candidates:
+        if (cx or cy) and not perception.blocked(agent, cx, cy, probe):
+            return _MOVES[(cx, cy)]
+    return ()
+
+
+def follow_field(director, agent, goal) -> tuple:
+    """Move keys toward goal along the shared flow field for goal's cell (Arena.nav)."""
+    nav = director.arena.nav
+    cell = nav.cell_of(agent.position)
+    goal_cell = nav.cell_of(goal)
+    if cell != goal_cell:
+        following = nav.next_cell(agent.layer, cell, goal_cell)
+        if following >= 0:
+            return steer(director.perception, agent, nav.cell_center(following))
+    return steer(director.perception, agent, goal)
+
+
+def follow_path(director, agent, goal) -> tuple:
+    """
+    Move keys toward goal along a cached A* path (Arena.nav). The path is identified by the cell it
+    was planned from and the goal's cell; the agent replans from where it stands when pushed off it.
+    """
+    nav = director.arena.nav
+    cell = nav.cell_of(agent.position)
+    goal_cell = nav.cell_of(goal)
+    if cell == goal_cell:
+        return steer(director.perception, agent, goal)
+    path = nav.find_path(agent.layer, agent.path_start, goal_cell) if agent.path_start >= 0 else None
+    step = agent.path_step
+    if path is not None:
+        # Waypoints passed (diagonal moves can skip one) are dropped
+        for index in range(step, min(step + 3, len(path))):
+            if path[index] == cell:
+                step = index + 1
+                break
+    if path is None or step >= len(path) or not _adjacent(nav, cell, path[step]):
+        path = nav.find_path(agent.layer, cell, goal_cell)
+        agent.path_start = cell
+        step = 1
+        if path is None or len(path) < 2:
+            agent.path_step = 0
+            return steer(director.perception, agent, goal)
+    agent.path_step = step
+    return steer(director.perception, agent, nav.cell_center(path[step]))
+
+
+def _adjacent(nav, cell, other) -> bool:
+    cy, cx = divmod(cell, nav.cols)
+    oy, ox = divmod(other, nav.cols)
+    return abs(cx - ox) <= 1 and abs(cy - oy) <= 1
+
+
+def _move(arena, agent, keys, actions, ticks: int):
+    # Moves go straight to the cow; eat and poop go through the arena for field checks, drops and poop objects
+    agent.set_eating_intent(False)
+    if actions:
+        arena.handle_key_event(actions, [agent])
+    if not keys:
+        return
+    if ticks == 1:
+        agent.handle_key_event(keys)
+        return
+    # Catching up skipped ticks: movement for every tick in one step
+    step = agent._current_move_step() * ticks
+    for key in keys:
+        if key == "up":
+            agent.position.y -= step
+        elif key == "down":
+            agent.position.y += step
+        elif key == "left":
+            agent.position.x -= step
+        elif key == "right":
+            agent.position.x += step
+
+
+def act(director, agent, ticks: int = 1):
+    """Carry out agent's current intent for ticks ticks; asks for a new decision when it is done or void."""
+    arena = director.arena
+    perception = director.perception
+    intent = agent.intent
+    if intent == INTENT_WANDER:
+        agent.set_eating_intent(False)
+        agent.wander(ticks)
+        return
+    if intent == INTENT_POOP:
+        _move(arena, agent, (), ("poop",), ticks)
+        agent.intent = INTENT_WANDER
+        director.request(agent, now=True)
+        return
+    target = None
+    if intent in (INTENT_ATTACK, INTENT_FLEE):
+        target = director.character_at(agent.target_index)
+        if target is None or target.is_dead():
+            agent.intent = INTENT_WANDER
+            director.request(agent, now=True)
+            agent.wander(ticks)
+            return
+        goal = (target.position.x, target.position.y)
+    else:
+        goal = (agent.target_point.x, agent.target_point.y)
+    distance = math.hypot(goal[0] - agent.position.x, goal[1] - agent.position.y)
+    keys = ()
+    actions = ()
+    if intent == INTENT_EAT:
+        if distance > max(1.0, agent._current_move_step()) and arena.in_feeding_field(agent):
+            # Stop at the first feeding spot on the way to the field's centre
+            agent.target_point.update(agent.position)
+            distance = 0.0
+        if distance <= max(1.0, agent._current_move_step()):
+            if arena.now_ms() - agent.last_action >= EAT_INTERVAL_MS:
+                actions = ("eat",)
+                agent.last_action = arena.now_ms()
+        else:
+            keys = follow_field(director, agent, goal)
+    elif intent == INTENT_PICKUP:
+        keys = follow_path(director, agent, goal)
+        if agent.has_weapon() or not keys:
+            # Equipped, or standing where the pickup was and it is gone
+            director.request(agent, now=True)
+    elif intent == INTENT_FLEE:
+        keys = steer(perception, agent, goal, away=True)
+    elif intent == INTENT_ATTACK:
+        if distance > ATTACK_RANGE[1]:
+            keys = steer(perception, agent, goal)
+        elif distance < ATTACK_RANGE[0]:
+            keys = steer(perception, agent, goal, away=True)
+        if not capabilities_of(agent) & CAP_ARMED or not perception.is_armed(agent):
+            director.request(agent, now=True)
+        elif arena.now_ms() - agent.last_action >= FIRE_INTERVAL_MS:
+            if arena.fire_weapon(agent, goal) is not None:
+                agent.last_action = arena.now_ms()
+    _move(arena, agent, keys, actions, ticks)
@@ -0,0 +1,114 @@
+import copy
+import heapq
+import time
+
+from Game.AI.brain import COW_BRAIN, INTENT_NAMES, ThinkContext, act
+from Game.AI.perception import Perception
+
+THINK_JITTER_MS = 17  # extra delay per roster slot (mod 7) so agents that thought together drift apart
+
+
+class AIDirector:
+    """
+    Schedules the arena's AI agents (characters with CAP_AI). An agent thinks (runs its behavior
+    tree over fresh perception) every think_interval_ms of simulation time (Arena.now_ms) or when
+    its intent is done, and acts on its current intent every tick it is updated, so reaction times
+    do not change with the tick rate. Decisions are the expensive part, so they are queued: run()
+    takes at most max_decisions of them per tick, oldest request first (ties by roster order), and
+    defers the rest to the next tick while those agents keep acting on their previous intent. budget_ms additionally stops deciding once that much wall time was spent;
+    it bounds the frame time but makes a run depend on machine speed, so it is off by default.
+    """
+
+    def __init__(self, arena, max_decisions: int = 24, think_interval_ms: int = 500, budget_ms: float = None, brain=None):
+        self.arena = arena
+        self.perception = Perception(arena)
+        self.brain = COW_BRAIN if brain is None else brain
+        self.max_decisions = max(1, int(max_decisions))
+        self.think_interval_ms = max(1, int(think_interval_ms))
+        self.budget_ms = budget_ms
+        self.agents = []    # roster of agents; an agent's ai_slot indexes it
+        self._queue = []    # heap of (simulation ms the decision was due, ai_slot)
+        self._index = {}    # id(character) -> roster index, for intents aimed at a character
+        self._roster_size = 0
+        # Stats of the last run(), plus the running decision total
+        self.decisions = 0
+        self.decided = 0
+        self.deferred = 0
+        self.think_ms = 0.0
+
+    def __deepcopy__(self, memo):
+        # The roster index is keyed by id(); the copy rebuilds it on first use. The brain is shared
+        clone = AIDirector.__new__(AIDirector)
+        memo[id(self)] = clone
+        for name, value in self.__dict__.items():
+            setattr(clone, name, value if name == "brain" else copy.deepcopy(value, memo))
+        clone._index = {}
+        clone._roster_size = 0
+        return clone
+
+    def register(self, agent):
+        agent.ai_slot = len(self.agents)
+        self.agents.append(agent)
+        # Spread first decisions over one interval so a freshly spawned crowd does not think at once
+        agent.next_think = self.arena.now_ms() + agent.ai_slot % 30 * self.think_interval_ms // 30
+
+    def request(self, agent, now: bool = False):
+        """Queue a decision for agent (due now, or at its next_think time)."""
+        if now:
+            agent.next_think = min(agent.next_think, self.arena.now_ms())
+        if not agent.think_queued:
+            agent.think_queued = True
+            heapq.heappush(self._queue, (agent.next_think, agent.ai_slot))
+
+    def rebuild(self):
+        """Requeue the pending decisions after the agents' state was restored (snapshots)."""
+        self._queue = [(agent.next_think, agent.ai_slot) for agent in self.agents if agent.think_queued]
+        heapq.heapify(self._queue)
+
+    def run(self):
+        """Make this tick's decisions within the budget; call once per tick before the agents update."""
+        queue = self._queue
+        agents = self.agents
+        start = time.perf_counter()
+        decided = 0
+        while queue and decided < self.max_decisions:
+            if self.budget_ms is not None and decided and (time.perf_counter() - start) * 1000.0 >= self.budget_ms:
+                break
+            _, slot = heapq.heappop(queue)
+            agent = agents[slot]
+            agent.think_queued = False
+            if agent.is_dead():
+                continue
+            self.think(agent)
+            decided += 1
+        self.decided = decided
+        self.decisions += decided
+        self.deferred = len(queue)
+        self.think_ms = (time.perf_counter() - start) * 1000.0
+
+    def think(self, agent):
+        self.brain.tick(ThinkContext(agent, self))
+        agent.next_think = self.arena.now_ms() + self.think_interval_ms + agent.ai_slot % 7 * THINK_JITTER_MS
+
+    def act(self, agent, ticks: int = 1):
+        act(self, agent, ticks)
+
+    def _sync_roster(self):
+        characters = self.arena.characters
+        for index in range(self._roster_size, len(characters)):
+            self._index[id(characters[index])] = index
+        self._roster_size = len(characters)
+
+    def index_of(self, character) -> int:
+        self._sync_roster()
+        return self._index.get(id(character), -1)
+
+    def character_at(self, index: int):
+        characters = self.arena.characters
+        return characters[index] if 0 <= index < len(characters) else None
+
+    def intent_counts(self) -> dict:
+        counts = dict.fromkeys(INTENT_NAMES, 0)
+        for agent in self.agents:
+            counts[INTENT_NAMES[agent.intent]] += 1
+        return counts
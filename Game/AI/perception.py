@@ -0,0 +1,90 @@
+import math
+
+from Game.Arena.collision import segment_bounds, segment_rect_toi
+from Game.capabilities import capabilities_of, CAP_BODY, CAP_PICKUP, CAP_ARMED
+from Game.layers import LAYER_MIDAIR
+
+
+class Perception:
+    """
+    Spatial questions an AI agent asks while thinking. Every query goes through the arena's
+    spatial grids, so its cost depends on what is near the agent, not on the size of the match.
+    """
+
+    def __init__(self, arena, sight: int = 450):
+        self.arena = arena
+        # How far an agent sees other characters
+        self.sight = int(sight)
+
+    @staticmethod
+    def distance(agent, point) -> float:
+        return math.hypot(point[0] - agent.position.x, point[1] - agent.position.y)
+
+    def _around(self, agent, radius):
+        rect = agent.get_world_rect()
+        return rect.inflate(radius * 2, radius * 2)
+
+    def nearest_field(self, agent, radius: int = 900, golden: bool = False):
+        """Centre of the nearest grass (or golden) field within radius, or None. Distance is to the field's edge."""
+        grid = self.arena.golden_grid if golden else self.arena.grass_grid
+        best = None
+        best_d = float("inf")
+        for field in grid.query(self._around(agent, radius)):
+            rect = field.rect
+            px = min(max(agent.position.x, rect.left), rect.right)
+            py = min(max(agent.position.y, rect.top), rect.bottom)
+            d = self.distance(agent, (px, py))
+            if d < best_d and d <= radius:
+                # Every agent bound for a field heads to its centre, so they share one flow field
+                best, best_d = rect.center, d
+        return best
+
+    def nearest_pickup(self, agent, radius: int = 700):
+        """Centre of the nearest live weapon pickup within radius, or None."""
+        best = None
+        best_d = float("inf")
+        for obj in self.arena.object_grid.query(self._around(agent, radius)):
+            if capabilities_of(obj) & CAP_PICKUP and obj.alive:
+                d = self.distance(agent, obj.rect.center)
+                if d < best_d and d <= radius:
+                    best, best_d = obj.rect.center, d
+        return best
+
+    def visible_enemies(self, agent, radius: int = None) -> list:
+        """Living characters other than agent within sight, nearest first."""
+        radius = self.sight if radius is None else radius
+        found = []
+        for character in self.arena.character_grid.query(self._around(agent, radius)):
+            if character is agent or not capabilities_of(character) & CAP_BODY or character.is_dead():
+                continue
+            d = self.distance(agent, character.position)
+            if d <= radius:
+                found.append((d, character))
+        found.sort(key=lambda item: item[0])
+        return [character for _, character in found]
+
+    def is_armed(self, character) -> bool:
+        return bool(capabilities_of(character) & CAP_ARMED) and character.has_weapon() and character.ammo > 0
+
+    def line_of_fire(self, agent, target) -> bool:
+        """Whether a projectile from agent would reach target without hitting an obstacle first."""
+        start = (agent.position.x, agent.position.y)
+        end = (target.position.x, target.position.y)
+        pad = self.arena.projectile_half_size
+        for obstacle in self.arena.obstacle_grid.query(segment_bounds(start, end, pad)):
+            if (not obstacle.is_destroyed() and obstacle.blocks_layer(LAYER_MIDAIR)
+                    and segment_rect_toi(start, end, obstacle.rect, pad) is not None):
+                return False
+        return True
+
+    def blocked(self, agent, sx: int, sy: int, distance: int) -> bool:
+        """Whether agent's rect, moved distance px along (sx, sy), leaves the world or overlaps an obstacle blocking its layer."""
+        rect = agent.get_world_rect().move(sx * distance, sy * distance)
+        world_w, world_h = self.arena.world_dimensions
+        if rect.left < 0 or rect.top < 0 or rect.right > world_w or rect.bottom > world_h:
+            return True
+        layer = agent.layer
+        for obstacle in self.arena.obstacle_grid.query(rect):
+            if not obstacle.is_destroyed() and obstacle.blocks_layer(layer) and rect.colliderect(obstacle.rect):
+                return True
+        return False
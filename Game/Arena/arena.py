@@ -1,19 +1,36 @@
+import math
+import numpy as np
 import pygame
-import random
-from Game.constants import GREEN, WHITE, FONT, BORDER
+from Game.constants import GREEN, WHITE, FONT, BORDER, TICK_RATE, MATCH_SEED
+from Game.layers import LAYER_GROUND
 from Game.Objects.grass import GrassField
 from Game.Objects.obstacle import Obstacle
 from Game.Objects.golden_field import GoldenField
-from Game.Weapons import Weapon
-from Game.Objects import Projectile
+from Game.Weapons import make_bow
+from Game.Objects import ProjectilePool
 from Game.Objects import WeaponPickup
 from Game.Objects import Poop
-from Game.layers import LAYER_GROUND
+from Game.capabilities import (capabilities_of, CAP_UPDATE, CAP_BODY, CAP_INTERPOLATED, CAP_CLOCK, CAP_DAMAGEABLE,
+                               CAP_ARMED, CAP_EATS, CAP_EXPIRES, CAP_COLLIDE, CAP_PICKUP, CAP_LIFETIME, CAP_TIMERS,
+                               CAP_RANDOM, CAP_AI)
+from Game.Arena.spatial_hash import SpatialHash
+from Game.Arena.collision import segment_bounds, segment_pairs_toi, clamp_rects, resolve_rects_obstacles
+from Game.Arena.camera import CameraView
+from Game.Arena.static_tiles import StaticTileCache
+from Game.Arena.interest import InterestManager
+from Game.Arena.navigation import NavigationGrid
+from Game.AI import AIDirector
+from Game.ECS import World, components_for, ACTOR, OBJECT
+from Game.scheduler import Scheduler
+from Game.rng import RngService, STREAM_WORLD, STREAM_DROPS
+from Game import snapshot as snapshots
 
 class Arena:
-    def __init__(self, screen_dimensions, world_screen_dimensions, screen, world_screen, text):
+    def __init__(self, screen_dimensions, world_screen_dimensions, screen=None, world_screen=None, text="Arena", seed: int = MATCH_SEED):
         # Config variables
         self.grid = True # if should display grid for debugging
+        # Without a screen the arena only simulates: step() and render() never draw
+        self.headless = screen is None or world_screen is None
         
         self.screen = screen
         self.rect = pygame.Rect(screen_dimensions)
@@ -27,157 +44,404 @@ class Arena:
         self.font = FONT
         self.hover = False
         self.characters = []
-        self.objects = []
         self.grass_fields = []
         self.golden_fields = []
         self.obstacles = []
-        self.projectiles = []
+        # Entity store: every character, object, field and obstacle is an entity in an archetype table.
+        # characters and the field/obstacle lists stay as ordered indexes; objects is a world query.
+        self.world = World()
+        # Timers on the simulation clock (poop expiry, eat/poop cooldown ends); fired at the end of update()
+        self.scheduler = Scheduler()
+        # Objects removed this tick; despawned together at the end of update()
+        self._removed_objects = []
+        # Named random streams (world, loot, ai, drops) derived from the match seed
+        self.rng = RngService(seed)
+        # Every projectile lives in one structure-of-arrays pool, stepped and swept in bulk
+        self.projectiles = ProjectilePool()
+        # Obstacle rects / blocking masks as arrays for the batched collision passes; rebuilt when obstacles are added
+        self._obstacle_arrays = None
+        # Area of interest (Game/Arena/interest.py): None updates every actor every tick and sends
+        # events to everything; an InterestManager tiers characters by distance to the observers' cameras
+        self.interest = None
+        # Schedules AI agents' decisions under a per-tick budget (Game/AI/director.py)
+        self.ai = AIDirector(self)
+        # Optional match hooks: on_damage(attacker or None, victim, amount) after a projectile hit,
+        # on_pickup(character, pickup) when a character equips a floor weapon
+        self.on_damage = None
+        self.on_pickup = None
+        # Builds the weapon golden fields drop (swap in a tuned factory to rebalance a match)
+        self.make_drop_weapon = make_bow
+        # Human-controlled characters, each with its own screen viewport (split screen)
+        self.players = []
+        self.viewports = []
+        self._last_mouse_pos = None
+
+        # Fixed-timestep simulation state
+        self._tick_rate = TICK_RATE
+        self.tick_count = 0
+        # Interpolation factor of the current render; drawing only, input maps through the simulated cameras
+        self.render_alpha = 1.0
+
+        # Cached static layer (background, grid, fields, undamaged obstacles)
+        self._static_layer = None
+        self._static_dirty = True
+        self._static_grid_flag = self.grid
+        # Camera-sized render target reused across frames, and the culling margin around a camera
+        self._camera_target = None
+        self.cull_margin = 64
+        # "screen": draw straight into the window through the camera transform (zoomed tiles/sprites are cached)
+        # "resample": camera-sized render followed by a full-frame smoothscale
+        self.render_mode = "screen"
+        # Use smoothscale for zoomed tiles and sprites; False selects the faster nearest-neighbour scale
+        self.smooth_scaling = True
+        self._static_tiles = StaticTileCache()
+
+        # Spatial index (uniform grid) per entity kind, used by every collision pass
+        self.spatial_cell_size = 128
+        self.obstacle_grid = SpatialHash(self.spatial_cell_size)
+        self.grass_grid = SpatialHash(self.spatial_cell_size)
+        self.golden_grid = SpatialHash(self.spatial_cell_size)
+        self.character_grid = SpatialHash(self.spatial_cell_size)
+        self.object_grid = SpatialHash(self.spatial_cell_size)
+        # Projectiles are swept as boxes of this half-size against obstacles and characters
+        self.projectile_half_size = 2
+        # Walkable cells per layer for AI pathfinding (A* paths, shared flow fields), kept in step with obstacles
+        self.nav = NavigationGrid(world_screen_dimensions)
 
         # Generate some world content
         self._generate_world()
+        self.nav.build((LAYER_GROUND,))
+
+
+    @property
+    def objects(self):
+        return self.world.objects(OBJECT)
 
+    def _spawn_entity(self, obj, static: bool = False, is_object: bool = False):
+        return self.world.spawn(components_for(obj, static=static, is_object=is_object), obj)
 
     def add_new_character(self, character):
         self.characters.append(character)
+        self._spawn_entity(character)
+        caps = capabilities_of(character)
+        if caps & CAP_CLOCK:
+            character.clock = self.now_ms
+            character.tick_rate = self._tick_rate
+        if caps & CAP_TIMERS:
+            character.attach_scheduler(self.scheduler)
+        if caps & CAP_RANDOM:
+            character.attach_rng(self.rng)
+        if caps & CAP_AI:
+            character.attach_ai(self.ai)
+        rect = self._character_rect(character)
+        if rect is not None:
+            self.character_grid.insert(character, rect)
 
     def add_new_object(self, object):
-        self.objects.append(object)
+        self._spawn_entity(object, is_object=True)
+        if hasattr(object, "rect"):
+            self.object_grid.insert(object, object.rect)
+        if capabilities_of(object) & CAP_LIFETIME:
+            self.scheduler.schedule(object.spawn_time + object.ttl_ms, self.remove_object, object)
+
+    def remove_object(self, object):
+        """Kill a dynamic object; it leaves the world and the object grid at the end of the tick."""
+        if capabilities_of(object) & CAP_EXPIRES:
+            if not object.alive:
+                return
+            object.alive = False
+        self._removed_objects.append(object)
+
+    def _flush_removed_objects(self):
+        removed = self._removed_objects
+        if not removed:
+            return
+        for obj in removed:
+            self.object_grid.remove(obj)
+        self.world.despawn_objects(removed)
+        self._removed_objects = []
 
     def add_grass_field(self, grass: GrassField):
         self.grass_fields.append(grass)
+        self.grass_grid.insert(grass, grass.rect)
+        self._spawn_entity(grass, static=True)
+        self.invalidate_static_layer()
 
     def add_obstacle(self, obstacle: Obstacle):
         self.obstacles.append(obstacle)
+        self.obstacle_grid.insert(obstacle, obstacle.rect)
+        obstacle.on_change = self._on_obstacle_change
+        self.nav.add_obstacle(obstacle)
+        self._spawn_entity(obstacle, static=True)
+        self._obstacle_arrays = None
+        self.invalidate_static_layer()
 
     def add_golden_field(self, field: GoldenField):
         self.golden_fields.append(field)
+        self.golden_grid.insert(field, field.rect)
+        self._spawn_entity(field, static=True)
+        self.invalidate_static_layer()
+
+    def _on_obstacle_change(self, obstacle):
+        # Any obstacle field changed (Obstacle setters): destroyed obstacles stop blocking movement,
+        # projectiles and paths, and a moved one is re-indexed
+        self.obstacle_grid.update(obstacle, obstacle.rect)
+        self._obstacle_arrays = None
+        self.nav.update_obstacle(obstacle)
+        self.invalidate_static_layer()
+
+    @property
+    def tick_rate(self) -> int:
+        return self._tick_rate
+
+    @tick_rate.setter
+    def tick_rate(self, rate):
+        # Speeds are px / second and timers ms, so characters step by speed / tick_rate at any rate
+        self._tick_rate = int(rate)
+        for character in self.characters:
+            if capabilities_of(character) & CAP_CLOCK:
+                character.tick_rate = self._tick_rate
 
-    def step(self):
-        self.update()
-        self.draw()
-        self.render_cameras_per_player(0)
-        #self.handle_event(event)
+    def now_ms(self) -> int:
+        """Simulation time in milliseconds, derived from the tick counter."""
+        return (self.tick_count * 1000) // self.tick_rate
 
     def update(self):
-        for character in self.characters:
-            if hasattr(character, "update"):
-                character.update()
-        for object in self.objects:
-            if hasattr(object, "update"):
-                object.update()
-        for grass in self.grass_fields:
-            if hasattr(grass, "update"):
-                grass.update()
-        for gfield in self.golden_fields:
-            if hasattr(gfield, "update"):
-                gfield.update()
-        for obstacle in self.obstacles:
-            if hasattr(obstacle, "update"):
-                obstacle.update()
-        for proj in self.projectiles:
-            proj.update()
-            # Collide projectiles with obstacles by layer
-            if getattr(proj, 'alive', True):
-                prect = pygame.Rect(int(proj.position.x) - 2, int(proj.position.y) - 2, 4, 4)
-                for obstacle in self.obstacles:
-                    if not obstacle.blocks_layer(getattr(proj, 'layer', 0)):
-                        continue
-                    if prect.colliderect(obstacle.rect):
-                        proj.alive = False
-                        break
-            # Collide projectiles with characters (skip owner)
-            if getattr(proj, 'alive', True):
-                for character in self.characters:
-                    if character is getattr(proj, 'owner', None):
-                        continue
-                    if not hasattr(character, 'get_world_rect'):
-                        continue
-                    char_rect = character.get_world_rect()
-                    if prect.colliderect(char_rect):
-                        if hasattr(character, 'take_damage'):
-                            character.take_damage(getattr(proj, 'damage', 10.0))
-                        proj.alive = False
-                        break
-        # prune dead projectiles
-        self.projectiles = [p for p in self.projectiles if getattr(p, "alive", True)]
+        # AI decisions requested so far, within this tick's budget; agents act in their own update
+        self.ai.run()
+        # Actors: only tables whose entities have per-tick work (cows, AI); fields, obstacles and
+        # pickups never enter this loop
+        if self.interest is None:
+            for table in self.world.query(ACTOR):
+                for actor in table.objects[:table.count]:
+                    actor.update()
+            characters = self.characters
+        else:
+            # Only characters in play this tick (near a camera, driven by keys or updated) are
+            # moved, resolved and checked for pickups; the rest have not moved since their last turn
+            characters = self.interest.update_actors(self)
+            for table in self.world.query(ACTOR, OBJECT):
+                for actor in table.objects[:table.count]:
+                    actor.update()
+        # Characters may have moved during their update or key handling
+        self._sync_character_grid(characters)
+        # Projectiles: one vectorized step of speed * dt, one swept collision pass, then drop the dead slots
+        self.projectiles.step(1.0 / self.tick_rate)
+        self._collide_projectiles()
+        self.projectiles.compact()
 
         # Enforce collisions and bounds after movement
-        for character in self.characters:
-            self._clamp_character_to_world(character)
-            self._resolve_character_obstacle_collisions(character)
-            # Final clamp to ensure still within bounds after push-out
-            self._clamp_character_to_world(character)
+        self._resolve_characters(characters)
+        self._sync_character_grid(characters)
 
-        # Poop collision hook (for future effects), and TTL cleanup is handled in Poop.update
-        for character in self.characters:
-            char_rect = character.get_world_rect() if hasattr(character, 'get_world_rect') else None
-            if char_rect is None:
+        # Poop collision hook (for future effects); poop TTLs are scheduler timers
+        for character in characters:
+            if not capabilities_of(character) & CAP_BODY:
                 continue
-            for obj in self.objects:
-                if hasattr(obj, 'on_character_collide') and getattr(obj, 'alive', True):
-                    try:
-                        orect = obj.rect
-                    except Exception:
-                        continue
-                    if char_rect.colliderect(orect):
+            char_rect = character.get_world_rect()
+            for obj in self.object_grid.query(char_rect):
+                caps = capabilities_of(obj)
+                if caps & CAP_COLLIDE and _is_alive(obj, caps):
+                    if char_rect.colliderect(obj.rect):
                         obj.on_character_collide(character, self)
 
         # Player pickup collision: auto-equip if none
-        for character in self.characters:
-            if hasattr(character, 'has_weapon') and character.has_weapon():
+        for character in characters:
+            caps = capabilities_of(character)
+            if not caps & CAP_BODY:
                 continue
-            if not hasattr(character, 'get_world_rect'):
+            if caps & CAP_ARMED and character.has_weapon():
                 continue
             char_rect = character.get_world_rect()
-            for obj in self.objects:
-                if isinstance(obj, WeaponPickup) and getattr(obj, 'alive', True):
+            for obj in self.object_grid.query(char_rect):
+                if capabilities_of(obj) & CAP_PICKUP and obj.alive:
                     if char_rect.colliderect(obj.rect):
                         character.equip_weapon(obj.weapon)
-                        obj.alive = False
-        # Cleanup consumed pickups
-        self.objects = [o for o in self.objects if getattr(o, 'alive', True)]
+                        self.remove_object(obj)
+                        if self.on_pickup is not None:
+                            self.on_pickup(character, obj)
+        self.tick_count += 1
+        # Fire every timer due by the new time (expiries, cooldown ends) before the next tick's input,
+        # then drop consumed pickups and expired objects
+        self.scheduler.advance(self.now_ms())
+        self._flush_removed_objects()
+
+    # ------- Snapshots -------
+    def snapshot(self, baseline: bytes = None) -> bytes:
+        """
+        Binary checkpoint of the simulation (Game/snapshot.py). Take it between ticks.
+        With baseline (an earlier full snapshot) the result is a delta against it.
+        """
+        data = snapshots.capture(self)
+        return data if baseline is None else snapshots.make_delta(baseline, data)
+
+    def restore(self, data: bytes, baseline: bytes = None):
+        """Return to a snapshot of this match; a delta needs the baseline it was taken against."""
+        if snapshots.is_delta(data):
+            if baseline is None:
+                raise ValueError("restoring a delta snapshot needs its baseline")
+            data = snapshots.apply_delta(baseline, data)
+        snapshots.restore(self, data)
+
+    def tick(self, key_list=(), player_keys=None, character_keys=None):
+        """
+        Advance the simulation by exactly one fixed step (1 / tick_rate seconds).
+        player_keys, when given, holds one key list per local player instead of a shared key_list;
+        character_keys holds (character, key_list) pairs for characters driven from elsewhere (network clients).
+        """
+        for character in self.characters:
+            if capabilities_of(character) & CAP_INTERPOLATED:
+                character.prev_position.update(character.position)
+        if character_keys is not None:
+            for character, keys in character_keys:
+                self.handle_key_event(keys, [character])
+        elif player_keys is not None:
+            self.handle_player_key_events(player_keys)
+        else:
+            self.handle_key_event(list(key_list))
+        self.update()
 
-    def draw(self):
-        self.world_screen.fill(GREEN)
+    def render(self, alpha: float = 1.0):
+        """Draw the world blended alpha of the way from the previous tick to the current one."""
+        if self.headless:
+            return
+        self.render_alpha = alpha
+        if self.players and self.render_mode == "screen":
+            self.render_viewports()
+        else:
+            self.render_cameras_per_player(0)
+        self.draw_ui()
+
+    def draw(self, alpha: float = 1.0):
+        # Background, grid, fields and undamaged obstacles come from the cached static layer
+        self.world_screen.blit(self._get_static_layer(), (0, 0))
+        for obstacle in self.obstacles:
+            if not self._is_static_obstacle(obstacle) and not obstacle.is_destroyed():
+                obstacle.draw(self.world_screen)
+
+        #pygame.draw.rect(screen, WHITE, self.rect, border_radius=10)
+        for character in self.characters:
+            character.draw(self.world_screen, alpha)
+        for object in self.objects:
+            object.draw(self.world_screen)
+        self.projectiles.draw(self.world_screen, alpha)
+
+    # ------- Static layer cache -------
+    def invalidate_static_layer(self, *_):
+        """Mark the cached static layer stale; it is rebuilt on the next draw."""
+        self._static_dirty = True
+
+    def _is_static_obstacle(self, obstacle) -> bool:
+        return obstacle.health >= obstacle.max_health
+
+    def _get_static_layer(self):
+        if self._static_layer is None or self._static_dirty or self._static_grid_flag != self.grid:
+            self._build_static_layer()
+        return self._static_layer
+
+    def _build_static_layer(self):
+        if self._static_layer is None or self._static_layer.get_size() != tuple(self.world_dimensions):
+            surf = pygame.Surface(self.world_dimensions)
+            if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                surf = surf.convert()
+            self._static_layer = surf
+        layer = self._static_layer
+        layer.fill(GREEN)
 
         if self.grid:
-            pygame.draw.rect(self.world_screen, BORDER, (0,0,self.world_dimensions[0],self.world_dimensions[1]), 8, border_radius=24)
+            pygame.draw.rect(layer, BORDER, (0,0,self.world_dimensions[0],self.world_dimensions[1]), 8, border_radius=24)
 
             step = 120
             for x in range(step, self.world_dimensions[0], step):
-                pygame.draw.line(self.world_screen, (38, 42, 52), (x, 0), (x, self.world_dimensions[1]), 1)
+                pygame.draw.line(layer, (38, 42, 52), (x, 0), (x, self.world_dimensions[1]), 1)
             for y in range(step, self.world_dimensions[1], step):
-                pygame.draw.line(self.world_screen, (38, 42, 52), (0, y), (self.world_dimensions[0], y), 1)
+                pygame.draw.line(layer, (38, 42, 52), (0, y), (self.world_dimensions[0], y), 1)
 
-        # Draw environment
+        # Environment; damaged obstacles are drawn per frame on top instead
         for grass in self.grass_fields:
-            grass.draw(self.world_screen)
+            grass.draw(layer)
         for gfield in self.golden_fields:
-            gfield.draw(self.world_screen)
+            gfield.draw(layer)
         for obstacle in self.obstacles:
-            obstacle.draw(self.world_screen)
-
-        #pygame.draw.rect(screen, WHITE, self.rect, border_radius=10)
-        for character in self.characters:
-            character.draw(self.world_screen)
-        for object in self.objects:
-            object.draw(self.world_screen)
-        for proj in self.projectiles:
-            proj.draw(self.world_screen)
+            if self._is_static_obstacle(obstacle) and not obstacle.is_destroyed():
+                obstacle.draw(layer)
+        self._static_dirty = False
+        self._static_grid_flag = self.grid
+        self._static_tiles.clear()
 
     def render_cameras_per_player(self, index):
-        camera_rect = self.characters[index].create_camera_surface()
-        view = self.world_screen.subsurface(camera_rect)
-        view_scaled = pygame.transform.smoothscale(view, (self.rect.width, self.rect.height))
-        self.screen.blit(view_scaled, (0, 0))
+        camera_rect = self._camera_rect(self.characters[index], self.render_alpha)
+        if self.render_mode == "resample":
+            # Legacy path: camera-sized render, then one full-frame resample to the window
+            target = self._get_camera_target(camera_rect.size)
+            self.render_view(target, camera_rect, self.render_alpha)
+            view_scaled = pygame.transform.smoothscale(target, (self.rect.width, self.rect.height))
+            self.screen.blit(view_scaled, (0, 0))
+            return
+        view = CameraView(camera_rect, self.rect.size, self.rect.topleft, smooth=self.smooth_scaling)
+        self.draw_view(self.screen, view, self.render_alpha)
+
+    def render_view(self, target, camera_rect, alpha: float = 1.0):
+        """
+        Draw only what camera_rect can see into a camera-sized target surface.
+        Entities are culled through the spatial grids, so cost scales with what is visible.
+        """
+        self.draw_view(target, CameraView(camera_rect), alpha)
+
+    def draw_view(self, target, view, alpha: float = 1.0, clip=None):
+        """
+        Draw the world seen by view into its region of target, in target (screen) space.
+        clip limits drawing (and culling) to part of that region.
+        """
+        region = pygame.Rect(view.origin, view.target_size)
+        if clip is not None:
+            region = region.clip(clip)
+            if region.width <= 0 or region.height <= 0:
+                return
+        # World area behind the drawn region
+        left, top = view.to_world(region.topleft)
+        right, bottom = view.to_world(region.bottomright)
+        world_rect = pygame.Rect(int(left), int(top), int(right - left) + 2, int(bottom - top) + 2).clip(view.rect)
+        previous_clip = target.get_clip()
+        target.set_clip(region)
+        static_layer = self._get_static_layer()
+        if view.is_identity_scale:
+            target.blit(static_layer, view.origin, area=view.rect)
+        else:
+            self._static_tiles.draw(target, static_layer, view, world_rect)
+        # Margin covers sprites larger than their rects, weapon overlays and interpolation
+        cull_rect = world_rect.inflate(self.cull_margin * 2, self.cull_margin * 2)
+        for obstacle in self.obstacle_grid.query(cull_rect):
+            if not self._is_static_obstacle(obstacle) and not obstacle.is_destroyed():
+                obstacle.draw(target, view)
+        for character in self.character_grid.query(cull_rect):
+            character.draw(target, alpha, view)
+        for object in self.object_grid.query(cull_rect):
+            object.draw(target, view)
+        self.projectiles.draw(target, alpha, view, cull_rect)
+        target.set_clip(previous_clip)
+
+    def _get_camera_target(self, size):
+        if self._camera_target is None or self._camera_target.get_size() != tuple(size):
+            surf = pygame.Surface(size)
+            if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                surf = surf.convert()
+            self._camera_target = surf
+        return self._camera_target
         
     def draw_ui(self):
-        # Basic HUD with ammo count for the first character
+        # Basic HUD with ammo count: one per local player viewport, else for the first character
         if self.font is None:
             self.font = pygame.font.SysFont(None, 22)
+        if self.players:
+            for player, viewport in zip(self.players, self.viewports):
+                self._draw_player_hud(player, (viewport.left + 12, viewport.top + 10))
+            return
         if len(self.characters) == 0:
             return
-        player = self.characters[0]
+        self._draw_player_hud(self.characters[0], (12, 10))
+
+    def _draw_player_hud(self, player, pos):
         ammo = getattr(player, "ammo", None)
         weapon = getattr(player, "weapon", None)
         health = getattr(player, "health", None)
@@ -190,130 +454,244 @@ class Arena:
         else:
             health_str = f" | HP: {health}/{max_health}"
         text_surf = self.font.render(f"Ammo: {ammo} | Weapon: {weapon_name}{health_str}", True, WHITE)
-        self.screen.blit(text_surf, (12, 10))
+        self.screen.blit(text_surf, pos)
     
-    def handle_key_event(self, key_list):
+    def handle_key_event(self, key_list, characters=None):
+        # Keys apply to the given characters (default: every character)
+        targets = self.characters if characters is None else characters
         # First, set eating intent based on current key state and context
         eating_pressed = ("eat" in key_list)
         poop_pressed = ("poop" in key_list)
-        for character in self.characters:
+        for character in targets:
+            caps = capabilities_of(character)
             # Default no eating intent
-            character.set_eating_intent(False) if hasattr(character, "set_eating_intent") else None
-            # Compute character's world rect at current position
-            if hasattr(character, "rect") and hasattr(character, "position"):
-                char_rect = character.rect.copy()
-                char_rect.center = (int(character.position.x), int(character.position.y))
-            else:
-                char_rect = getattr(character, "rect", None)
-            if char_rect is None:
-                continue
-            in_grass = any(char_rect.colliderect(g.rect) for g in self.grass_fields)
-            in_golden = any(char_rect.colliderect(g.rect) for g in self.golden_fields)
-            if eating_pressed and (in_grass or in_golden):
-                if hasattr(character, "set_eating_intent"):
-                    character.set_eating_intent(True)
+            if caps & CAP_EATS:
+                character.set_eating_intent(False)
+            if eating_pressed and caps & CAP_EATS and self.in_feeding_field(character):
+                character.set_eating_intent(True)
 
         # Then, pass movement/zoom keys through
-        for character in self.characters:
+        for character in targets:
             character.handle_key_event(key_list)
+        self._sync_character_grid(targets)
+        if self.interest is not None:
+            self.interest.touch(targets)
 
         # Finally, if eat pressed and valid, trigger action once per frame
         if eating_pressed:
-            for character in self.characters:
-                if hasattr(character, "rect") and hasattr(character, "position"):
-                    char_rect = character.rect.copy()
-                    char_rect.center = (int(character.position.x), int(character.position.y))
-                else:
-                    char_rect = getattr(character, "rect", None)
+            for character in targets:
+                char_rect = self._character_rect(character)
                 if char_rect is None:
                     continue
-                in_grass = any(char_rect.colliderect(g.rect) for g in self.grass_fields)
-                in_golden = any(char_rect.colliderect(g.rect) for g in self.golden_fields)
+                golden_hits = [g for g in self.golden_grid.query(char_rect) if char_rect.colliderect(g.rect)]
+                in_grass = any(char_rect.colliderect(g.rect) for g in self.grass_grid.query(char_rect))
+                in_golden = len(golden_hits) > 0
                 if (in_grass or in_golden):
                     # Golden fields do NOT grant ammo. Grass does.
                     if in_golden:
                         # Roll for weapon drop; spawn pickup near the golden field
                         drop_probability = 0.05
-                        for gf in self.golden_fields:
+                        for gf in golden_hits:
                             if char_rect.colliderect(gf.rect):
                                 drop_probability = gf.drop_probability
                                 # spawn pickup with small offset so it is visible
-                                import random
-                                if random.random() < drop_probability:
+                                drops = self.rng.stream(STREAM_DROPS)
+                                if drops.random() < drop_probability:
                                     gx, gy = gf.rect.center
-                                    offset = random.randint(-20, 20)
-                                    pickup = WeaponPickup(Weapon(name="Bow", ammo_per_shot=1, projectile_speed=18.0, floor_image_name="bow.png", floor_image_scale=(28, 28), projectile_image_name="arrow.png", projectile_image_scale=(18, 6)), (gx + offset, gy))
-                                    self.objects.append(pickup)
+                                    offset = drops.randint(-20, 20)
+                                    pickup = WeaponPickup(self.make_drop_weapon(), (gx + offset, gy))
+                                    self.add_new_object(pickup)
                                 break
                     else:
-                        if hasattr(character, "eat"):
+                        if capabilities_of(character) & CAP_EATS:
                             character.eat()
         # Poop action spawns a persistent object
         if poop_pressed:
-            for character in self.characters:
-                if hasattr(character, "poop"):
+            for character in targets:
+                if capabilities_of(character) & CAP_EATS:
                     # Make poop size based on cow's current rect and amount_percent
-                    amount = getattr(character, 'poop_percent', 0.15)
+                    amount = character.poop_percent
                     changed = character.poop()
                     if changed:
                         base_w = max(6, int(character.rect.width * amount))
                         base_h = max(4, int(character.rect.height * amount * 0.7))
                         pos = (int(character.position.x), int(character.position.y) + int(character.rect.height * 0.4))
-                        self.objects.append(Poop(pos, ttl_ms=9000, size=(base_w, base_h), amount_percent=amount))
+                        self.add_new_object(Poop(pos, ttl_ms=9000, size=(base_w, base_h), amount_percent=amount, clock=self.now_ms))
+
+    def in_feeding_field(self, character) -> bool:
+        """Whether the character stands in grass or a golden field at its current position."""
+        char_rect = self._character_rect(character)
+        if char_rect is None:
+            return False
+        return (any(char_rect.colliderect(g.rect) for g in self.grass_grid.query(char_rect))
+                or any(char_rect.colliderect(g.rect) for g in self.golden_grid.query(char_rect)))
+
+    def handle_player_key_events(self, key_lists):
+        """Route one key list per local player (aligned with self.players) to that player only."""
+        for player, key_list in zip(self.players, key_lists):
+            self.handle_key_event(key_list, [player])
 
     def handle_event(self, event):
+        # Mouse input belongs to the player whose viewport is under the cursor
+        pos = getattr(event, 'pos', None)
+        if pos is not None:
+            self._last_mouse_pos = pos
+        player, view = self._player_view_at(self._last_mouse_pos)
         # Handle shooting in arena to correctly map screen->world coords
         if event.type == pygame.MOUSEBUTTONDOWN and getattr(event, 'button', None) == 1:
-            if len(self.characters) > 0:
-                player = self.characters[0]
-                if hasattr(player, 'has_weapon') and player.has_weapon():
-                    weapon = player.get_weapon()
-                    if weapon is not None and weapon.can_fire(getattr(player, 'ammo', 0)):
-                        # Map screen coords to world coords
-                        cam_rect = self.characters[0].create_camera_surface()
-                        scale_x = self.rect.width / cam_rect.width
-                        scale_y = self.rect.height / cam_rect.height
-                        sx, sy = event.pos
-                        world_x = cam_rect.left + (sx / scale_x)
-                        world_y = cam_rect.top + (sy / scale_y)
-                        # update aim direction
-                        aim_dir = (world_x - player.position.x, world_y - player.position.y)
-                        if hasattr(player, 'set_aim_direction'):
-                            player.set_aim_direction(aim_dir)
-                        start = (int(player.position.x), int(player.position.y))
-                        direction = (world_x - start[0], world_y - start[1])
-                        speed = getattr(weapon, 'projectile_speed', 16.0)
-                        sprite = None
-                        if hasattr(weapon, 'get_projectile_sprite'):
-                            sprite = weapon.get_projectile_sprite()
-                        damage = getattr(weapon, 'damage', 10.0)
-                        self.spawn_projectile(start, direction, speed, sprite, damage, player)
-                        # consume ammo
-                        player.ammo = weapon.consume_ammo(player.ammo)
+            if player is not None:
+                # Map screen coords to world coords
+                self.fire_weapon(player, self.mouse_world_pos(event))
         elif event.type == pygame.MOUSEMOTION:
             # Update aim direction continuously
-            if len(self.characters) > 0:
-                player = self.characters[0]
-                cam_rect = self.characters[0].create_camera_surface()
-                scale_x = self.rect.width / cam_rect.width
-                scale_y = self.rect.height / cam_rect.height
-                sx, sy = event.pos
-                world_x = cam_rect.left + (sx / scale_x)
-                world_y = cam_rect.top + (sy / scale_y)
+            if player is not None:
+                world_x, world_y = self.mouse_world_pos(event)
                 aim_dir = (world_x - player.position.x, world_y - player.position.y)
-                if hasattr(player, 'set_aim_direction'):
+                if capabilities_of(player) & CAP_ARMED:
                     player.set_aim_direction(aim_dir)
-        # Forward event to children
-        for character in self.characters:
-            character.handle_event(event)
-        for object in self.objects:
+        # Forward event to children; with local players only the routed player gets it.
+        # With an interest manager only characters and objects near an observer's camera get it
+        if self.players:
+            if player is not None:
+                player.handle_event(event)
+        else:
+            interest = self.interest
+            characters = self.characters if interest is None or not interest.observers_of(self) else interest.active.values()
+            for character in characters:
+                character.handle_event(event)
+        objects = self.objects if self.interest is None else self.interest.event_targets(self)
+        for object in objects:
             object.handle_event(event)
 
+    def mouse_world_pos(self, event):
+        """
+        World point under a mouse event's cursor, through the camera of the viewport it falls in
+        (None for events without a position or viewport). Replayed events carry it as world_pos.
+        """
+        recorded = getattr(event, 'world_pos', None)
+        if recorded is not None:
+            return recorded
+        pos = getattr(event, 'pos', None)
+        if pos is None:
+            return None
+        _, view = self._player_view_at(pos)
+        return None if view is None else view.to_world(pos)
+
+    def fire_weapon(self, player, target):
+        """Shoot player's weapon at a world-space target if it can fire; returns the projectile slot or None."""
+        if not capabilities_of(player) & CAP_ARMED or not player.has_weapon():
+            return None
+        weapon = player.get_weapon()
+        if weapon is None or not weapon.can_fire(player.ammo):
+            return None
+        world_x, world_y = target
+        # update aim direction
+        aim_dir = (world_x - player.position.x, world_y - player.position.y)
+        player.set_aim_direction(aim_dir)
+        start = (int(player.position.x), int(player.position.y))
+        direction = (world_x - start[0], world_y - start[1])
+        speed = getattr(weapon, 'projectile_speed', 960.0)
+        sprite = None
+        if hasattr(weapon, 'get_projectile_sprite'):
+            sprite = weapon.get_projectile_sprite()
+        # The image name and scale name the sprite in snapshots
+        image = getattr(weapon, 'projectile_image_name', None)
+        sprite_ref = (image, getattr(weapon, 'projectile_image_scale', None)) if image is not None else None
+        damage = getattr(weapon, 'damage', 10.0)
+        heading = getattr(weapon, 'projectile_image_heading', 0.0)
+        slot = self.spawn_projectile(start, direction, speed, sprite, damage, player, sprite_heading=heading, sprite_ref=sprite_ref)
+        # consume ammo
+        player.ammo = weapon.consume_ammo(player.ammo)
+        return slot
+
+    # ------- Local players / viewports -------
+    def add_player(self, character):
+        """Register a human-controlled character; the window is split into one viewport per player."""
+        if character not in self.characters:
+            self.add_new_character(character)
+        self.players.append(character)
+        self._layout_viewports()
+
+    def _layout_viewports(self):
+        # 1 player: full window, 2: side by side, 3-4: 2x2 grid, more: as square a grid as fits
+        count = len(self.players)
+        if count == 0:
+            self.viewports = []
+            return
+        cols = 1 if count == 1 else 2 if count <= 4 else math.ceil(math.sqrt(count))
+        rows = math.ceil(count / cols)
+        cell_w = self.rect.width // cols
+        cell_h = self.rect.height // rows
+        self.viewports = []
+        for i, player in enumerate(self.players):
+            col, row = i % cols, i // cols
+            viewport = pygame.Rect(self.rect.left + col * cell_w, self.rect.top + row * cell_h, cell_w, cell_h)
+            self.viewports.append(viewport)
+            if hasattr(player, 'set_camera_size'):
+                player.set_camera_size(viewport.size)
+
+    def _player_views(self, alpha: float = 1.0):
+        """
+        (player, CameraView) for every viewport; without registered players, characters[0] fills the window.
+        Cameras follow positions interpolated by alpha; 1.0 is the simulated state, which input mapping uses.
+        """
+        if self.players:
+            return [
+                (player, CameraView(self._camera_rect(player, alpha), viewport.size, viewport.topleft, smooth=self.smooth_scaling))
+                for player, viewport in zip(self.players, self.viewports)
+            ]
+        if len(self.characters) == 0:
+            return []
+        player = self.characters[0]
+        return [(player, CameraView(self._camera_rect(player, alpha), self.rect.size, self.rect.topleft, smooth=self.smooth_scaling))]
+
+    def _player_view_at(self, screen_pos):
+        # Input goes through the cameras at the simulated positions, so it never depends on frame timing
+        views = self._player_views()
+        if not views:
+            return None, None
+        if screen_pos is not None:
+            for player, view in views:
+                if pygame.Rect(view.origin, view.target_size).collidepoint(screen_pos):
+                    return player, view
+        return views[0]
+
+    def render_viewports(self):
+        """
+        Draw every player's viewport. Where a viewport's camera overlaps one already drawn at the
+        same scale, the overlapping pixels are copied from that viewport instead of drawn again.
+        """
+        drawn = []
+        for _, view in self._player_views(self.render_alpha):
+            region = pygame.Rect(view.origin, view.target_size)
+            remaining = [region]
+            for other in drawn:
+                if (other.scale_x, other.scale_y) != (view.scale_x, view.scale_y):
+                    continue
+                overlap = other.rect.clip(view.rect)
+                if overlap.width <= 0 or overlap.height <= 0:
+                    continue
+                src = other.rect_to_screen(overlap).clip(pygame.Rect(other.origin, other.target_size))
+                dst = view.rect_to_screen(overlap).clip(region)
+                size = (min(src.width, dst.width), min(src.height, dst.height))
+                if size[0] <= 0 or size[1] <= 0:
+                    continue
+                self.screen.blit(self.screen, dst.topleft, area=pygame.Rect(src.topleft, size))
+                copied = pygame.Rect(dst.topleft, size)
+                remaining = [piece for rect in remaining for piece in _subtract_rect(rect, copied)]
+            for piece in remaining:
+                self.draw_view(self.screen, view, self.render_alpha, clip=piece)
+            drawn.append(view)
+        # Separators between split-screen viewports
+        if len(self.viewports) > 1:
+            for viewport in self.viewports:
+                pygame.draw.rect(self.screen, BORDER, viewport, 2)
+
     # ------- Helpers -------
     def _generate_world(self, num_grass: int = 10, num_obstacles: int = 14, num_golden: int = 3):
         # Randomly scatter grass fields and obstacles throughout the world
         world_w, world_h = self.world_dimensions
-        rng = random.Random(42)
+        rng = self.rng.stream(STREAM_WORLD)
 
         for _ in range(num_grass):
             w = rng.randint(160, 320)
@@ -347,33 +725,152 @@ class Arena:
             ])
             self.add_obstacle(Obstacle((x, y, w, h), base_health=health, blocking_mask=mask_choice))
 
-    def spawn_projectile(self, start_pos, direction, speed: float = 16.0, sprite=None, damage: float = 10.0, owner=None):
-        proj = Projectile(start_pos, direction, speed=speed, sprite=sprite, damage=damage, owner=owner)
-        self.projectiles.append(proj)
+    def spawn_projectile(self, start_pos, direction, speed: float = 960.0, sprite=None, damage: float = 10.0, owner=None, sprite_heading: float = 0.0, sprite_ref=None):
+        return self.projectiles.spawn(start_pos, direction, speed=speed, sprite=sprite, damage=damage, owner=owner, sprite_heading=sprite_heading, sprite_ref=sprite_ref)
+
+    def _get_obstacle_arrays(self):
+        if self._obstacle_arrays is None or len(self._obstacle_arrays[1]) != len(self.obstacles):
+            rects = np.array([(o.rect.left, o.rect.top, o.rect.right, o.rect.bottom) for o in self.obstacles], dtype=np.int64).reshape(-1, 4)
+            # Destroyed obstacles block no layer
+            masks = np.array([0 if o.is_destroyed() else o.blocking_mask for o in self.obstacles], dtype=np.int64)
+            self._obstacle_arrays = (rects, masks)
+        return self._obstacle_arrays
+
+    def _collide_projectiles(self):
+        """
+        Sweep every live projectile's path this tick against obstacles and characters.
+        The grids give each path's candidates (whatever overlaps the path's padded bounds); the
+        times of impact of all (path, candidate) pairs are then computed in one vectorized pass.
+        Hit projectiles stop at their earliest time of impact; character hits take damage in spawn order.
+        """
+        pool = self.projectiles
+        live = pool.live_indices()
+        if live.size == 0:
+            return
+        starts = pool.prev_position[live]
+        ends = pool.position[live]
+        pad = self.projectile_half_size
+        layers = pool.layer[live].tolist()
+        owners = pool.owner[live].tolist()
+        # Broad phase: flattened (path, rect) candidate pairs
+        obstacle_paths, obstacle_rects = [], []
+        character_paths, character_rects, targets = [], [], []
+        for i, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+            bounds = segment_bounds(start, end, pad)
+            layer = layers[i]
+            for obstacle in self.obstacle_grid.query(bounds):
+                # Destroyed obstacles and those not blocking the projectile's layer let it through
+                if not obstacle.is_destroyed() and obstacle.blocks_layer(layer):
+                    r = obstacle.rect
+                    obstacle_paths.append(i)
+                    obstacle_rects.append((r.left, r.top, r.right, r.bottom))
+            # A projectile never hits the character that fired it
+            owner = pool.owners[owners[i]] if owners[i] >= 0 else None
+            for character in self.character_grid.query(bounds):
+                if character is not owner and capabilities_of(character) & CAP_BODY:
+                    r = character.get_world_rect()
+                    character_paths.append(i)
+                    character_rects.append((r.left, r.top, r.right, r.bottom))
+                    targets.append(character)
+
+        best_t = np.full(live.size, np.inf)
+        if obstacle_paths:
+            paths = np.array(obstacle_paths)
+            toi = segment_pairs_toi(starts[paths], ends[paths], obstacle_rects, pad)
+            np.minimum.at(best_t, paths, toi)
+
+        hit_index = np.full(live.size, -1)
+        if character_paths:
+            paths = np.array(character_paths)
+            toi = segment_pairs_toi(starts[paths], ends[paths], character_rects, pad)
+            # Earliest hit per path; equal times go to the character the grid lists first (roster order)
+            order = np.lexsort((np.arange(paths.size), toi, paths))
+            first = order[np.r_[True, paths[order][1:] != paths[order][:-1]]]
+            char_t = np.full(live.size, np.inf)
+            char_t[paths[first]] = toi[first]
+            # Obstacles win ties so shots cannot pass through cover to a cow behind it
+            closer = char_t < best_t
+            hit_index[paths[first]] = first
+            hit_index[~closer] = -1
+            best_t = np.where(closer, char_t, best_t)
+
+        hit = np.isfinite(best_t)
+        if not hit.any():
+            return
+        for slot, target in zip(live[hit], hit_index[hit]):
+            if target >= 0 and capabilities_of(targets[target]) & CAP_DAMAGEABLE:
+                amount = float(pool.damage[slot])
+                targets[target].take_damage(amount)
+                if self.on_damage is not None:
+                    owner = int(pool.owner[slot])
+                    self.on_damage(pool.owners[owner] if owner >= 0 else None, targets[target], amount)
+        pool.stop_at(live[hit], best_t[hit])
+
+    def _camera_rect(self, character, alpha: float = 1.0):
+        if alpha < 1.0 and capabilities_of(character) & CAP_INTERPOLATED:
+            return character.create_camera_surface(character.render_position(alpha))
+        return character.create_camera_surface()
+
+    def _character_rect(self, character):
+        if capabilities_of(character) & CAP_BODY:
+            return character.get_world_rect()
+        return getattr(character, "rect", None)
+
+    def _sync_character_grid(self, characters=None):
+        for character in self.characters if characters is None else characters:
+            rect = self._character_rect(character)
+            if rect is not None:
+                self.character_grid.update(character, rect)
 
     def _clamp_character_to_world(self, character):
-        if not hasattr(character, "get_world_rect"):
+        if not capabilities_of(character) & CAP_BODY:
             return
         char_rect = character.get_world_rect()
         world_rect = pygame.Rect(0, 0, self.world_dimensions[0], self.world_dimensions[1])
         # Clamp in place
         char_rect.clamp_ip(world_rect)
         # Write back to character position
-        if hasattr(character, "position"):
-            character.position.x = char_rect.centerx
-            character.position.y = char_rect.centery
+        character.position.x = char_rect.centerx
+        character.position.y = char_rect.centery
+
+    def _resolve_characters(self, characters=None):
+        """
+        Clamp, push out of blocking obstacles and clamp again, for every character (or the given ones) at once.
+        Gives the same positions as running _clamp_character_to_world /
+        _resolve_character_obstacle_collisions / _clamp_character_to_world per character.
+        """
+        characters = self.characters if characters is None else characters
+        batch = [c for c in characters if capabilities_of(c) & CAP_BODY]
+        if not batch:
+            return
+        rects = []
+        layers = []
+        for character in batch:
+            r = character.get_world_rect()
+            rects.append((r.left, r.top, r.right, r.bottom))
+            layers.append(character.layer)
+        obstacle_rects, masks = self._get_obstacle_arrays()
+        rects = clamp_rects(rects, self.world_dimensions)
+        rects = resolve_rects_obstacles(rects, layers, obstacle_rects, masks, self.obstacle_grid.cell_size)
+        # Final clamp to ensure still within bounds after push-out
+        rects = clamp_rects(rects, self.world_dimensions)
+        centers_x = (rects[:, 0] + (rects[:, 2] - rects[:, 0]) // 2).tolist()
+        centers_y = (rects[:, 1] + (rects[:, 3] - rects[:, 1]) // 2).tolist()
+        for character, cx, cy in zip(batch, centers_x, centers_y):
+            character.position.x = cx
+            character.position.y = cy
 
     def _resolve_character_obstacle_collisions(self, character):
-        if not hasattr(character, "get_world_rect"):
+        if not capabilities_of(character) & CAP_BODY:
             return
         char_rect = character.get_world_rect()
+        layer = character.layer
         # Iterate a few times in case pushing causes new overlaps
         for _ in range(3):
             collided = False
-            for obstacle in self.obstacles:
+            for obstacle in self.obstacle_grid.query(char_rect):
                 # Only block if obstacle blocks the character's current layer
-                layer = getattr(character, 'layer', LAYER_GROUND)
-                if not obstacle.blocks_layer(layer):
+                if obstacle.is_destroyed() or not obstacle.blocks_layer(layer):
                     continue
                 orect = obstacle.rect
                 if not char_rect.colliderect(orect):
@@ -397,12 +894,32 @@ class Arena:
             if not collided:
                 break
         # Write back to character position
-        if hasattr(character, "position"):
-            character.position.x = char_rect.centerx
-            character.position.y = char_rect.centery
+        character.position.x = char_rect.centerx
+        character.position.y = char_rect.centery
 
     def step(self):
         self.update()
-        self.draw()
-        self.render_cameras_per_player(0)
-        self.draw_ui()
\ No newline at end of file
+        if not self.headless:
+            self.render()
+
+
+def _is_alive(obj, caps) -> bool:
+    # Objects without an alive flag never expire
+    return not caps & CAP_EXPIRES or obj.alive
+
+
+def _subtract_rect(rect, hole):
+    """Split rect minus hole into up to four non-overlapping rects."""
+    clipped = rect.clip(hole)
+    if clipped.width <= 0 or clipped.height <= 0:
+        return [rect]
+    pieces = []
+    if clipped.top > rect.top:
+        pieces.append(pygame.Rect(rect.left, rect.top, rect.width, clipped.top - rect.top))
+    if clipped.bottom < rect.bottom:
+        pieces.append(pygame.Rect(rect.left, clipped.bottom, rect.width, rect.bottom - clipped.bottom))
+    if clipped.left > rect.left:
+        pieces.append(pygame.Rect(rect.left, clipped.top, clipped.left - rect.left, clipped.height))
+    if clipped.right < rect.right:
+        pieces.append(pygame.Rect(clipped.right, clipped.top, rect.right - clipped.right, clipped.height))
+    return pieces
@@ -0,0 +1,69 @@
+import math
+import pygame
+
+
+# Sprite scales are snapped to multiples of 1 / SCALE_BUCKETS so zoomed sprites can be cached
+SCALE_BUCKETS = 8
+
+
+class CameraView:
+    """
+    World -> target transform for drawing a single camera.
+    Without target_size the target is camera-sized (scale 1); with it the camera rect is
+    stretched onto a target_size region placed at origin, so entities draw straight in screen space.
+    """
+
+    def __init__(self, camera_rect, target_size=None, origin=(0, 0), smooth: bool = True):
+        self.rect = pygame.Rect(camera_rect)
+        if target_size is None:
+            target_size = self.rect.size
+        self.target_size = (int(target_size[0]), int(target_size[1]))
+        self.origin = (int(origin[0]), int(origin[1]))
+        # smoothscale vs the faster nearest-neighbour scale for zoomed sprites and tiles
+        self.smooth = bool(smooth)
+        self.scale_x = self.target_size[0] / max(1, self.rect.width)
+        self.scale_y = self.target_size[1] / max(1, self.rect.height)
+        self.scale = round((self.scale_x + self.scale_y) * 0.5 * SCALE_BUCKETS) / SCALE_BUCKETS
+
+    @property
+    def is_identity_scale(self) -> bool:
+        return self.scale_x == 1.0 and self.scale_y == 1.0
+
+    def to_screen(self, pos):
+        return (
+            math.floor(self.origin[0] + (pos[0] - self.rect.left) * self.scale_x),
+            math.floor(self.origin[1] + (pos[1] - self.rect.top) * self.scale_y),
+        )
+
+    def to_world(self, screen_pos):
+        return (
+            self.rect.left + (screen_pos[0] - self.origin[0]) / self.scale_x,
+            self.rect.top + (screen_pos[1] - self.origin[1]) / self.scale_y,
+        )
+
+    def scaled_size(self, size):
+        """Size of a sprite at this view's bucketed scale."""
+        if self.is_identity_scale:
+            return (int(size[0]), int(size[1]))
+        return (max(1, int(round(size[0] * self.scale))), max(1, int(round(size[1] * self.scale))))
+
+    def scaled_length(self, length: int) -> int:
+        """Line widths and corner radii at this view's bucketed scale (never thinner than 1 px)."""
+        if length <= 0 or self.is_identity_scale:
+            return int(length)
+        return max(1, int(round(length * self.scale)))
+
+    def sprite_rect(self, world_rect) -> pygame.Rect:
+        """Screen rect for a sprite covering world_rect: bucketed size, centred on the transformed centre."""
+        world_rect = pygame.Rect(world_rect)
+        rect = pygame.Rect((0, 0), self.scaled_size(world_rect.size))
+        rect.center = self.to_screen(world_rect.center)
+        return rect
+
+    def rect_to_screen(self, rect) -> pygame.Rect:
+        rect = pygame.Rect(rect)
+        if self.is_identity_scale:
+            return rect.move(self.origin[0] - self.rect.left, self.origin[1] - self.rect.top)
+        left, top = self.to_screen(rect.topleft)
+        right, bottom = self.to_screen(rect.bottomright)
+        return pygame.Rect(left, top, max(1, right - left), max(1, bottom - top))
@@ -0,0 +1,156 @@
+import numpy as np
+import pygame
+
+
+def segment_bounds(start, end, padding: float = 0.0) -> pygame.Rect:
+    """Axis-aligned rect covering the segment start->end, grown by padding on every side."""
+    left = min(start[0], end[0]) - padding
+    top = min(start[1], end[1]) - padding
+    right = max(start[0], end[0]) + padding
+    bottom = max(start[1], end[1]) + padding
+    return pygame.Rect(int(left) - 1, int(top) - 1, int(right - left) + 2, int(bottom - top) + 2)
+
+
+def segment_rect_toi(start, end, rect, padding: float = 0.0):
+    """
+    Swept test of the segment start->end against an AABB (slab method).
+    The rect is grown by padding, which is the same as sweeping a box of half-size padding.
+    Returns the earliest time of impact t in [0, 1], or None if the segment misses.
+    A segment that starts inside the rect hits at t = 0.
+    """
+    x0, y0 = start[0], start[1]
+    dx = end[0] - x0
+    dy = end[1] - y0
+    t_enter = 0.0
+    t_exit = 1.0
+    for p0, d, lo, hi in (
+        (x0, dx, rect.left - padding, rect.right + padding),
+        (y0, dy, rect.top - padding, rect.bottom + padding),
+    ):
+        if d == 0:
+            # Parallel to this slab: must already be between its planes
+            if p0 < lo or p0 >= hi:
+                return None
+            continue
+        t0 = (lo - p0) / d
+        t1 = (hi - p0) / d
+        if t0 > t1:
+            t0, t1 = t1, t0
+        if t0 > t_enter:
+            t_enter = t0
+        if t1 < t_exit:
+            t_exit = t1
+        if t_enter > t_exit:
+            return None
+    return t_enter
+
+
+def segment_pairs_toi(starts, ends, rects, padding: float = 0.0):
+    """
+    Vectorized segment_rect_toi for K (segment, rect) pairs, e.g. the candidates a broad phase found.
+    starts, ends: (K, 2) arrays; rects: (K, 4) array of (left, top, right, bottom), pair k testing
+    segment k against rect k. Returns a (K,) array of times of impact in [0, 1], np.inf on a miss.
+    """
+    p0 = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+    d = np.asarray(ends, dtype=np.float64).reshape(-1, 2) - p0
+    rects = np.asarray(rects, dtype=np.float64).reshape(-1, 4)
+    lo = rects[:, :2] - padding
+    hi = rects[:, 2:] + padding
+    parallel = d == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t0 = (lo - p0) / d
+        t1 = (hi - p0) / d
+    t_near = np.minimum(t0, t1)
+    t_far = np.maximum(t0, t1)
+    # Parallel to a slab: the whole segment is inside it or it misses the rect
+    inside = (p0 >= lo) & (p0 < hi)
+    t_near = np.where(parallel, np.where(inside, -np.inf, np.inf), t_near)
+    t_far = np.where(parallel, np.where(inside, np.inf, -np.inf), t_far)
+    t_enter = np.maximum(t_near.max(axis=1), 0.0)
+    t_exit = np.minimum(t_far.min(axis=1), 1.0)
+    return np.where(t_enter <= t_exit, t_enter, np.inf)
+
+
+def clamp_rects(rects, bounds_size):
+    """
+    Vectorized pygame.Rect.clamp_ip of (N, 4) int rects (left, top, right, bottom) into (0, 0, w, h).
+    Rects larger than the bounds are centred, like pygame does.
+    """
+    rects = np.array(rects, dtype=np.int64).reshape(-1, 4)
+    for axis, limit in ((0, int(bounds_size[0])), (1, int(bounds_size[1]))):
+        lo = rects[:, axis]
+        size = rects[:, axis + 2] - lo
+        new_lo = np.where(size >= limit, limit // 2 - size // 2,
+                          np.where(lo < 0, 0, np.where(lo + size > limit, limit - size, lo)))
+        rects[:, axis] = new_lo
+        rects[:, axis + 2] = new_lo + size
+    return rects
+
+
+def resolve_rects_obstacles(rects, layers, obstacle_rects, obstacle_masks, cell_size: int, iterations: int = 3):
+    """
+    Push (N, 4) int rects (left, top, right, bottom) out of the obstacles that block their layer.
+    Same result as resolving each rect on its own against SpatialHash candidates in insertion order:
+    every pass takes the candidates from the rect's cells at the start of the pass, then applies the
+    smallest of the four push-outs for each still overlapping obstacle in order (ties: left, right,
+    up, down). Rects are independent, so each pass is vectorized over all of them.
+    Returns the moved rects as a new array.
+    """
+    rects = np.array(rects, dtype=np.int64).reshape(-1, 4)
+    obstacle_rects = np.asarray(obstacle_rects, dtype=np.int64).reshape(-1, 4)
+    count, num_obstacles = rects.shape[0], obstacle_rects.shape[0]
+    if count == 0 or num_obstacles == 0:
+        return rects
+    layers = np.asarray(layers, dtype=np.int64).reshape(-1)
+    blocks = (np.asarray(obstacle_masks, dtype=np.int64)[None, :] & layers[:, None]) != 0
+    # Zero-sized rects never collide (pygame colliderect)
+    blocks &= ((rects[:, 2] > rects[:, 0]) & (rects[:, 3] > rects[:, 1]))[:, None]
+    blocks &= ((obstacle_rects[:, 2] > obstacle_rects[:, 0]) & (obstacle_rects[:, 3] > obstacle_rects[:, 1]))[None, :]
+    obstacle_cells = _cell_ranges(obstacle_rects, cell_size)
+    active = np.ones(count, dtype=bool)
+    for _ in range(iterations):
+        cells = _cell_ranges(rects, cell_size)
+        candidates = blocks & active[:, None]
+        candidates &= (cells[:, None, 0] <= obstacle_cells[None, :, 2]) & (cells[:, None, 2] >= obstacle_cells[None, :, 0])
+        candidates &= (cells[:, None, 1] <= obstacle_cells[None, :, 3]) & (cells[:, None, 3] >= obstacle_cells[None, :, 1])
+        collided = np.zeros(count, dtype=bool)
+        # (rect, obstacle) candidate pairs, obstacles in insertion order within each rect.
+        # Round k applies every rect's k-th candidate at once, so each rect still sees its own order.
+        pair_rows, pair_cols = np.nonzero(candidates)
+        if pair_rows.size == 0:
+            break
+        row_start = np.searchsorted(pair_rows, pair_rows)
+        rank = np.arange(pair_rows.size) - row_start
+        for k in range(int(rank.max()) + 1):
+            in_round = rank == k
+            rows = pair_rows[in_round]
+            o = obstacle_rects[pair_cols[in_round]]
+            r = rects[rows]
+            hit = (r[:, 0] < o[:, 2]) & (r[:, 2] > o[:, 0]) & (r[:, 1] < o[:, 3]) & (r[:, 3] > o[:, 1])
+            if not hit.any():
+                continue
+            rows, r, o = rows[hit], r[hit], o[hit]
+            collided[rows] = True
+            # Overlaps for pushing left, right, up, down; the smallest one wins
+            overlaps = np.stack((r[:, 2] - o[:, 0], o[:, 2] - r[:, 0], r[:, 3] - o[:, 1], o[:, 3] - r[:, 1]), axis=1)
+            choice = np.abs(overlaps).argmin(axis=1)
+            amount = overlaps[np.arange(rows.size), choice]
+            dx = np.where(choice == 0, -amount, np.where(choice == 1, amount, 0))
+            dy = np.where(choice == 2, -amount, np.where(choice == 3, amount, 0))
+            rects[rows] += np.stack((dx, dy, dx, dy), axis=1)
+        if not collided.any():
+            break
+        active = collided
+    return rects
+
+
+def _cell_ranges(rects, cell_size: int):
+    # Inclusive (left, top, right, bottom) grid cells, as SpatialHash buckets a rect
+    cs = int(cell_size)
+    left, top = rects[:, 0], rects[:, 1]
+    return np.stack((
+        left // cs,
+        top // cs,
+        np.maximum(left, rects[:, 2] - 1) // cs,
+        np.maximum(top, rects[:, 3] - 1) // cs,
+    ), axis=1)
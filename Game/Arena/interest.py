@@ -0,0 +1,172 @@
+import copy
+
+from Game.capabilities import capabilities_of, CAP_UPDATE, CAP_COARSE
+
+TIER_ACTIVE = 0   # inside an observer's camera (plus margin): full update every tick, receives events
+TIER_DORMANT = 1  # within radius of a camera: updated every dormant_interval ticks
+TIER_FAR = 2      # everything else: updated every far_interval ticks
+
+
+class InterestManager:
+    """
+    Area of interest for an arena, built on observers' camera rects (Cow.create_camera_surface).
+    Observers are the arena's local players plus any added with add_observer (network clients).
+
+    Each tick classify() looks up only the characters near a camera through the character grid;
+    every other character is far without being visited. Characters with CAP_COARSE catch up on
+    their skipped ticks in one update_coarse(ticks) call, spread over the interval by their roster
+    index so every tick does a similar share; other actors are updated every tick in any tier.
+    A coarse character's sim_tick is the last tick it was simulated through, so a catch-up covers
+    exactly the ticks since its last turn whatever tiers it moved between.
+    AI cost per tick is therefore observers x local density plus characters / far_interval.
+    Without observers every character is active.
+    """
+
+    def __init__(self, radius: int = 600, margin: int = 64, dormant_interval: int = 2, far_interval: int = 8):
+        self.radius = int(radius)
+        self.margin = int(margin)
+        self.dormant_interval = max(1, int(dormant_interval))
+        self.far_interval = max(1, int(far_interval))
+        self.observers = []
+        self.active = {}    # id(character) -> character, this tick
+        self.dormant = {}
+        self._coarse = []   # characters with CAP_COARSE, in roster order
+        self._always = []   # other updating characters
+        self._index = {}    # id(character) -> roster index
+        self._roster_size = 0
+        self._touched = {}  # characters driven by keys this tick
+
+    def __deepcopy__(self, memo):
+        # Indexes are keyed by id(); the copy rebuilds them on its next tick
+        clone = InterestManager(self.radius, self.margin, self.dormant_interval, self.far_interval)
+        memo[id(self)] = clone
+        clone.observers = copy.deepcopy(self.observers, memo)
+        return clone
+
+    def add_observer(self, character):
+        if character not in self.observers:
+            self.observers.append(character)
+
+    def remove_observer(self, character):
+        if character in self.observers:
+            self.observers.remove(character)
+
+    def observers_of(self, arena) -> list:
+        return list(arena.players) + [o for o in self.observers if o not in arena.players]
+
+    def active_rect(self, observer):
+        return observer.create_camera_surface().inflate(self.margin * 2, self.margin * 2)
+
+    def _sync_roster(self, arena):
+        # Characters are only ever appended
+        characters = arena.characters
+        for index in range(self._roster_size, len(characters)):
+            character = characters[index]
+            self._index[id(character)] = index
+            caps = capabilities_of(character)
+            if caps & CAP_COARSE:
+                if character.sim_tick < 0:
+                    # New to tiering: up to date with the previous tick
+                    character.sim_tick = arena.tick_count - 1
+                self._coarse.append(character)
+            elif caps & CAP_UPDATE:
+                self._always.append(character)
+        self._roster_size = len(characters)
+
+    def classify(self, arena):
+        self._sync_roster(arena)
+        active = {}
+        dormant = {}
+        grid = arena.character_grid
+        for observer in self.observers_of(arena):
+            rect = self.active_rect(observer)
+            wide = rect.inflate(self.radius * 2, self.radius * 2)
+            for character in grid.query(wide):
+                key = id(character)
+                if key in active:
+                    continue
+                if rect.colliderect(arena._character_rect(character)):
+                    active[key] = character
+                    dormant.pop(key, None)
+                else:
+                    dormant[key] = character
+        self.active = active
+        self.dormant = dormant
+
+    def touch(self, characters):
+        """Mark characters moved outside their own update (key input) as in play this tick."""
+        for character in characters:
+            self._touched[id(character)] = character
+
+    def tier_of(self, character) -> int:
+        key = id(character)
+        if key in self.active:
+            return TIER_ACTIVE
+        if key in self.dormant:
+            return TIER_DORMANT
+        return TIER_FAR
+
+    def update_actors(self, arena) -> list:
+        """
+        Run this tick's character updates by tier, in roster order. Returns the characters in play
+        this tick (updated, key-driven, active or dormant), in roster order.
+        """
+        self.classify(arena)
+        tick = arena.tick_count
+        if not self.observers_of(arena):
+            for character in arena.characters:
+                if capabilities_of(character) & CAP_UPDATE:
+                    character.update()
+            for character in self._coarse:
+                character.sim_tick = tick
+            self._touched = {}
+            return arena.characters
+        index = self._index
+        due = []  # (roster index, character, coarse)
+        for character in self._always:
+            due.append((index[id(character)], character, False))
+        for key, character in self.active.items():
+            if capabilities_of(character) & CAP_COARSE:
+                due.append((index[key], character, True))
+        interval = self.dormant_interval
+        for key, character in self.dormant.items():
+            if capabilities_of(character) & CAP_COARSE and (index[key] + tick) % interval == 0:
+                due.append((index[key], character, True))
+        interval = self.far_interval
+        for character in self._coarse[tick % interval::interval]:
+            key = id(character)
+            if key not in self.active and key not in self.dormant:
+                due.append((index[key], character, True))
+        due.sort(key=lambda item: item[0])
+        in_play = {}
+        for i, character, coarse in due:
+            if not coarse:
+                character.update()
+            else:
+                # Catch up on every tick since this character's last turn (1 is a plain update)
+                ticks = max(1, tick - character.sim_tick)
+                character.sim_tick = tick
+                if ticks == 1:
+                    character.update()
+                else:
+                    character.update_coarse(ticks)
+            in_play[i] = character
+        # Characters may be key-driven during the updates above (AI moves go through
+        # Arena.handle_key_event), so this tick's touches are collected only now
+        touched = self._touched
+        self._touched = {}
+        for group in (self.active, self.dormant, touched):
+            for key, character in group.items():
+                in_play[index[key]] = character
+        return [in_play[i] for i in sorted(in_play)]
+
+    def event_targets(self, arena) -> list:
+        """The objects inside an observer's active rect (all of them without observers)."""
+        observers = self.observers_of(arena)
+        if not observers:
+            return arena.objects
+        seen = {}
+        for observer in observers:
+            for obj in arena.object_grid.query(self.active_rect(observer)):
+                seen[id(obj)] = obj
+        return list(seen.values())
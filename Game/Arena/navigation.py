@@ -0,0 +1,290 @@
+import heapq
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+# Step costs between neighbouring cells (straight, diagonal), scaled to integers
+_STRAIGHT = 10
+_DIAGONAL = 14
+_NEIGHBOURS = ((1, 0, _STRAIGHT), (-1, 0, _STRAIGHT), (0, 1, _STRAIGHT), (0, -1, _STRAIGHT),
+               (1, 1, _DIAGONAL), (1, -1, _DIAGONAL), (-1, 1, _DIAGONAL), (-1, -1, _DIAGONAL))
+
+
+class NavigationGrid:
+    """
+    Walkability of the world per layer: Arena.obstacles rasterized onto cells of cell_size px, each
+    obstacle grown by clearance (about half a cow) so a walkable cell centre keeps a cow's body clear.
+    Every cell counts the live obstacles covering it, so an obstacle is added or removed (health
+    reaching 0, or coming back on snapshot restore), moved or given another blocking mask by
+    stamping only its old and new cells.
+
+    find_path() runs A* between two cells; flow_field() runs one Dijkstra outward from a goal and
+    gives every cell around it the next cell toward it, so any number of agents heading to the same target
+    (a field, the world centre) share one search. Both are cached (LRU) per layer. A walkability
+    change on a layer drops that layer's cached paths and fields, so a cached answer is always the
+    one a fresh search would give and runs stay deterministic across snapshot restores.
+    """
+
+    def __init__(self, world_size, cell_size: int = 32, clearance: int = 25, max_paths: int = 512,
+                 max_fields: int = 64, max_expansions: int = 20000, field_radius: int = 1600):
+        self.cell_size = int(cell_size)
+        self.clearance = int(clearance)
+        self.cols = max(1, -(-int(world_size[0]) // self.cell_size))
+        self.rows = max(1, -(-int(world_size[1]) // self.cell_size))
+        self.max_paths = int(max_paths)
+        self.max_fields = int(max_fields)
+        # A* gives up (no path) after expanding this many cells
+        self.max_expansions = int(max_expansions)
+        # Flow fields cover the cells within this many px of their goal (agents pick targets closer than that)
+        self.field_radius = int(field_radius)
+        self.obstacles = []
+        self._stamped = []      # per obstacle: (rect, blocking mask) stamped into the cover counts, or None
+        self._cover = {}        # layer -> (rows, cols) int32 count of live obstacles blocking the layer
+        self._walkable = {}     # layer -> flat bytes, 1 where walkable (derived from _cover)
+        self._paths = OrderedDict()   # (layer, start, goal) -> tuple of cells, or None when unreachable
+        self._fields = OrderedDict()  # (layer, goal) -> flow field (see flow_field)
+        self.path_hits = 0
+        self.path_searches = 0
+        self.field_hits = 0
+        self.field_builds = 0
+
+    # ----- Cells -----
+    def cell_of(self, point) -> int:
+        cs = self.cell_size
+        cx = min(max(int(point[0] // cs), 0), self.cols - 1)
+        cy = min(max(int(point[1] // cs), 0), self.rows - 1)
+        return cy * self.cols + cx
+
+    def cell_center(self, cell: int) -> tuple:
+        cs = self.cell_size
+        cy, cx = divmod(cell, self.cols)
+        return (cx * cs + cs // 2, cy * cs + cs // 2)
+
+    def _cell_box(self, rect):
+        # Cells whose centre lies inside rect grown by the clearance, as (c0, c1, r0, r1) inclusive
+        cs = self.cell_size
+        half = cs / 2.0
+        grow = self.clearance
+
+        def span(low, high, count):
+            first = max(0, int(-(-(low - grow - half) // cs)))
+            last = min(count - 1, int(-(-(high + grow - half) // cs)) - 1)
+            return first, last
+
+        c0, c1 = span(rect.left, rect.right, self.cols)
+        r0, r1 = span(rect.top, rect.bottom, self.rows)
+        return c0, c1, r0, r1
+
+    # ----- Rasterization -----
+    def build(self, layers):
+        """Rasterize the layers now (world build time); other layers are rasterized on first use."""
+        for layer in layers:
+            self.walkable(layer)
+
+    def add_obstacle(self, obstacle):
+        self.obstacles.append(obstacle)
+        footprint = self._footprint(obstacle)
+        self._stamped.append(footprint)
+        if footprint is not None:
+            self._stamp(footprint, 1)
+
+    def update_obstacle(self, obstacle):
+        """
+        Re-stamp obstacle after it changed; only its health reaching or leaving 0, its rect or its
+        blocking mask change walkability.
+        """
+        for index, known in enumerate(self.obstacles):
+            if known is obstacle:
+                footprint = self._footprint(obstacle)
+                stamped = self._stamped[index]
+                if footprint != stamped:
+                    if stamped is not None:
+                        self._stamp(stamped, -1)
+                    if footprint is not None:
+                        self._stamp(footprint, 1)
+                    self._stamped[index] = footprint
+                return
+
+    @staticmethod
+    def _footprint(obstacle):
+        return None if obstacle.is_destroyed() else (pygame.Rect(obstacle.rect), obstacle.blocking_mask)
+
+    def _stamp(self, footprint, delta: int):
+        rect, mask = footprint
+        c0, c1, r0, r1 = self._cell_box(rect)
+        if c0 > c1 or r0 > r1:
+            return
+        for layer, cover in self._cover.items():
+            if mask & int(layer):
+                cover[r0:r1 + 1, c0:c1 + 1] += delta
+                self._invalidate(layer)
+
+    def _invalidate(self, layer):
+        self._walkable.pop(layer, None)
+        for key in [key for key in self._paths if key[0] == layer]:
+            del self._paths[key]
+        for key in [key for key in self._fields if key[0] == layer]:
+            del self._fields[key]
+
+    def walkable(self, layer) -> bytes:
+        walkable = self._walkable.get(layer)
+        if walkable is None:
+            cover = self._cover.get(layer)
+            if cover is None:
+                cover = np.zeros((self.rows, self.cols), dtype=np.int32)
+                for footprint in self._stamped:
+                    if footprint is not None and footprint[1] & int(layer):
+                        c0, c1, r0, r1 = self._cell_box(footprint[0])
+                        cover[r0:r1 + 1, c0:c1 + 1] += 1
+                self._cover[layer] = cover
+            walkable = (cover == 0).astype(np.uint8).tobytes()
+            self._walkable[layer] = walkable
+        return walkable
+
+    def is_walkable(self, layer, cell: int) -> bool:
+        return bool(self.walkable(layer)[cell])
+
+    def _neighbours(self, walkable, cell, start, goal):
+        # 8-connected; a diagonal step needs both straight cells open so paths never cut corners
+        cols = self.cols
+        cy, cx = divmod(cell, cols)
+        for dx, dy, cost in _NEIGHBOURS:
+            nx = cx + dx
+            ny = cy + dy
+            if nx < 0 or ny < 0 or nx >= cols or ny >= self.rows:
+                continue
+            neighbour = ny * cols + nx
+            # The start and goal cells are always enterable (a cow beside an obstacle, a pickup against one)
+            if not walkable[neighbour] and neighbour != goal and neighbour != start:
+                continue
+            if dx and dy and not (walkable[cy * cols + nx] and walkable[ny * cols + cx]):
+                continue
+            yield neighbour, cost
+
+    # ----- Queries -----
+    def find_path(self, layer, start: int, goal: int):
+        """Cells from start to goal (both included) along a shortest 8-connected path, or None."""
+        key = (layer, start, goal)
+        paths = self._paths
+        if key in paths:
+            paths.move_to_end(key)
+            self.path_hits += 1
+            return paths[key]
+        self.path_searches += 1
+        path = self._astar(self.walkable(layer), start, goal)
+        paths[key] = path
+        if len(paths) > self.max_paths:
+            paths.popitem(last=False)
+        return path
+
+    def _astar(self, walkable, start, goal):
+        cols = self.cols
+        gy, gx = divmod(goal, cols)
+
+        def heuristic(cell):
+            cy, cx = divmod(cell, cols)
+            dx = abs(cx - gx)
+            dy = abs(cy - gy)
+            return _STRAIGHT * (dx + dy) + (_DIAGONAL - 2 * _STRAIGHT) * min(dx, dy)
+
+        cost = {start: 0}
+        came_from = {start: -1}
+        closed = set()
+        heap = [(heuristic(start), start)]
+        expansions = 0
+        while heap:
+            _, cell = heapq.heappop(heap)
+            if cell in closed:
+                continue
+            closed.add(cell)
+            if cell == goal:
+                path = []
+                while cell != -1:
+                    path.append(cell)
+                    cell = came_from[cell]
+                return tuple(reversed(path))
+            expansions += 1
+            if expansions > self.max_expansions:
+                return None
+            base = cost[cell]
+            for neighbour, step in self._neighbours(walkable, cell, start, goal):
+                new_cost = base + step
+                if new_cost < cost.get(neighbour, 1 << 60):
+                    cost[neighbour] = new_cost
+                    came_from[neighbour] = cell
+                    heapq.heappush(heap, (new_cost + heuristic(neighbour), neighbour))
+        return None
+
+    def flow_field(self, layer, goal: int) -> tuple:
+        """
+        Shortest-path tree toward goal over the cells within field_radius of it, as (left, top, width,
+        height, next cells): for each cell of that window (row-major), the next cell toward goal
+        (goal maps to itself, -1 where unreachable). Cached per (layer, goal).
+        """
+        key = (layer, goal)
+        fields = self._fields
+        field = fields.get(key)
+        if field is not None:
+            fields.move_to_end(key)
+            self.field_hits += 1
+            return field
+        self.field_builds += 1
+        walkable = self.walkable(layer)
+        cols = self.cols
+        gy, gx = divmod(goal, cols)
+        reach = self.field_radius // self.cell_size
+        left = max(0, gx - reach)
+        top = max(0, gy - reach)
+        width = min(cols, gx + reach + 1) - left
+        height = min(self.rows, gy + reach + 1) - top
+        # Local (window) indices inside the search, global cell indices in the result
+        nexts = [-1] * (width * height)
+        cost = [1 << 60] * (width * height)
+        local = (gy - top) * width + (gx - left)
+        nexts[local] = goal
+        cost[local] = 0
+        heap = [(0, local)]
+        while heap:
+            base, here = heapq.heappop(heap)
+            if base > cost[here]:
+                continue
+            ly, lx = divmod(here, width)
+            cell = (ly + top) * cols + lx + left
+            for dx, dy, step in _NEIGHBOURS:
+                nx = lx + dx
+                ny = ly + dy
+                if nx < 0 or ny < 0 or nx >= width or ny >= height:
+                    continue
+                there = ny * width + nx
+                neighbour = (ny + top) * cols + nx + left
+                if not walkable[neighbour]:
+                    # A cow pushed into an obstacle's margin steps out toward the cheapest open neighbour
+                    if nexts[there] == -1:
+                        nexts[there] = cell
+                    continue
+                if dx and dy and not (walkable[cell + dx] and walkable[cell + dy * cols]):
+                    continue
+                new_cost = base + step
+                if new_cost < cost[there]:
+                    cost[there] = new_cost
+                    nexts[there] = cell
+                    heapq.heappush(heap, (new_cost, there))
+        field = (left, top, width, height, nexts)
+        fields[key] = field
+        if len(fields) > self.max_fields:
+            fields.popitem(last=False)
+        return field
+
+    def next_cell(self, layer, cell: int, goal: int) -> int:
+        """Next cell from cell toward goal on the shared flow field (-1 if unreachable or outside the field)."""
+        left, top, width, height, nexts = self.flow_field(layer, goal)
+        cy, cx = divmod(cell, self.cols)
+        x = cx - left
+        y = cy - top
+        if x < 0 or y < 0 or x >= width or y >= height:
+            return -1
+        return nexts[y * width + x]
+
+    def world_center(self) -> tuple:
+        return (self.cols * self.cell_size // 2, self.rows * self.cell_size // 2)
@@ -0,0 +1,118 @@
+import copy
+
+import pygame
+
+
+class SpatialHash:
+    """Uniform grid that buckets objects by the world cells their rect overlaps.
+
+    Queries return candidates in insertion order so callers that stop at the
+    first hit behave the same as a plain list scan.
+    """
+
+    def __init__(self, cell_size: int = 128):
+        self.cell_size = max(1, int(cell_size))
+        self._cells = {}    # (cx, cy) -> {id(obj): obj}
+        self._entries = {}  # id(obj) -> [obj, cell_range, order]
+        self._counter = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __deepcopy__(self, memo):
+        # Buckets are keyed by id(), so re-key them around the copied objects
+        clone = SpatialHash(self.cell_size)
+        memo[id(self)] = clone
+        for obj, cell_range, order in sorted(self._entries.values(), key=lambda e: e[2]):
+            copied = copy.deepcopy(obj, memo)
+            clone._entries[id(copied)] = [copied, cell_range, order]
+            clone._add_to_cells(id(copied), copied, cell_range)
+        clone._counter = self._counter
+        return clone
+
+    def __contains__(self, obj):
+        return id(obj) in self._entries
+
+    def _cell_range(self, rect):
+        cs = self.cell_size
+        left = rect.left // cs
+        top = rect.top // cs
+        right = max(rect.left, rect.right - 1) // cs
+        bottom = max(rect.top, rect.bottom - 1) // cs
+        return (left, top, right, bottom)
+
+    def _add_to_cells(self, key, obj, cell_range):
+        left, top, right, bottom = cell_range
+        cells = self._cells
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = {}
+                bucket[key] = obj
+
+    def _remove_from_cells(self, key, cell_range):
+        left, top, right, bottom = cell_range
+        cells = self._cells
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                bucket.pop(key, None)
+                if not bucket:
+                    del cells[(cx, cy)]
+
+    def insert(self, obj, rect):
+        key = id(obj)
+        if key in self._entries:
+            self.update(obj, rect)
+            return
+        cell_range = self._cell_range(rect)
+        self._entries[key] = [obj, cell_range, self._counter]
+        self._counter += 1
+        self._add_to_cells(key, obj, cell_range)
+
+    def update(self, obj, rect):
+        """Move obj to the cells covered by rect; cheap when it stays in the same cells."""
+        key = id(obj)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.insert(obj, rect)
+            return
+        cell_range = self._cell_range(rect)
+        if cell_range == entry[1]:
+            return
+        self._remove_from_cells(key, entry[1])
+        entry[1] = cell_range
+        self._add_to_cells(key, obj, cell_range)
+
+    def objects(self) -> list:
+        """Every indexed object, in insertion order."""
+        return [entry[0] for entry in sorted(self._entries.values(), key=lambda e: e[2])]
+
+    def remove(self, obj):
+        entry = self._entries.pop(id(obj), None)
+        if entry is None:
+            return
+        self._remove_from_cells(id(obj), entry[1])
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+        self._counter = 0
+
+    def query(self, rect) -> list:
+        """Objects whose cells overlap rect (broad phase only; callers still test rects)."""
+        left, top, right, bottom = self._cell_range(pygame.Rect(rect))
+        cells = self._cells
+        found = {}
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        if len(found) < 2:
+            return list(found.values())
+        entries = self._entries
+        return sorted(found.values(), key=lambda o: entries[id(o)][2])
@@ -0,0 +1,58 @@
+import math
+from collections import OrderedDict
+import pygame
+
+
+class StaticTileCache:
+    """
+    Zoomed tiles of the static world layer, so a scaled camera never resamples the whole frame.
+    Tiles are cut from the static layer on demand, scaled once per (tile, scale) and kept in a
+    bounded LRU. Call clear() whenever the static layer is rebuilt.
+    """
+
+    def __init__(self, screen_tile_size: int = 256, max_tiles: int = 64):
+        # Target on-screen size of one tile; the world size of a tile adapts to the zoom level
+        self.screen_tile_size = int(screen_tile_size)
+        self.max_tiles = int(max_tiles)
+        self._tiles = OrderedDict()
+
+    def clear(self):
+        self._tiles.clear()
+
+    def _world_tile_size(self, scale: float) -> int:
+        size = 2 ** round(math.log2(self.screen_tile_size / max(scale, 1e-6)))
+        return int(max(32, min(2048, size)))
+
+    def draw(self, target, source, view, world_rect=None):
+        """Blit the part of source (world-space static layer) seen by view, or just world_rect of it, onto target."""
+        tile = self._world_tile_size(view.scale)
+        cam = view.rect if world_rect is None else world_rect
+        bounds = source.get_rect()
+        for ty in range(cam.top // tile, (cam.bottom - 1) // tile + 1):
+            for tx in range(cam.left // tile, (cam.right - 1) // tile + 1):
+                tile_rect = pygame.Rect(tx * tile, ty * tile, tile, tile).clip(bounds)
+                if tile_rect.width <= 0 or tile_rect.height <= 0:
+                    continue
+                scaled = self._get_tile(source, tile, tx, ty, tile_rect, view)
+                target.blit(scaled, view.to_screen(tile_rect.topleft))
+
+    def _get_tile(self, source, tile, tx, ty, world_rect, view):
+        key = (tile, tx, ty, view.scale_x, view.scale_y, view.smooth)
+        scaled = self._tiles.get(key)
+        if scaled is not None:
+            self._tiles.move_to_end(key)
+            return scaled
+        # One extra pixel of overlap hides seams from rounding between neighbouring tiles
+        size = (
+            int(math.ceil(world_rect.width * view.scale_x)) + 1,
+            int(math.ceil(world_rect.height * view.scale_y)) + 1,
+        )
+        piece = source.subsurface(world_rect)
+        if view.smooth and piece.get_bitsize() in (24, 32):
+            scaled = pygame.transform.smoothscale(piece, size)
+        else:
+            scaled = pygame.transform.scale(piece, size)
+        self._tiles[key] = scaled
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return scaled
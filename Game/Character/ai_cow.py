@@ -1,31 +1,101 @@
 import random
+import struct
 import pygame
 from pygame import Vector2
 from Game.Character.cow import Cow
+from Game.rng import STREAM_AI
+from Game.capabilities import CAP_COARSE, CAP_AI
+from Game.AI.brain import INTENT_WANDER
+
+WANDER_MS = (500, 1000)  # time between wander direction changes
 
 
 class AICow(Cow):
+    __slots__ = ("_wander_timer", "_wander_dir", "ai_rng",
+                 "ai", "ai_slot", "intent", "target_point", "target_index", "next_think", "think_queued", "last_action",
+                 "path_start", "path_step", "sim_tick")
+    STATE = struct.Struct(Cow.STATE.format + "idd" + "Bddhq?q" + "ii" + "q")
+    CAPABILITIES = Cow.CAPABILITIES | CAP_COARSE | CAP_AI
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._wander_timer = 0
         self._wander_dir = Vector2(0, 0)
+        self.ai_rng = random
+        # Decisions come from the arena's AI director (Game/AI); without one the cow only wanders
+        self.ai = None
+        self.ai_slot = 0
+        self.intent = INTENT_WANDER
+        self.target_point = Vector2(0, 0)
+        self.target_index = -1  # roster index of the character an attack / flee is aimed at
+        self.next_think = 0  # simulation ms (Arena.now_ms) of the next scheduled decision
+        self.think_queued = False
+        self.last_action = -1_000_000  # simulation ms (Arena.now_ms) of the last eat press or shot
+        # A* path being followed (Arena.nav): the cell it was planned from (-1: none) and the next waypoint
+        self.path_start = -1
+        self.path_step = 0
+        # Last tick the interest manager simulated this cow through (-1: not yet under one)
+        self.sim_tick = -1
+
+    def attach_rng(self, rng_service):
+        super().attach_rng(rng_service)
+        self.ai_rng = rng_service.stream(STREAM_AI)
+
+    def attach_ai(self, director):
+        self.ai = director
+        director.register(self)
+
+    def get_state(self) -> tuple:
+        return super().get_state() + (self._wander_timer, self._wander_dir.x, self._wander_dir.y,
+                                      self.intent, self.target_point.x, self.target_point.y, self.target_index,
+                                      self.next_think, self.think_queued, self.last_action,
+                                      self.path_start, self.path_step, self.sim_tick)
+
+    def set_state(self, state):
+        super().set_state(state[:-13])
+        (self._wander_timer, dx, dy, self.intent, tx, ty, self.target_index,
+         self.next_think, self.think_queued, self.last_action, self.path_start, self.path_step, self.sim_tick) = state[-13:]
+        self._wander_dir = Vector2(dx, dy)
+        self.target_point.update(tx, ty)
 
     def update(self):
+        self.update_coarse(1)
+
+    def update_coarse(self, ticks: int):
+        """Act for ticks ticks at once (far from every camera the arena updates AI coarsely)."""
         super().update()
-        # Simple wandering: pick a direction every ~0.5s
-        self._wander_timer -= 1
-        if self._wander_timer <= 0:
-            self._wander_timer = random.randint(30, 60)
-            dx = random.choice([-1, 0, 1])
-            dy = random.choice([-1, 0, 1])
-            self._wander_dir = Vector2(dx, dy)
-        # Apply movement
+        ai = self.ai
+        if ai is None or self.is_dead():
+            self.wander(ticks)
+            return
+        if ai.arena.now_ms() >= self.next_think:
+            ai.request(self)
+        ai.act(self, ticks)
+
+    def wander(self, ticks: int):
+        """Wander for ticks ticks; runs without a direction change move in a single step."""
+        remaining = int(ticks)
+        while remaining > 0:
+            if self._wander_timer > 1:
+                run = min(remaining, self._wander_timer - 1)
+                self._wander_timer -= run
+            else:
+                # Simple wandering: pick a direction every 0.5-1 s, counted in ticks at the cow's tick rate
+                run = 1
+                self._wander_timer = max(1, self.ai_rng.randint(*WANDER_MS) * self.tick_rate // 1000)
+                dx = self.ai_rng.choice([-1, 0, 1])
+                dy = self.ai_rng.choice([-1, 0, 1])
+                self._wander_dir = Vector2(dx, dy)
+            self._wander(run)
+            remaining -= run
+
+    def _wander(self, ticks: int):
+        step = self._current_move_step() * ticks
         if self._wander_dir.x > 0:
-            self.move_right()
+            self.position.x += step
         elif self._wander_dir.x < 0:
-            self.move_left()
+            self.position.x -= step
         if self._wander_dir.y > 0:
-            self.move_down()
+            self.position.y += step
         elif self._wander_dir.y < 0:
-            self.move_up()
-
+            self.position.y -= step
@@ -1,16 +1,38 @@
 import pygame
 import random
 import math
+import struct
 from pygame import Vector2
-from Game.constants import FONT, YELLOW, ZOOM_STEP, ZOOM_MAX
+from Game.constants import FONT, YELLOW, ZOOM_STEP, ZOOM_MAX, TICK_RATE
 from Game.layers import LAYER_GROUND
-from Game.assets import load_image
+from Game.assets import load_image, get_scaled, get_rotated
+from Game.rng import STREAM_LOOT
+from Game.capabilities import (CAP_UPDATE, CAP_DRAW, CAP_EVENTS, CAP_BODY, CAP_INTERPOLATED, CAP_CLOCK,
+                               CAP_DAMAGEABLE, CAP_ARMED, CAP_EATS, CAP_CAMERA, CAP_TIMERS, CAP_RANDOM)
 
 class Cow:
-    def __init__(self, rect, username, starting_position, base_health: int = 100, base_stamina: int = 100, camera_display_size: int = (0,0), world_display_size: int = (0,0), color=YELLOW, renderer=None, move_step: int = 1, ammo_find_probability: float = 0.2, starting_ammo: int = 0, eating_slowdown_pct: float = 0.4):
+    # Fixed attribute layout (no per-instance __dict__); subclasses may add their own slots
+    __slots__ = (
+        "rect", "draw_rect", "draw_view", "font", "color",
+        "camera_size", "world_size", "zoom", "zoom_step", "max_zoom", "min_zoom",
+        "username", "max_health", "health", "stamina", "ammo", "ammo_find_probability", "weapon",
+        "position", "prev_position", "rotation", "layer_height", "move_speed", "base_move_speed", "tick_rate",
+        "eating_slowdown_pct", "_is_eating",
+        "size_scale", "min_scale", "max_scale", "scale_health_factor", "scale_speed_factor", "base_rect_size",
+        "eat_growth_percent", "poop_percent", "eat_cooldown_ms", "poop_cooldown_ms", "_last_eat_ms", "_last_poop_ms",
+        "clock", "scheduler", "_eat_ready", "_poop_ready", "rng", "renderer", "layer", "cow_sprite", "dead_sprite", "aim_direction",
+    )
+    CAPABILITIES = (CAP_UPDATE | CAP_DRAW | CAP_EVENTS | CAP_BODY | CAP_INTERPOLATED | CAP_CLOCK
+                    | CAP_DAMAGEABLE | CAP_ARMED | CAP_EATS | CAP_CAMERA | CAP_TIMERS | CAP_RANDOM)
+    # Snapshot row (Game/snapshot.py), in get_state() order; subclasses append their own fields
+    STATE = struct.Struct("<9d6i2q?")
+
+    def __init__(self, rect, username, starting_position, base_health: int = 100, base_stamina: int = 100, camera_display_size: int = (0,0), world_display_size: int = (0,0), color=YELLOW, renderer=None, move_speed: float = 60.0, ammo_find_probability: float = 0.2, starting_ammo: int = 0, eating_slowdown_pct: float = 0.4):
 
         # Visual
         self.rect = pygame.Rect(rect)
+        self.draw_rect = self.rect.copy()
+        self.draw_view = None
         self.font = FONT
         self.color = color
 
@@ -34,13 +56,18 @@ class Cow:
         # Inventory
         self.ammo = int(starting_ammo)
         self.ammo_find_probability = float(ammo_find_probability)
+        self.weapon = None
         
         # Movement
         self.position = Vector2(starting_position)
+        # Position at the start of the current simulation tick, used to interpolate rendering
+        self.prev_position = Vector2(starting_position)
         self.rotation = 0 
         self.layer_height = 0 # this would be the height from the ground, for example walking is 0 while flying is 1
-        self.move_step = move_step
-        self.base_move_step = move_step
+        # World px / second; each tick moves move_speed / tick_rate (the arena sets its tick rate)
+        self.move_speed = float(move_speed)
+        self.base_move_speed = float(move_speed)
+        self.tick_rate = TICK_RATE
         self.eating_slowdown_pct = float(eating_slowdown_pct)
         self._is_eating = False
         # Size scaling
@@ -58,6 +85,15 @@ class Cow:
         self.poop_cooldown_ms = 500
         self._last_eat_ms = 0
         self._last_poop_ms = 0
+        # Millisecond clock for cooldowns; the arena swaps in its simulation clock
+        self.clock = pygame.time.get_ticks
+        # With a scheduler (attach_scheduler) cooldown ends arrive as timer events and flip these
+        # flags; without one the cooldowns are checked against the clock when an action is tried
+        self.scheduler = None
+        self._eat_ready = True
+        self._poop_ready = True
+        # Random source for ammo finds (the global random module until the arena attaches its streams)
+        self.rng = random
 
         # Rendering (pluggable)
         self.renderer = renderer if renderer is not None else self._default_renderer
@@ -80,11 +116,13 @@ class Cow:
         # Aiming
         self.aim_direction = Vector2(1, 0)
 
-    def create_camera_surface(self):
+    def create_camera_surface(self, center=None):
+        if center is None:
+            center = self.position
         cam_w = int(self.camera_size[0] / self.zoom)
         cam_h = int(self.camera_size[1] / self.zoom)
-        left = int(self.position[0] - cam_w // 2)
-        top  = int(self.position[1] - cam_h // 2)
+        left = int(center[0] - cam_w // 2)
+        top  = int(center[1] - cam_h // 2)
         # clamp to world bounds
         left = max(0, min(self.world_size[0] - cam_w, left))
         top  = max(0, min(self.world_size[1] - cam_h, top))
@@ -155,8 +193,18 @@ class Cow:
     def update(self):
         self.handle_collisions()
 
-    def draw(self, world_screen):
-        self.rect.center = self.position
+    def render_position(self, alpha: float = 1.0) -> Vector2:
+        """Position blended between the previous and current tick (alpha 0 -> prev, 1 -> current)."""
+        if alpha >= 1.0:
+            return Vector2(self.position)
+        return self.prev_position.lerp(self.position, max(0.0, float(alpha)))
+
+    def draw(self, world_screen, alpha: float = 1.0, view=None):
+        pos = self.render_position(alpha)
+        self.rect.center = (int(pos.x), int(pos.y))
+        # draw_rect is where this frame's sprite goes on the target surface (world space without a view)
+        self.draw_view = view
+        self.draw_rect = self.rect.copy() if view is None else view.sprite_rect(self.rect)
         self.renderer(world_screen)
         # Draw weapon overlay if equipped
         if self.has_weapon():
@@ -165,27 +213,34 @@ class Cow:
             if hasattr(weapon, "get_floor_sprite"):
                 sprite = weapon.get_floor_sprite()
             if sprite is not None:
-                # Compute rotation towards aim direction
-                dir_vec = Vector2(self.aim_direction)
-                if dir_vec.length() == 0:
-                    dir_vec = Vector2(1, 0)
-                angle = -math.degrees(math.atan2(dir_vec.y, dir_vec.x))
-                rotated = pygame.transform.rotate(sprite, angle)
-                rect = rotated.get_rect(center=(int(self.position.x), int(self.position.y)))
+                sprite = self._view_sprite(sprite)
+                # Rotate towards aim direction using the shared pre-rotated sprite cache
+                dx, dy = self.aim_direction.x, self.aim_direction.y
+                if dx == 0 and dy == 0:
+                    dx = 1
+                rotated = get_rotated(sprite, -math.degrees(math.atan2(dy, dx)))
+                rect = rotated.get_rect(center=self.draw_rect.center)
                 world_screen.blit(rotated, rect)
 
+    def _view_sprite(self, sprite):
+        # Zoomed copy from the scaled-sprite cache when drawing through a scaling camera view
+        view = self.draw_view
+        if view is None or view.is_identity_scale:
+            return sprite
+        return get_scaled(sprite, view.scaled_size(sprite.get_size()), view.smooth)
+
     def _default_renderer(self, world_screen):
         if self.is_dead() and self.dead_sprite is not None:
-            rect = self.dead_sprite.get_rect(center=self.rect.center)
-            world_screen.blit(self.dead_sprite, rect)
+            sprite = self._view_sprite(self.dead_sprite)
+            world_screen.blit(sprite, sprite.get_rect(center=self.draw_rect.center))
         elif self.cow_sprite is not None:
-            rect = self.cow_sprite.get_rect(center=self.rect.center)
-            world_screen.blit(self.cow_sprite, rect)
+            sprite = self._view_sprite(self.cow_sprite)
+            world_screen.blit(sprite, sprite.get_rect(center=self.draw_rect.center))
         else:
-            pygame.draw.rect(world_screen, self.color, self.rect)
+            pygame.draw.rect(world_screen, self.color, self.draw_rect)
 
     def set_renderer(self, renderer):
-        """Swap the rendering function. Signature: func(surface) -> None"""
+        """Swap the rendering function. Signature: func(surface) -> None; draw into self.draw_rect (self.draw_view is the camera view or None)."""
         self.renderer = renderer if renderer is not None else self._default_renderer
 
     # ----- Zoom helpers -----
@@ -196,6 +251,12 @@ class Cow:
             return 0.25
         return max(cw / ww, ch / wh, 0.25)
 
+    def set_camera_size(self, size):
+        """Resize the camera's screen area (e.g. a split-screen viewport) and re-clamp zoom."""
+        self.camera_size = (int(size[0]), int(size[1]))
+        self.min_zoom = self._compute_min_zoom()
+        self.zoom = max(self.min_zoom, min(self.max_zoom, float(self.zoom)))
+
     def adjust_zoom(self, delta):
         new_zoom = float(self.zoom) + float(delta)
         self.zoom = max(self.min_zoom, min(self.max_zoom, new_zoom))
@@ -208,7 +269,7 @@ class Cow:
         """
         if self.is_dead():
             return False
-        if random.random() < self.ammo_find_probability:
+        if self.rng.random() < self.ammo_find_probability:
             self.ammo += 1
             return True
         return False
@@ -220,10 +281,13 @@ class Cow:
         """
         if self.is_dead():
             return False
-        now = pygame.time.get_ticks()
-        if now - self._last_eat_ms < self.eat_cooldown_ms:
+        now = self.clock()
+        if not self._eat_cooldown_over(now):
             return False
         self._last_eat_ms = now
+        if self.scheduler is not None:
+            self._eat_ready = False
+            self.scheduler.schedule(now + self.eat_cooldown_ms, self._end_eat_cooldown)
         grew = self._grow_on_eat()
         ammo_found = self.find_ammo()
         return ammo_found or grew
@@ -235,9 +299,10 @@ class Cow:
 
     # ----- Speed modifiers -----
     def _current_move_step(self) -> float:
+        """Distance moved per tick, in world px."""
         if self.is_dead():
             return 0.0
-        step = float(self.base_move_step)
+        step = self.base_move_speed / self.tick_rate
         # apply scale effect (bigger -> slower)
         step *= max(0.1, 1.0 - (self.size_scale - 1.0) * self.scale_speed_factor)
         if self._is_eating:
@@ -249,10 +314,10 @@ class Cow:
         self.weapon = weapon
 
     def has_weapon(self) -> bool:
-        return getattr(self, "weapon", None) is not None
+        return self.weapon is not None
 
     def get_weapon(self):
-        return getattr(self, "weapon", None)
+        return self.weapon
 
     def _try_shoot(self):
         if self.is_dead():
@@ -290,6 +355,9 @@ class Cow:
         new_h = max(6, int(base_h * self.size_scale))
         self.rect.size = (new_w, new_h)
         self.rect.center = (int(cx), int(cy))
+        self._load_sprites()
+
+    def _load_sprites(self):
         # Rescale sprites if available
         try:
             self.cow_sprite = load_image("cow.png", (self.rect.width, self.rect.height))
@@ -317,10 +385,13 @@ class Cow:
     def poop(self) -> bool:
         if self.is_dead():
             return False
-        now = pygame.time.get_ticks()
-        if now - self._last_poop_ms < self.poop_cooldown_ms:
+        now = self.clock()
+        if not self._poop_cooldown_over(now):
             return False
         self._last_poop_ms = now
+        if self.scheduler is not None:
+            self._poop_ready = False
+            self.scheduler.schedule(now + self.poop_cooldown_ms, self._end_poop_cooldown)
         old_scale = self.size_scale
         self.size_scale = max(self.min_scale, self.size_scale * (1.0 - self.poop_percent))
         if self.size_scale != old_scale:
@@ -333,6 +404,57 @@ class Cow:
             return True
         return False
 
+    # ----- Snapshot state -----
+    def get_state(self) -> tuple:
+        """Simulation state as a flat tuple packed with STATE (the weapon is stored by the snapshot itself)."""
+        return (self.position.x, self.position.y, self.prev_position.x, self.prev_position.y,
+                self.aim_direction.x, self.aim_direction.y, self.size_scale, float(self.zoom), float(self.stamina),
+                self.max_health, self.health, self.ammo, self.layer, self.rect.width, self.rect.height,
+                self._last_eat_ms, self._last_poop_ms, self._is_eating)
+
+    def set_state(self, state):
+        (px, py, qx, qy, ax, ay, self.size_scale, self.zoom, self.stamina,
+         self.max_health, self.health, self.ammo, self.layer, w, h,
+         self._last_eat_ms, self._last_poop_ms, self._is_eating) = state
+        self.position.update(px, py)
+        self.prev_position.update(qx, qy)
+        self.aim_direction = Vector2(ax, ay)
+        if self.rect.size != (w, h):
+            self.rect.size = (w, h)
+            self._load_sprites()
+
+    def attach_rng(self, rng_service):
+        """Draw from the arena's named streams so a match seed fixes every roll."""
+        self.rng = rng_service.stream(STREAM_LOOT)
+
+    # ----- Cooldowns -----
+    def attach_scheduler(self, scheduler):
+        """Drive eat/poop cooldowns from scheduler events (on the same clock as self.clock)."""
+        self.scheduler = scheduler
+        now = self.clock()
+        self._eat_ready = now - self._last_eat_ms >= self.eat_cooldown_ms
+        self._poop_ready = now - self._last_poop_ms >= self.poop_cooldown_ms
+        if not self._eat_ready:
+            scheduler.schedule(self._last_eat_ms + self.eat_cooldown_ms, self._end_eat_cooldown)
+        if not self._poop_ready:
+            scheduler.schedule(self._last_poop_ms + self.poop_cooldown_ms, self._end_poop_cooldown)
+
+    def _eat_cooldown_over(self, now) -> bool:
+        if self.scheduler is not None:
+            return self._eat_ready
+        return now - self._last_eat_ms >= self.eat_cooldown_ms
+
+    def _poop_cooldown_over(self, now) -> bool:
+        if self.scheduler is not None:
+            return self._poop_ready
+        return now - self._last_poop_ms >= self.poop_cooldown_ms
+
+    def _end_eat_cooldown(self):
+        self._eat_ready = True
+
+    def _end_poop_cooldown(self):
+        self._poop_ready = True
+
     # ----- Health API -----
     def take_damage(self, amount: float):
         new_hp = max(0, int(self.health - float(amount)))
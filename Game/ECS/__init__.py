@@ -0,0 +1,3 @@
+from .components import Component, ACTOR, RENDERABLE, TRIGGER, PICKUP, EXPIRES, OBJECT, STATIC
+from .world import World, Table
+from .archetypes import components_for
@@ -0,0 +1,27 @@
+from Game.capabilities import capabilities_of, CAP_UPDATE, CAP_DRAW, CAP_EXPIRES, CAP_COLLIDE, CAP_PICKUP
+from Game.ECS.components import ACTOR, RENDERABLE, TRIGGER, PICKUP, EXPIRES, OBJECT, STATIC
+
+
+def components_for(obj, static: bool = False, is_object: bool = False) -> tuple:
+    """
+    Archetype (tag set) of a game object, derived from its declared capabilities. Projectiles are
+    not world entities: ProjectilePool is their table.
+    """
+    caps = capabilities_of(obj)
+    components = []
+    if caps & CAP_UPDATE:
+        components.append(ACTOR)
+    if caps & CAP_DRAW:
+        components.append(RENDERABLE)
+    if caps & CAP_COLLIDE:
+        components.append(TRIGGER)
+    if caps & CAP_PICKUP:
+        components.append(PICKUP)
+    if caps & CAP_EXPIRES:
+        components.append(EXPIRES)
+    if is_object:
+        components.append(OBJECT)
+    if static:
+        components.append(STATIC)
+    return tuple(components)
+
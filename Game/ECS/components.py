@@ -0,0 +1,24 @@
+class Component:
+    """
+    A tag component: it only marks which archetype tables an entity belongs to, so systems can ask
+    the World for the entities they touch. Entity data (positions, rects, health, inventories,
+    lifetimes) stays on the game objects, which every system reads directly.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f"Component({self.name!r})"
+
+
+# Tags: which systems touch an entity's object
+ACTOR = Component("actor")            # object.update() every tick
+RENDERABLE = Component("renderable")  # object.draw(...)
+TRIGGER = Component("trigger")        # object.on_character_collide(character, arena)
+PICKUP = Component("pickup")          # consumed by the first unarmed cow touching it
+EXPIRES = Component("expires")        # object.alive; dead entities are despawned
+OBJECT = Component("object")          # dynamic world object (Arena.objects)
+STATIC = Component("static")          # part of the cached static layer (fields, obstacles)
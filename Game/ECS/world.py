@@ -0,0 +1,147 @@
+import copy
+
+import numpy as np
+
+
+class Table:
+    """
+    Every entity of one archetype (one exact tag set): entity ids and their game objects.
+    Rows [0, count) are live, in spawn order; removal compacts the survivors.
+    """
+
+    def __init__(self, components, capacity: int = 16):
+        self.components = tuple(components)
+        self.names = frozenset(c.name for c in self.components)
+        self.count = 0
+        self.objects = []
+        self._capacity = max(1, int(capacity))
+        self.entities = np.zeros(self._capacity, dtype=np.int64)
+
+    def __len__(self):
+        return self.count
+
+    def has(self, component) -> bool:
+        return component.name in self.names
+
+    def _grow(self):
+        self._capacity *= 2
+        entities = np.zeros(self._capacity, dtype=np.int64)
+        entities[:self.count] = self.entities[:self.count]
+        self.entities = entities
+
+    def add(self, entity: int, obj) -> int:
+        if self.count == self._capacity:
+            self._grow()
+        row = self.count
+        self.count += 1
+        self.entities[row] = entity
+        self.objects.append(obj)
+        return row
+
+    def remove_rows(self, rows):
+        """Drop rows, keeping the survivors in order."""
+        keep = np.ones(self.count, dtype=bool)
+        keep[np.asarray(rows, dtype=np.int64)] = False
+        index = np.flatnonzero(keep)
+        size = index.size
+        self.entities[:size] = self.entities[index]
+        self.objects = [self.objects[i] for i in index.tolist()]
+        self.count = size
+
+
+class World:
+    """
+    Tag index of the arena's entities, grouped into archetype tables. Systems ask for the tables
+    that carry the tags they need (query), so an entity type only costs time in the systems that
+    use it. Every entity keeps its game object (Cow, Poop, ...), which holds all of its data.
+    """
+
+    def __init__(self):
+        self._tables = {}       # frozenset of component names -> Table
+        self._table_order = []  # tables in creation order
+        self._locations = {}    # entity id -> (table, row)
+        self._by_object = {}    # id(object) -> entity id
+        self._next_id = 0
+        self._query_cache = {}
+
+    def __len__(self):
+        return len(self._locations)
+
+    def __deepcopy__(self, memo):
+        # _by_object is keyed by id(), so rebuild it from the copied tables
+        clone = World.__new__(World)
+        memo[id(self)] = clone
+        for name, value in self.__dict__.items():
+            if name != "_by_object":
+                setattr(clone, name, copy.deepcopy(value, memo))
+        clone._by_object = {}
+        for entity, (table, row) in clone._locations.items():
+            obj = table.objects[row]
+            if obj is not None:
+                clone._by_object[id(obj)] = entity
+        return clone
+
+    def __contains__(self, entity):
+        return entity in self._locations
+
+    def _table_for(self, components) -> Table:
+        key = frozenset(c.name for c in components)
+        table = self._tables.get(key)
+        if table is None:
+            table = Table(sorted(components, key=lambda c: c.name))
+            self._tables[key] = table
+            self._table_order.append(table)
+            self._query_cache.clear()
+        return table
+
+    def spawn(self, components, obj=None) -> int:
+        """Create an entity with the given tags for obj; returns its id."""
+        table = self._table_for(components)
+        entity = self._next_id
+        self._next_id += 1
+        row = table.add(entity, obj)
+        self._locations[entity] = (table, row)
+        if obj is not None:
+            self._by_object[id(obj)] = entity
+        return entity
+
+    def despawn_many(self, entities):
+        """Remove entities in one compaction per table."""
+        rows_by_table = {}
+        for entity in entities:
+            location = self._locations.pop(entity, None)
+            if location is None:
+                continue
+            table, row = location
+            obj = table.objects[row]
+            if obj is not None:
+                self._by_object.pop(id(obj), None)
+            rows_by_table.setdefault(id(table), (table, []))[1].append(row)
+        for table, rows in rows_by_table.values():
+            table.remove_rows(rows)
+            # Rows after the first removed one shifted down
+            start = min(rows)
+            for row, entity in enumerate(table.entities[start:table.count].tolist(), start):
+                self._locations[entity] = (table, row)
+
+    def entity_of(self, obj):
+        return self._by_object.get(id(obj))
+
+    def despawn_objects(self, objects):
+        self.despawn_many([e for e in (self.entity_of(o) for o in objects) if e is not None])
+
+    def query(self, *components) -> list:
+        """Tables holding every given tag, in creation order."""
+        key = frozenset(c.name for c in components)
+        tables = self._query_cache.get(key)
+        if tables is None:
+            tables = [t for t in self._table_order if key <= t.names]
+            self._query_cache[key] = tables
+        return tables
+
+    def objects(self, *components) -> list:
+        """Game objects of every entity holding the given tags (table by table, spawn order within a table)."""
+        found = []
+        for table in self.query(*components):
+            found.extend(table.objects[:table.count])
+        return found
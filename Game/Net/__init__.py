@@ -0,0 +1,5 @@
+from .transport import UdpEndpoint, LinkConditions
+from .protocol import InputFrame
+from .server import ArenaServer, RemoteClient, create_server
+from .client import ArenaClient
+from .prediction import MovementPredictor
@@ -0,0 +1,340 @@
+"""Thin arena client: sends input frames, mirrors the server's state and renders it.
+
+Run: python -m Game.Net.client [--host 127.0.0.1] [--port 47800] [--name NAME]
+"""
+
+import argparse
+import math
+import sys
+import time
+from collections import deque
+
+import pygame
+
+from Game.Arena.arena import Arena
+from Game.constants import SCREEN_W, SCREEN_H
+from Game.controls import PLAYER_KEY_BINDINGS, convert_key_to_string
+from Game.game_loop import FixedTimestep
+from Game.replay import keys_to_mask
+from Game.Character.cow import Cow
+from Game.Objects import Poop, WeaponPickup
+from Game.Weapons import make_bow
+from Game.Net import protocol
+from Game.Net.protocol import (NO_TICK, InputFrame, INPUT_FIRE, KIND_COW, KIND_OBJECT, KIND_PROJECTILE, KIND_OBSTACLE,
+                               KIND_SELF, COW_RECORD, OBJECT_RECORD, PROJECTILE_RECORD, OBSTACLE_RECORD, SELF_RECORD,
+                               COW_ARMED, COW_EATING, OBJECT_POOP)
+from Game.Net.prediction import MovementPredictor
+from Game.Net.transport import UdpEndpoint, LinkConditions
+
+# Zoom stays on the client (it is sent as a value, not as held keys)
+_LOCAL_ACTIONS = ("zoom_in", "zoom_out")
+
+
+class ArenaClient:
+    """
+    Joins a server (HELLO, retried until WELCOME), then each step() sends one input frame and applies
+    the newest state received. The local Arena is built from the match seed, so fields and obstacles
+    match the server's; it is never updated, only mirrored: characters, objects, projectiles and
+    obstacle damage come from state records. With predict, the own cow moves as soon as a key is
+    pressed (MovementPredictor) and is reconciled with every state instead of waiting a round trip.
+    """
+
+    def __init__(self, server_addr, endpoint: UdpEndpoint, camera_size=(SCREEN_W, SCREEN_H), name: str = "player",
+                 screen=None, redundancy: int = 4, hello_interval_s: float = 0.25,
+                 history_ticks: int = 64, predict: bool = True):
+        self.server_addr = tuple(server_addr)
+        self.endpoint = endpoint
+        self.camera_size = tuple(camera_size)
+        self.name = name
+        self.screen = screen
+        self.redundancy = max(1, int(redundancy))
+        self.hello_interval_s = float(hello_interval_s)
+        self.history_ticks = int(history_ticks)
+        self.predict = bool(predict)
+        self.predictor = None
+        self.arena = None
+        self.cow = None
+        self.index = None
+        self.send_interval = 1
+        self.seq = 0
+        self.unacked = deque()  # frames sent but not yet applied by the server
+        self.last_input_seq = 0
+        self.state_tick = NO_TICK
+        self.states = {}        # tick -> {(kind, id): record}, kept as baselines for later deltas
+        self.proxies = {}       # character index -> Cow
+        self.objects = {}       # world entity id on the server -> local object
+        self._aim = None
+        self._fire = False
+        self._last_hello = None
+        self._bow = make_bow()
+        self.states_received = 0
+        self.states_dropped = 0
+
+    @property
+    def connected(self) -> bool:
+        return self.arena is not None
+
+    # ------- Receiving -------
+    def poll(self):
+        """Handle every datagram waiting; joins on WELCOME and applies the newest decodable state."""
+        if not self.connected:
+            now = self.endpoint.clock()
+            if self._last_hello is None or now - self._last_hello >= self.hello_interval_s:
+                self.endpoint.send(protocol.encode_hello(self.camera_size, self.name), self.server_addr)
+                self._last_hello = now
+        newest = newest_seq = None
+        for data, addr in self.endpoint.receive():
+            if addr != self.server_addr:
+                continue
+            kind = protocol.message_type(data)
+            if kind == protocol.MSG_WELCOME and not self.connected:
+                self._on_welcome(*protocol.decode_welcome(data))
+            elif kind == protocol.MSG_STATE and self.connected:
+                decoded = self._decode_state(data)
+                if decoded is not None and (newest is None or decoded[0] > newest):
+                    newest, newest_seq = decoded
+        if newest is not None and (self.state_tick == NO_TICK or newest > self.state_tick):
+            self._apply(self.states[newest], newest_seq)
+            self.state_tick = newest
+            self.arena.tick_count = newest
+        self.endpoint.flush()
+
+    def _on_welcome(self, seed, world_size, tick_rate, index, send_interval):
+        world_screen = pygame.Surface(world_size) if self.screen is not None else None
+        self.arena = Arena((0, 0, self.camera_size[0], self.camera_size[1]), world_size, self.screen,
+                           world_screen, "Arena", seed=seed)
+        self.arena.tick_rate = tick_rate
+        self.index = index
+        self.send_interval = send_interval
+        self.cow = self._proxy(index)
+        if self.predict:
+            self.predictor = MovementPredictor(self.arena, self.cow)
+
+    def _decode_state(self, data):
+        tick, baseline_tick, last_input_seq, _, records, removals = protocol.decode_state(data)
+        if tick in self.states:
+            return None
+        if baseline_tick == NO_TICK:
+            known = {}
+        elif baseline_tick in self.states:
+            known = dict(self.states[baseline_tick])
+        else:
+            # Baseline already pruned (a very late datagram); a newer state will follow
+            self.states_dropped += 1
+            return None
+        for key in removals:
+            known.pop(key, None)
+        for key, payload in records:
+            known[key] = payload
+        self.states[tick] = known
+        for old in [t for t in self.states if t <= tick - self.history_ticks]:
+            del self.states[old]
+        self.states_received += 1
+        if last_input_seq > self.last_input_seq:
+            self.last_input_seq = last_input_seq
+            while self.unacked and self.unacked[0].seq <= last_input_seq:
+                self.unacked.popleft()
+        return tick, last_input_seq
+
+    # ------- Mirroring -------
+    def _proxy(self, index):
+        cow = self.proxies.get(index)
+        if cow is None:
+            world_size = self.arena.world_dimensions
+            cow = Cow((0, 0, 50, 50), f"cow{index}", (0, 0), camera_display_size=self.camera_size,
+                      world_display_size=world_size)
+            if index == self.index:
+                cow.username = self.name
+                self.arena.add_player(cow)
+            else:
+                self.arena.add_new_character(cow)
+            self.proxies[index] = cow
+        return cow
+
+    def _apply(self, known, last_input_seq):
+        arena = self.arena
+        predictor = self.predictor
+        own_position = None
+        visible = set()
+        objects = {}
+        arena.projectiles.clear()
+        for (kind, ident), payload in known.items():
+            if kind == KIND_COW:
+                cow = self._proxy(ident)
+                record = COW_RECORD.unpack(payload)
+                own = ident == self.index
+                _apply_cow(cow, record, self._bow, own=own, position=not (own and predictor is not None))
+                if own:
+                    own_position = record[:2]
+                visible.add(ident)
+            elif kind == KIND_SELF:
+                cow = self.cow
+                cow.size_scale, cow.base_move_speed, cow.eating_slowdown_pct = SELF_RECORD.unpack(payload)
+            elif kind == KIND_OBJECT:
+                objects[ident] = OBJECT_RECORD.unpack(payload)
+            elif kind == KIND_PROJECTILE:
+                x, y, vx, vy = PROJECTILE_RECORD.unpack(payload)
+                bow = self._bow
+                slot = arena.spawn_projectile((x, y), (vx, vy), math.hypot(vx, vy), bow.get_projectile_sprite(),
+                                              sprite_heading=bow.projectile_image_heading,
+                                              sprite_ref=(bow.projectile_image_name, bow.projectile_image_scale))
+                dt = 1.0 / arena.tick_rate
+                arena.projectiles.prev_position[slot] = (x - vx * dt, y - vy * dt)
+            elif kind == KIND_OBSTACLE:
+                obstacle = arena.obstacles[ident]
+                (health,) = OBSTACLE_RECORD.unpack(payload)
+                if obstacle.health != health:
+                    obstacle.apply_damage(obstacle.health - health)
+        if predictor is not None and own_position is not None:
+            predictor.reconcile(own_position, last_input_seq)
+        # Cows outside the area of interest are kept but leave the grid, so they are not drawn
+        for index, cow in self.proxies.items():
+            if index in visible:
+                rect = cow.get_world_rect()
+                if cow in arena.character_grid:
+                    arena.character_grid.update(cow, rect)
+                else:
+                    arena.character_grid.insert(cow, rect)
+            elif cow in arena.character_grid:
+                arena.character_grid.remove(cow)
+        self._sync_objects(objects)
+
+    def _sync_objects(self, records):
+        arena = self.arena
+        gone = [ident for ident in self.objects if ident not in records]
+        if gone:
+            removed = [self.objects.pop(ident) for ident in gone]
+            for obj in removed:
+                arena.object_grid.remove(obj)
+            arena.world.despawn_objects(removed)
+        for ident, (kind, left, top, w, h) in records.items():
+            obj = self.objects.get(ident)
+            if obj is not None and tuple(obj.rect) == (left, top, w, h):
+                continue
+            if obj is not None:
+                arena.object_grid.remove(obj)
+                arena.world.despawn_objects([obj])
+            rect = pygame.Rect(left, top, w, h)
+            if kind == OBJECT_POOP:
+                obj = Poop(rect.center, size=rect.size, clock=arena.now_ms)
+            else:
+                obj = WeaponPickup(self._bow, rect.center)
+            obj.rect = rect
+            arena.add_new_object(obj)
+            self.objects[ident] = obj
+
+    # ------- Sending -------
+    def handle_event(self, event):
+        """Mouse input: aim follows the cursor, left click fires on the next frame, the wheel zooms locally."""
+        if not self.connected:
+            return
+        pos = getattr(event, "pos", None)
+        if pos is not None:
+            _, view = self.arena._player_view_at(pos)
+            if view is not None:
+                self._aim = view.to_world(pos)
+        if event.type == pygame.MOUSEBUTTONDOWN and getattr(event, "button", None) == 1:
+            self._fire = True
+        self.cow.handle_event(event)
+
+    def step(self, key_list=(), fire: bool = False, aim=None):
+        """One client tick: receive, then send this tick's input frame (with the unacknowledged ones before it)."""
+        self.poll()
+        if not self.connected:
+            return None
+        cow = self.cow
+        for key in key_list:
+            if key == "zoom_in":
+                cow.adjust_zoom(+cow.zoom_step)
+            elif key == "zoom_out":
+                cow.adjust_zoom(-cow.zoom_step)
+        if aim is not None:
+            self._aim = aim
+        if self._aim is None:
+            self._aim = (cow.position.x + cow.aim_direction.x, cow.position.y + cow.aim_direction.y)
+        self.seq += 1
+        flags = INPUT_FIRE if fire or self._fire else 0
+        self._fire = False
+        frame = InputFrame(self.seq, keys_to_mask(k for k in key_list if k not in _LOCAL_ACTIONS), flags,
+                           self._aim[0], self._aim[1], cow.zoom)
+        self.unacked.append(frame)
+        if self.predictor is not None:
+            self.predictor.predict(frame.seq, [k for k in key_list if k not in _LOCAL_ACTIONS])
+        frames = list(self.unacked)[-self.redundancy:]
+        self.endpoint.send(protocol.encode_input(self.state_tick, frames), self.server_addr)
+        self.endpoint.flush()
+        return frame
+
+    def render(self, alpha: float = 1.0):
+        if self.connected:
+            self.arena.render(alpha)
+
+
+def _apply_cow(cow, record, bow, own: bool = False, position: bool = True):
+    x, y, ax, ay, health, max_health, ammo, w, h, flags, layer, zoom = record
+    if position:
+        cow.prev_position.update(cow.position)
+        cow.position.update(x, y)
+    cow.aim_direction.update(ax, ay)
+    cow.health = health
+    cow.max_health = max_health
+    cow.ammo = ammo
+    cow.layer = layer
+    cow._is_eating = bool(flags & COW_EATING)
+    if flags & COW_ARMED:
+        if not cow.has_weapon():
+            cow.equip_weapon(bow)
+    else:
+        cow.weapon = None
+    if cow.rect.size != (w, h):
+        cow.rect.size = (w, h)
+        cow._load_sprites()
+    if not own:
+        cow.zoom = zoom
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Arena network client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=47800)
+    parser.add_argument("--name", default="muuu")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated one-way latency (ms) on sends")
+    parser.add_argument("--jitter", type=float, default=0.0, help="simulated latency jitter (ms)")
+    parser.add_argument("--loss", type=float, default=0.0, help="simulated datagram loss (0-1)")
+    args = parser.parse_args(argv)
+
+    camera_size = (900, 600)
+    pygame.init()
+    screen = pygame.display.set_mode(camera_size)
+    pygame.display.set_caption(f"SYNTAX - {args.host}:{args.port}")
+    conditions = None
+    if args.latency or args.jitter or args.loss:
+        conditions = LinkConditions(args.latency, args.jitter, args.loss)
+    endpoint = UdpEndpoint(("0.0.0.0", 0), conditions=conditions)
+    client = ArenaClient((args.host, args.port), endpoint, camera_size, args.name, screen)
+
+    clock = pygame.time.Clock()
+    timestep = FixedTimestep()
+    last_time = time.perf_counter()
+    while True:
+        now = time.perf_counter()
+        frame_time = now - last_time
+        last_time = now
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            client.handle_event(event)
+        for _ in range(timestep.advance(frame_time)):
+            client.step(convert_key_to_string(pygame.key.get_pressed(), PLAYER_KEY_BINDINGS[0]))
+        if client.connected:
+            client.render(timestep.alpha)
+        else:
+            client.poll()
+            screen.fill((0, 0, 0))
+        pygame.display.flip()
+        clock.tick(120)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+from collections import deque
+
+# Actions that move the cow; everything else (eat rolls, poop, zoom) waits for the server
+_MOVES = ("up", "down", "left", "right")
+
+
+class MovementPredictor:
+    """
+    Client-side prediction for the local cow. predict() moves the cow at once with the same steps the
+    server runs for that input (eating intent, Cow.handle_key_event, then the arena's clamp / obstacle
+    push-out / clamp) and keeps the input in a history buffer. reconcile() takes an authoritative
+    position with the seq of the newest input the server had applied, drops acknowledged inputs and
+    replays the rest from that position, so the cow only jumps when the server disagreed.
+    """
+
+    def __init__(self, arena, cow, history: int = 256):
+        self.arena = arena
+        self.cow = cow
+        self.history = deque(maxlen=history)  # (seq, keys, predicted position after that input)
+        self.predictions = 0
+        self.reconciliations = 0
+        self.mispredictions = 0
+        self.max_error = 0.0
+        self.last_error = 0.0
+
+    def _move(self, keys):
+        arena = self.arena
+        cow = self.cow
+        cow.set_eating_intent("eat" in keys and arena.in_feeding_field(cow))
+        cow.handle_key_event([k for k in keys if k in _MOVES])
+        # Same order as the server's tick: clamp, push out of blocking obstacles, clamp again
+        arena._clamp_character_to_world(cow)
+        arena._resolve_character_obstacle_collisions(cow)
+        arena._clamp_character_to_world(cow)
+
+    def predict(self, seq: int, keys):
+        """Apply input seq locally, ahead of the server."""
+        cow = self.cow
+        cow.prev_position.update(cow.position)
+        self._move(keys)
+        self.history.append((seq, tuple(keys), (cow.position.x, cow.position.y)))
+        self.predictions += 1
+
+    def reconcile(self, position, last_input_seq: int):
+        """Rewind to the server's position after last_input_seq and replay every later input."""
+        history = self.history
+        predicted = None
+        while history and history[0][0] <= last_input_seq:
+            seq, _, after = history.popleft()
+            if seq == last_input_seq:
+                predicted = after
+        if predicted is not None:
+            self.reconciliations += 1
+            error = ((predicted[0] - position[0]) ** 2 + (predicted[1] - position[1]) ** 2) ** 0.5
+            self.last_error = error
+            if error > 0.0:
+                self.mispredictions += 1
+                self.max_error = max(self.max_error, error)
+        cow = self.cow
+        # prev_position is left alone, so a correction is blended in by the next frames' interpolation
+        cow.position.update(position)
+        replayed = []
+        for seq, keys, _ in history:
+            self._move(keys)
+            replayed.append((seq, keys, (cow.position.x, cow.position.y)))
+        history.clear()
+        history.extend(replayed)
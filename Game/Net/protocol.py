@@ -0,0 +1,177 @@
+"""Datagram formats shared by the arena server and client.
+
+Client -> server: HELLO (join), INPUT (recent input frames, redundantly, plus the
+newest server tick the client holds). Server -> client: WELCOME (match seed, world
+and slot), STATE (entity records inside the client's area of interest, as a delta
+against a state the client has acknowledged).
+
+A state is a map of (kind, id) -> fixed-size record. A delta carries the records
+that differ from its baseline and the keys that left it; NO_TICK as the baseline
+means "from empty".
+"""
+
+import struct
+
+from Game.Objects import Poop, WeaponPickup
+
+PROTOCOL_VERSION = 2
+NO_TICK = 0xFFFFFFFF
+
+MSG_HELLO = 1
+MSG_WELCOME = 2
+MSG_INPUT = 3
+MSG_STATE = 4
+
+_HELLO = struct.Struct("<BHHH")             # type, version, camera w, h (+ name)
+_WELCOME = struct.Struct("<BHqHHHHH")       # type, version, seed, world w, h, tick rate, character index, send interval
+_INPUT_HEADER = struct.Struct("<BIB")       # type, newest server tick held, frame count
+INPUT_FRAME = struct.Struct("<IHBfff")      # seq, key mask, flags, aim target x, y, zoom
+_STATE_HEADER = struct.Struct("<BIIIHHH")   # type, tick, baseline tick, last input seq applied, character index, records, removals
+RECORD_KEY = struct.Struct("<BI")           # kind, id
+
+INPUT_FIRE = 1
+
+# Record kinds and their payloads
+KIND_COW = 1         # id: character index
+KIND_OBJECT = 2      # id: world entity id
+KIND_PROJECTILE = 3  # id: projectile id (ProjectilePool.ident)
+KIND_OBSTACLE = 4    # id: obstacle index; only damaged obstacles are sent
+KIND_SELF = 5        # id: character index; movement tuning of the receiving client's own cow, for prediction
+COW_RECORD = struct.Struct("<ddffHHHHHBBf")  # x, y, aim x, y, health, max health, ammo, rect w, h, flags, layer, zoom
+OBJECT_RECORD = struct.Struct("<BiiHH")      # object kind, rect left, top, w, h
+PROJECTILE_RECORD = struct.Struct("<ffff")   # x, y, velocity x, y
+OBSTACLE_RECORD = struct.Struct("<i")        # health
+SELF_RECORD = struct.Struct("<ddd")          # size scale, base move speed, eating slowdown
+RECORDS = {KIND_COW: COW_RECORD, KIND_OBJECT: OBJECT_RECORD, KIND_PROJECTILE: PROJECTILE_RECORD,
+           KIND_OBSTACLE: OBSTACLE_RECORD, KIND_SELF: SELF_RECORD}
+
+COW_ARMED = 1
+COW_EATING = 2
+
+OBJECT_POOP = 1
+OBJECT_PICKUP = 2
+
+STATE_HEADER_SIZE = _STATE_HEADER.size
+
+
+def message_type(data) -> int:
+    return data[0] if data else 0
+
+
+class InputFrame:
+    """One client tick of input: held actions (replay.ACTIONS bitmask), fire, aim target and camera zoom."""
+
+    __slots__ = ("seq", "keys", "flags", "aim_x", "aim_y", "zoom")
+
+    def __init__(self, seq: int, keys: int = 0, flags: int = 0, aim_x: float = 0.0, aim_y: float = 0.0, zoom: float = 1.0):
+        self.seq = seq
+        self.keys = keys
+        self.flags = flags
+        self.aim_x = aim_x
+        self.aim_y = aim_y
+        self.zoom = zoom
+
+    @property
+    def fire(self) -> bool:
+        return bool(self.flags & INPUT_FIRE)
+
+
+def encode_hello(camera_size, name: str) -> bytes:
+    raw = name.encode("utf-8")[:64]
+    return _HELLO.pack(MSG_HELLO, PROTOCOL_VERSION, *camera_size) + raw
+
+
+def decode_hello(data):
+    _, version, camera_w, camera_h = _HELLO.unpack_from(data)
+    if version != PROTOCOL_VERSION:
+        raise ValueError(f"client speaks protocol {version}, server {PROTOCOL_VERSION}")
+    return (camera_w, camera_h), data[_HELLO.size:].decode("utf-8", "replace")
+
+
+def encode_welcome(seed, world_size, tick_rate, index, send_interval) -> bytes:
+    return _WELCOME.pack(MSG_WELCOME, PROTOCOL_VERSION, seed, *world_size, tick_rate, index, send_interval)
+
+
+def decode_welcome(data):
+    _, version, seed, world_w, world_h, tick_rate, index, send_interval = _WELCOME.unpack_from(data)
+    if version != PROTOCOL_VERSION:
+        raise ValueError(f"server speaks protocol {version}, client {PROTOCOL_VERSION}")
+    return seed, (world_w, world_h), tick_rate, index, send_interval
+
+
+def encode_input(acked_tick: int, frames) -> bytes:
+    parts = [_INPUT_HEADER.pack(MSG_INPUT, acked_tick, len(frames))]
+    for f in frames:
+        parts.append(INPUT_FRAME.pack(f.seq, f.keys, f.flags, f.aim_x, f.aim_y, f.zoom))
+    return b"".join(parts)
+
+
+def decode_input(data):
+    _, acked_tick, count = _INPUT_HEADER.unpack_from(data)
+    frames = []
+    offset = _INPUT_HEADER.size
+    for _ in range(count):
+        frames.append(InputFrame(*INPUT_FRAME.unpack_from(data, offset)))
+        offset += INPUT_FRAME.size
+    return acked_tick, frames
+
+
+def encode_state(tick, baseline_tick, last_input_seq, index, records, removals) -> bytes:
+    """records: ((kind, id), payload) pairs; removals: (kind, id) keys."""
+    parts = [_STATE_HEADER.pack(MSG_STATE, tick, baseline_tick, last_input_seq, index, len(records), len(removals))]
+    for key, payload in records:
+        parts.append(RECORD_KEY.pack(*key))
+        parts.append(payload)
+    for key in removals:
+        parts.append(RECORD_KEY.pack(*key))
+    return b"".join(parts)
+
+
+def decode_state(data):
+    """Returns (tick, baseline tick, last input seq, character index, records, removals)."""
+    _, tick, baseline_tick, last_input_seq, index, record_count, removal_count = _STATE_HEADER.unpack_from(data)
+    offset = _STATE_HEADER.size
+    records = []
+    for _ in range(record_count):
+        key = RECORD_KEY.unpack_from(data, offset)
+        offset += RECORD_KEY.size
+        size = RECORDS[key[0]].size
+        records.append((key, bytes(data[offset:offset + size])))
+        offset += size
+    removals = []
+    for _ in range(removal_count):
+        removals.append(RECORD_KEY.unpack_from(data, offset))
+        offset += RECORD_KEY.size
+    return tick, baseline_tick, last_input_seq, index, records, removals
+
+
+def record_size(key) -> int:
+    return RECORD_KEY.size + RECORDS[key[0]].size
+
+
+# ------- Entity records -------
+def cow_record(cow) -> bytes:
+    flags = (COW_ARMED if cow.has_weapon() else 0) | (COW_EATING if cow._is_eating else 0)
+    return COW_RECORD.pack(cow.position.x, cow.position.y, cow.aim_direction.x, cow.aim_direction.y,
+                           max(0, cow.health), cow.max_health, min(cow.ammo, 0xFFFF),
+                           cow.rect.width, cow.rect.height, flags, cow.layer, cow.zoom)
+
+
+def self_record(cow) -> bytes:
+    return SELF_RECORD.pack(cow.size_scale, cow.base_move_speed, cow.eating_slowdown_pct)
+
+
+def object_record(obj) -> bytes:
+    kind = OBJECT_POOP if isinstance(obj, Poop) else OBJECT_PICKUP if isinstance(obj, WeaponPickup) else 0
+    rect = obj.rect
+    return OBJECT_RECORD.pack(kind, rect.left, rect.top, rect.width, rect.height)
+
+
+def projectile_record(pool, slot) -> bytes:
+    x, y = pool.position[slot]
+    vx, vy = pool.velocity[slot]
+    return PROJECTILE_RECORD.pack(x, y, vx, vy)
+
+
+def obstacle_record(obstacle) -> bytes:
+    return OBSTACLE_RECORD.pack(obstacle.health)
@@ -0,0 +1,300 @@
+"""Headless authoritative arena server.
+
+Run: python -m Game.Net.server [--port 47800] [--bots 50] [--latency MS] [--loss P]
+"""
+
+import argparse
+import time
+from collections import deque
+
+import numpy as np
+
+from Game.constants import MATCH_SEED, WORLD_W, WORLD_H
+from Game.game_loop import FixedTimestep
+from Game.headless import create_headless_arena
+from Game.Arena.interest import InterestManager
+from Game.replay import mask_to_keys
+from Game.Character.cow import Cow
+from Game.Character.ai_cow import AICow
+from Game.Net import protocol
+from Game.Net.protocol import (NO_TICK, KIND_COW, KIND_OBJECT, KIND_PROJECTILE, KIND_OBSTACLE, KIND_SELF, cow_record,
+                               self_record, object_record, projectile_record, obstacle_record, record_size)
+from Game.Net.transport import UdpEndpoint, LinkConditions
+
+
+class RemoteClient:
+    __slots__ = ("addr", "name", "cow", "index", "inputs", "last_seq", "keys", "acked_tick", "history",
+                 "last_heard", "states_sent", "state_bytes", "max_state_bytes")
+
+    def __init__(self, addr, name, cow, index, now):
+        self.addr = addr
+        self.name = name
+        self.cow = cow
+        self.index = index
+        self.inputs = deque()   # frames received but not yet applied, by seq
+        self.last_seq = 0       # seq of the newest frame applied (0: none yet)
+        self.keys = ()          # held keys, repeated while no new frame has arrived
+        self.acked_tick = NO_TICK
+        self.history = {}       # tick -> {(kind, id): record} the client holds once it receives that tick
+        self.last_heard = now
+        self.states_sent = 0
+        self.state_bytes = 0
+        self.max_state_bytes = 0
+
+
+class ArenaServer:
+    """
+    Runs the match: every tick it applies one input frame per client, ticks the arena and sends
+    each client the records inside its area of interest (its cow's camera rect plus interest_margin)
+    as a delta against the newest state that client acknowledged. A state never exceeds
+    max_state_bytes: removals go first, then changed records nearest the client's cow; whatever
+    does not fit is sent on a later tick.
+    """
+
+    def __init__(self, arena, endpoint: UdpEndpoint, send_interval: int = 1, max_state_bytes: int = 1200,
+                 interest_margin: int = 96, history_ticks: int = 64, max_input_backlog: int = 6,
+                 timeout_s: float = 10.0):
+        self.arena = arena
+        self.endpoint = endpoint
+        self.send_interval = max(1, int(send_interval))
+        self.max_state_bytes = int(max_state_bytes)
+        self.interest_margin = int(interest_margin)
+        self.history_ticks = int(history_ticks)
+        self.max_input_backlog = int(max_input_backlog)
+        self.timeout_s = float(timeout_s)
+        self.clients = {}     # addr -> RemoteClient
+        self._character_index = {}
+        self._obstacle_index = {id(o): i for i, o in enumerate(arena.obstacles)}
+        self.tick_ms = 0.0
+
+    # ------- Connections -------
+    def _index_of(self, character) -> int:
+        index = self._character_index.get(id(character))
+        if index is None:
+            self._character_index = {id(c): i for i, c in enumerate(self.arena.characters)}
+            index = self._character_index[id(character)]
+        return index
+
+    def _spawn_point(self, n: int):
+        # Joining players ring the world centre
+        w, h = self.arena.world_dimensions
+        angle = n * 2.399963  # golden angle spreads any number of joins evenly
+        radius = 80 + 40 * (n % 5)
+        return (w * 0.5 + radius * np.cos(angle), h * 0.5 + radius * np.sin(angle))
+
+    def _on_hello(self, data, addr, now):
+        client = self.clients.get(addr)
+        if client is None:
+            camera_size, name = protocol.decode_hello(data)
+            camera_size = (max(160, min(3840, camera_size[0])), max(120, min(2160, camera_size[1])))
+            cow = Cow((0, 0, 50, 50), name or f"player{len(self.clients) + 1}", self._spawn_point(len(self.clients)),
+                      camera_display_size=camera_size, world_display_size=self.arena.world_dimensions,
+                      ammo_find_probability=0.2, move_speed=240)
+            self.arena.add_new_character(cow)
+            if self.arena.interest is not None:
+                self.arena.interest.add_observer(cow)
+            client = RemoteClient(addr, name, cow, self._index_of(cow), now)
+            self.clients[addr] = client
+        # Also answers repeated HELLOs whose WELCOME was lost
+        self.endpoint.send(protocol.encode_welcome(self.arena.rng.seed, self.arena.world_dimensions,
+                                                   self.arena.tick_rate, client.index, self.send_interval), addr)
+
+    def _on_input(self, data, addr, now):
+        client = self.clients.get(addr)
+        if client is None:
+            return
+        client.last_heard = now
+        acked_tick, frames = protocol.decode_input(data)
+        if acked_tick != NO_TICK and (client.acked_tick == NO_TICK or acked_tick > client.acked_tick):
+            client.acked_tick = acked_tick
+        newest = client.inputs[-1].seq if client.inputs else client.last_seq
+        for frame in frames:
+            # Frames are resent until acknowledged; keep only ones not seen yet, in order
+            if frame.seq > newest:
+                client.inputs.append(frame)
+                newest = frame.seq
+
+    def receive(self):
+        now = self.endpoint.clock()
+        for data, addr in self.endpoint.receive():
+            try:
+                kind = protocol.message_type(data)
+                if kind == protocol.MSG_HELLO:
+                    self._on_hello(data, addr, now)
+                elif kind == protocol.MSG_INPUT:
+                    self._on_input(data, addr, now)
+            except (ValueError, IndexError, KeyError):
+                # Malformed or foreign datagram
+                continue
+        for addr in [a for a, c in self.clients.items() if now - c.last_heard > self.timeout_s]:
+            # The cow stays in the match, idle; a reconnect joins as a new player
+            if self.arena.interest is not None:
+                self.arena.interest.remove_observer(self.clients[addr].cow)
+            del self.clients[addr]
+
+    # ------- Simulation -------
+    def step(self):
+        """Receive, apply one input frame per client, tick, and send states when due."""
+        start = time.perf_counter()
+        self.receive()
+        arena = self.arena
+        character_keys = []
+        for client in self.clients.values():
+            inputs = client.inputs
+            # A client far ahead of the server (after a stall) is caught up instead of lagging forever
+            while len(inputs) > self.max_input_backlog:
+                inputs.popleft()
+            frame = inputs.popleft() if inputs else None
+            cow = client.cow
+            if frame is not None:
+                client.last_seq = frame.seq
+                client.keys = mask_to_keys(frame.keys)
+                cow.zoom = max(cow.min_zoom, min(cow.max_zoom, frame.zoom))
+                cow.set_aim_direction((frame.aim_x - cow.position.x, frame.aim_y - cow.position.y))
+                if frame.fire:
+                    arena.fire_weapon(cow, (frame.aim_x, frame.aim_y))
+            character_keys.append((cow, client.keys))
+        arena.tick(character_keys=character_keys)
+        if arena.tick_count % self.send_interval == 0:
+            for client in self.clients.values():
+                self._send_state(client)
+        self.endpoint.flush()
+        self.tick_ms = (time.perf_counter() - start) * 1000.0
+
+    # ------- State sync -------
+    def interest_rect(self, cow):
+        m = self.interest_margin
+        return cow.create_camera_surface().inflate(m * 2, m * 2)
+
+    def records_for(self, client) -> list:
+        """(priority, key, record) for everything the client's cow can see; lower priority is sent first."""
+        arena = self.arena
+        cow = client.cow
+        rect = self.interest_rect(cow)
+        cx, cy = cow.position.x, cow.position.y
+        # The client's own movement tuning lets it predict its cow exactly
+        items = [(-2.0, (KIND_SELF, client.index), self_record(cow))]
+        for character in arena.character_grid.query(rect):
+            if rect.colliderect(character.get_world_rect()):
+                index = self._index_of(character)
+                priority = -1.0 if character is cow else (character.position.x - cx) ** 2 + (character.position.y - cy) ** 2
+                items.append((priority, (KIND_COW, index), cow_record(character)))
+        for obj in arena.object_grid.query(rect):
+            if getattr(obj, "alive", True) and rect.colliderect(obj.rect):
+                entity = arena.world.entity_of(obj)
+                if entity is not None:
+                    ox, oy = obj.rect.center
+                    items.append(((ox - cx) ** 2 + (oy - cy) ** 2, (KIND_OBJECT, entity), object_record(obj)))
+        pool = arena.projectiles
+        n = pool.count
+        if n:
+            pos = pool.position[:n]
+            inside = pool.alive[:n] & (pos[:, 0] >= rect.left) & (pos[:, 0] < rect.right) & (pos[:, 1] >= rect.top) & (pos[:, 1] < rect.bottom)
+            for slot in np.flatnonzero(inside).tolist():
+                px, py = pos[slot]
+                items.append(((px - cx) ** 2 + (py - cy) ** 2, (KIND_PROJECTILE, int(pool.ident[slot])), projectile_record(pool, slot)))
+        for obstacle in arena.obstacle_grid.query(rect):
+            if obstacle.health != obstacle.max_health and rect.colliderect(obstacle.rect):
+                ox, oy = obstacle.rect.center
+                items.append(((ox - cx) ** 2 + (oy - cy) ** 2, (KIND_OBSTACLE, self._obstacle_index[id(obstacle)]), obstacle_record(obstacle)))
+        items.sort(key=lambda item: item[0])
+        return items
+
+    def _send_state(self, client):
+        tick = self.arena.tick_count
+        baseline = client.history.get(client.acked_tick) if client.acked_tick != NO_TICK else None
+        baseline_tick = client.acked_tick if baseline is not None else NO_TICK
+        known = dict(baseline) if baseline is not None else {}
+        items = self.records_for(client)
+        visible = {key for _, key, _ in items}
+        budget = self.max_state_bytes - protocol.STATE_HEADER_SIZE
+        removals = []
+        for key in known:
+            if key not in visible:
+                if budget < protocol.RECORD_KEY.size:
+                    break
+                removals.append(key)
+                budget -= protocol.RECORD_KEY.size
+        records = []
+        for _, key, record in items:
+            if known.get(key) == record:
+                continue
+            size = record_size(key)
+            if size > budget:
+                continue
+            records.append((key, record))
+            budget -= size
+        for key in removals:
+            del known[key]
+        for key, record in records:
+            known[key] = record
+        client.history[tick] = known
+        for old in [t for t in client.history if t <= tick - self.history_ticks]:
+            del client.history[old]
+        data = protocol.encode_state(tick, baseline_tick, client.last_seq, client.index, records, removals)
+        self.endpoint.send(data, client.addr)
+        client.states_sent += 1
+        client.state_bytes += len(data)
+        client.max_state_bytes = max(client.max_state_bytes, len(data))
+
+    def run(self, seconds: float = None):
+        """Tick in real time until seconds have passed (forever by default)."""
+        timestep = FixedTimestep(self.arena.tick_rate)
+        start = last = time.perf_counter()
+        while seconds is None or last - start < seconds:
+            now = time.perf_counter()
+            for _ in range(timestep.advance(now - last)):
+                self.step()
+            last = now
+            self.endpoint.flush()
+            time.sleep(max(0.0, min(0.002, timestep.dt - timestep.accumulator)))
+
+
+def create_server(port: int = 47800, host: str = "127.0.0.1", bots: int = 50, seed: int = MATCH_SEED,
+                  world_size=(WORLD_W, WORLD_H), conditions: LinkConditions = None, clock=time.monotonic,
+                  interest: bool = True, **options):
+    """
+    Headless arena with bots AI cows, served on (host, port). With interest, bots far from every
+    client's camera think at a reduced rate (Game/Arena/interest.py).
+    """
+    arena = create_headless_arena(world_size, seed=seed)
+    if interest:
+        arena.interest = InterestManager()
+    w, h = arena.world_dimensions
+    for i in range(bots):
+        # Deterministic spread over the world, whatever the bot count
+        x = (i * 7919 + 211) % (w - 100) + 50
+        y = (i * 6271 + 337) % (h - 100) + 50
+        arena.add_new_character(AICow((0, 0, 50, 50), f"bot{i + 1}", (x, y), camera_display_size=(900, 600),
+                                      world_display_size=(w, h), ammo_find_probability=0.1, move_speed=180))
+    endpoint = UdpEndpoint((host, port), conditions=conditions, clock=clock)
+    return ArenaServer(arena, endpoint, **options)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless authoritative arena server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=47800)
+    parser.add_argument("--bots", type=int, default=50, help="AI cows in the match")
+    parser.add_argument("--seed", type=int, default=MATCH_SEED)
+    parser.add_argument("--world", type=int, nargs=2, default=(WORLD_W, WORLD_H), metavar=("W", "H"))
+    parser.add_argument("--no-interest", action="store_true", help="update every bot every tick")
+    parser.add_argument("--send-interval", type=int, default=1, help="ticks between state updates")
+    parser.add_argument("--budget", type=int, default=1200, help="max bytes per state datagram")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated one-way latency (ms) on sends")
+    parser.add_argument("--jitter", type=float, default=0.0, help="simulated latency jitter (ms)")
+    parser.add_argument("--loss", type=float, default=0.0, help="simulated datagram loss (0-1)")
+    args = parser.parse_args(argv)
+
+    conditions = None
+    if args.latency or args.jitter or args.loss:
+        conditions = LinkConditions(args.latency, args.jitter, args.loss)
+    server = create_server(args.port, args.host, bots=args.bots, seed=args.seed, world_size=tuple(args.world),
+                           conditions=conditions, interest=not args.no_interest,
+                           send_interval=args.send_interval, max_state_bytes=args.budget)
+    print(f"serving {len(server.arena.characters)} cows on {server.endpoint.address[0]}:{server.endpoint.address[1]}")
+    server.run()
+
+
+if __name__ == "__main__":
+    main()
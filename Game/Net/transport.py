@@ -0,0 +1,91 @@
+import heapq
+import random
+import socket
+import time
+
+
+class LinkConditions:
+    """One-way latency, jitter and loss applied to every datagram an endpoint sends."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, loss: float = 0.0, seed: int = 0):
+        self.latency_ms = float(latency_ms)
+        self.jitter_ms = float(jitter_ms)
+        self.loss = float(loss)
+        self.rng = random.Random(seed)
+
+    def delay_s(self) -> float:
+        jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000.0
+
+    def dropped(self) -> bool:
+        return self.loss > 0.0 and self.rng.random() < self.loss
+
+
+class UdpEndpoint:
+    """
+    Non-blocking UDP socket. With conditions, outgoing datagrams wait in a queue until their
+    simulated delivery time (or are dropped), so localhost behaves like a lossy, laggy link.
+    clock() returns seconds; pass a fake clock to run a simulated link faster than real time.
+    """
+
+    MAX_DATAGRAM = 65507
+
+    def __init__(self, bind=("127.0.0.1", 0), conditions: LinkConditions = None, clock=time.monotonic):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.sock.bind(bind)
+        self.address = self.sock.getsockname()
+        self.conditions = conditions
+        self.clock = clock
+        self._queue = []  # (deliver_at, seq, data, addr)
+        self._seq = 0
+        self.packets_sent = 0
+        self.bytes_sent = 0
+        self.packets_dropped = 0
+        self.bytes_received = 0
+
+    def send(self, data: bytes, addr):
+        self.packets_sent += 1
+        self.bytes_sent += len(data)
+        if self.conditions is None:
+            self._send_now(data, addr)
+            return
+        if self.conditions.dropped():
+            self.packets_dropped += 1
+            return
+        heapq.heappush(self._queue, (self.clock() + self.conditions.delay_s(), self._seq, data, addr))
+        self._seq += 1
+
+    def flush(self):
+        """Put every queued datagram whose delivery time has come on the wire."""
+        now = self.clock()
+        queue = self._queue
+        while queue and queue[0][0] <= now:
+            _, _, data, addr = heapq.heappop(queue)
+            self._send_now(data, addr)
+
+    def _send_now(self, data, addr):
+        try:
+            self.sock.sendto(data, addr)
+        except (BlockingIOError, ConnectionError):
+            # Full buffer or an unreachable peer reads the same to the game as a lost datagram
+            self.packets_dropped += 1
+
+    def receive(self) -> list:
+        """Every datagram waiting on the socket, as (data, addr)."""
+        self.flush()
+        packets = []
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(self.MAX_DATAGRAM)
+            except (BlockingIOError, ConnectionError):
+                break
+            self.bytes_received += len(data)
+            packets.append((data, addr))
+        return packets
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def close(self):
+        self.sock.close()
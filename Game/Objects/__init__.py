@@ -1,7 +1,7 @@
 from .grass import GrassField
 from .obstacle import Obstacle
 from .golden_field import GoldenField
-from .projectile import Projectile
+from .projectile_pool import ProjectilePool
 from .weapon_pickup import WeaponPickup
 from .poop import Poop
 
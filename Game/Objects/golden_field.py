@@ -1,22 +1,36 @@
 import pygame
+from Game.capabilities import CAP_DRAW, CAP_EVENTS
 
 
 class GoldenField:
+    __slots__ = ("rect", "drop_probability", "color", "alpha", "_surface", "_surface_key")
+    CAPABILITIES = CAP_DRAW | CAP_EVENTS
+
     def __init__(self, rect, drop_probability: float = 0.05, color=(220, 180, 40), alpha=110):
         self.rect = pygame.Rect(rect)
         self.drop_probability = float(drop_probability)
         self.color = color
         self.alpha = alpha
+        self._surface = None
+        self._surface_key = None
 
     def update(self):
         pass
 
     def draw(self, surface):
         # Semi-transparent golden patch
-        surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
-        r, g, b = self.color
-        surf.fill((r, g, b, self.alpha))
-        surface.blit(surf, self.rect.topleft)
+        surface.blit(self._get_surface(), self.rect.topleft)
+
+    def _get_surface(self):
+        # Reuse the patch surface until size or colour changes
+        key = (self.rect.size, tuple(self.color), self.alpha)
+        if self._surface is None or self._surface_key != key:
+            surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            r, g, b = self.color
+            surf.fill((r, g, b, self.alpha))
+            self._surface = surf
+            self._surface_key = key
+        return self._surface
 
     def handle_event(self, event):
         pass
@@ -1,21 +1,35 @@
 import pygame
+from Game.capabilities import CAP_DRAW, CAP_EVENTS
 
 
 class GrassField:
+    __slots__ = ("rect", "color", "alpha", "_surface", "_surface_key")
+    CAPABILITIES = CAP_DRAW | CAP_EVENTS
+
     def __init__(self, rect, color=(60, 150, 90), alpha=90):
         self.rect = pygame.Rect(rect)
         self.color = color
         self.alpha = alpha
+        self._surface = None
+        self._surface_key = None
 
     def update(self):
         pass
 
     def draw(self, surface):
         # Draw a semi-transparent patch to indicate grass
-        grass_surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
-        r, g, b = self.color
-        grass_surface.fill((r, g, b, self.alpha))
-        surface.blit(grass_surface, self.rect.topleft)
+        surface.blit(self._get_surface(), self.rect.topleft)
+
+    def _get_surface(self):
+        # Reuse the patch surface until size or colour changes
+        key = (self.rect.size, tuple(self.color), self.alpha)
+        if self._surface is None or self._surface_key != key:
+            grass_surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            r, g, b = self.color
+            grass_surface.fill((r, g, b, self.alpha))
+            self._surface = grass_surface
+            self._surface_key = key
+        return self._surface
 
     def handle_event(self, event):
         pass
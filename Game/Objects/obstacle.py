@@ -1,30 +1,103 @@
 import pygame
 from Game.constants import UI_DARK_2, UI_STROKE
 from Game.layers import ALL_LAYERS
+from Game.capabilities import CAP_DRAW, CAP_EVENTS
 
 
 class Obstacle:
+    """
+    A static block. rect, max_health, health, color and blocking_mask are properties: assigning
+    any of them (damage, snapshot restore, scripted edits) calls on_change(obstacle) when the value
+    changes. Assign a new rect rather than moving obstacle.rect in place, which goes unnoticed.
+    """
+    __slots__ = ("_rect", "_max_health", "_health", "_color", "_blocking_mask", "on_change")
+    CAPABILITIES = CAP_DRAW | CAP_EVENTS
+
     def __init__(self, rect, base_health=100000, color=UI_DARK_2, blocking_mask: int = ALL_LAYERS):
-        self.rect = pygame.Rect(rect)
-        self.max_health = int(base_health)
-        self.health = int(base_health)
-        self.color = color
-        self.blocking_mask = int(blocking_mask)
+        # Called with the obstacle whenever one of its fields changes (the arena uses it to refresh
+        # its grid, navigation, collision arrays and cached static layer)
+        self.on_change = None
+        self._rect = pygame.Rect(rect)
+        self._max_health = int(base_health)
+        self._health = int(base_health)
+        self._color = color
+        self._blocking_mask = int(blocking_mask)
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(self)
+
+    @property
+    def rect(self):
+        return self._rect
+
+    @rect.setter
+    def rect(self, value):
+        value = pygame.Rect(value)
+        if value != self._rect:
+            self._rect = value
+            self._changed()
+
+    @property
+    def max_health(self) -> int:
+        return self._max_health
+
+    @max_health.setter
+    def max_health(self, value):
+        value = int(value)
+        if value != self._max_health:
+            self._max_health = value
+            self._changed()
+
+    @property
+    def health(self) -> int:
+        return self._health
+
+    @health.setter
+    def health(self, value):
+        value = int(value)
+        if value != self._health:
+            self._health = value
+            self._changed()
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        if value != self._color:
+            self._color = value
+            self._changed()
+
+    @property
+    def blocking_mask(self) -> int:
+        return self._blocking_mask
+
+    @blocking_mask.setter
+    def blocking_mask(self, value):
+        value = int(value)
+        if value != self._blocking_mask:
+            self._blocking_mask = value
+            self._changed()
 
     def update(self):
         pass
 
-    def draw(self, surface):
-        pygame.draw.rect(surface, self.color, self.rect, border_radius=6)
-        pygame.draw.rect(surface, UI_STROKE, self.rect, width=1, border_radius=6)
+    def draw(self, surface, view=None):
+        if view is None:
+            rect, radius, width = self.rect, 6, 1
+        else:
+            rect, radius, width = view.rect_to_screen(self.rect), view.scaled_length(6), view.scaled_length(1)
+        pygame.draw.rect(surface, self.color, rect, border_radius=radius)
+        pygame.draw.rect(surface, UI_STROKE, rect, width=width, border_radius=radius)
 
     def handle_event(self, event):
         pass
 
     def apply_damage(self, amount: float):
-        # Damage API present but not used yet
-        new_health = self.health - float(amount)
-        self.health = max(0, int(new_health))
+        # The health setter reports the change
+        self.health = max(0, int(self.health - float(amount)))
 
     def is_destroyed(self) -> bool:
         return self.health <= 0
@@ -1,12 +1,19 @@
 import pygame
+from Game.capabilities import CAP_DRAW, CAP_EVENTS, CAP_CLOCK, CAP_EXPIRES, CAP_COLLIDE, CAP_LIFETIME
 
 
 class Poop:
-    def __init__(self, center_pos, size=(18, 12), ttl_ms: int = 8000, color=(130, 90, 40), amount_percent: float = 0.15):
+    __slots__ = ("rect", "color", "clock", "spawn_time", "ttl_ms", "alive", "amount_percent")
+    # The arena expires poops on a scheduler timer set when they are added (CAP_LIFETIME); update() is only for standalone use
+    CAPABILITIES = CAP_DRAW | CAP_EVENTS | CAP_CLOCK | CAP_EXPIRES | CAP_COLLIDE | CAP_LIFETIME
+
+    def __init__(self, center_pos, size=(18, 12), ttl_ms: int = 8000, color=(130, 90, 40), amount_percent: float = 0.15, clock=None):
         self.rect = pygame.Rect(0, 0, int(size[0]), int(size[1]))
         self.rect.center = (int(center_pos[0]), int(center_pos[1]))
         self.color = color
-        self.spawn_time = pygame.time.get_ticks()
+        # Millisecond clock used for the TTL (defaults to wall-clock ticks)
+        self.clock = clock if clock is not None else pygame.time.get_ticks
+        self.spawn_time = self.clock()
         self.ttl_ms = int(ttl_ms)
         self.alive = True
         self.amount_percent = float(amount_percent)
@@ -14,15 +21,19 @@ class Poop:
     def update(self):
         if not self.alive:
             return
-        now = pygame.time.get_ticks()
+        now = self.clock()
         if now - self.spawn_time >= self.ttl_ms:
             self.alive = False
 
-    def draw(self, surface):
+    def draw(self, surface, view=None):
         if not self.alive:
             return
-        pygame.draw.rect(surface, self.color, self.rect, border_radius=3)
-        pygame.draw.rect(surface, (30, 24, 18), self.rect, width=1, border_radius=3)
+        if view is None:
+            rect, radius, width = self.rect, 3, 1
+        else:
+            rect, radius, width = view.rect_to_screen(self.rect), view.scaled_length(3), view.scaled_length(1)
+        pygame.draw.rect(surface, self.color, rect, border_radius=radius)
+        pygame.draw.rect(surface, (30, 24, 18), rect, width=width, border_radius=radius)
 
     def handle_event(self, event):
         pass
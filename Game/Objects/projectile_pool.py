@@ -0,0 +1,266 @@
+import copy
+import math
+import struct
+import numpy as np
+import pygame
+from Game.layers import LAYER_MIDAIR
+from Game.assets import get_scaled, get_rotated, load_image
+
+
+class ProjectilePool:
+    """
+    Structure-of-arrays storage for every live projectile.
+    Slots [0, count) are in use, in spawn order; step() advances all of them in one vectorized
+    update and compact() drops dead slots without rebuilding Python objects.
+    Owners and sprites are stored as small integer ids into the owners / sprites registries.
+    Sprites spawned with a sprite_ref (image name, scale) keep it in sprite_refs, which is what
+    pack() writes, so packed pools name their sprites the same way in every process.
+    Velocities and speeds are in world px / second; step(dt) moves by velocity * dt.
+    Slots are renumbered by compact(); ident holds each projectile's stable id, from next_id.
+    """
+
+    def __init__(self, capacity: int = 64, color=(255, 250, 220), radius: int = 4):
+        self.count = 0
+        self.next_id = 0
+        self.color = color
+        self.radius = int(radius)
+        self.owners = []      # owner id -> object
+        self._owner_ids = {}  # id(object) -> owner id
+        self.sprites = []     # sprite id -> Surface (None: not loaded, e.g. headless)
+        self.sprite_refs = [] # sprite id -> (image name, scale) or None
+        self._sprite_ids = {}  # sprite_ref, or id(Surface) without one -> sprite id
+        self._allocate(max(1, int(capacity)))
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.position = np.zeros((capacity, 2))
+        # Position at the start of the tick; the swept collision segment runs from here to position
+        self.prev_position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.speed = np.zeros(capacity)
+        self.distance_traveled = np.zeros(capacity)
+        self.max_distance = np.zeros(capacity)
+        self.damage = np.zeros(capacity)
+        # Sprite rotation in degrees (counter-clockwise), fixed at spawn
+        self.angle = np.zeros(capacity)
+        self.layer = np.zeros(capacity, dtype=np.int32)
+        self.owner = np.full(capacity, -1, dtype=np.int32)
+        self.sprite = np.full(capacity, -1, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.ident = np.zeros(capacity, dtype=np.uint32)
+
+    _ARRAYS = ("position", "prev_position", "velocity", "speed", "distance_traveled", "max_distance",
+               "damage", "angle", "layer", "owner", "sprite", "alive", "ident")
+
+    def _grow(self):
+        old = {name: getattr(self, name) for name in self._ARRAYS}
+        self._allocate(self.capacity * 2)
+        for name, array in old.items():
+            getattr(self, name)[:self.count] = array[:self.count]
+
+    def __len__(self):
+        return self.count
+
+    def __deepcopy__(self, memo):
+        # Registries are keyed by id(): owners are copied and re-keyed, sprites are shared assets
+        clone = ProjectilePool.__new__(ProjectilePool)
+        memo[id(self)] = clone
+        for name, value in self.__dict__.items():
+            if name not in ("sprites", "sprite_refs", "_sprite_ids", "_owner_ids"):
+                setattr(clone, name, copy.deepcopy(value, memo))
+        clone.sprites = list(self.sprites)
+        clone.sprite_refs = list(self.sprite_refs)
+        clone._sprite_ids = dict(self._sprite_ids)
+        clone._owner_ids = {id(owner): oid for oid, owner in enumerate(clone.owners)}
+        return clone
+
+    def owner_id(self, owner) -> int:
+        # The registry keeps a reference to every owner, so an id() is never reused while mapped
+        if owner is None:
+            return -1
+        key = id(owner)
+        oid = self._owner_ids.get(key)
+        if oid is None:
+            oid = len(self.owners)
+            self._owner_ids[key] = oid
+            self.owners.append(owner)
+        return oid
+
+    def _sprite_id(self, sprite, sprite_ref=None) -> int:
+        # A sprite_ref registers even when its image is not loaded, so headless pools pack it too
+        if sprite_ref is not None:
+            sprite_ref = (sprite_ref[0], None if sprite_ref[1] is None else tuple(sprite_ref[1]))
+            key = sprite_ref
+        elif sprite is not None:
+            key = id(sprite)
+        else:
+            return -1
+        sid = self._sprite_ids.get(key)
+        if sid is None:
+            if sprite is None:
+                sprite = load_image(*sprite_ref)
+            sid = len(self.sprites)
+            self._sprite_ids[key] = sid
+            self.sprites.append(sprite)
+            self.sprite_refs.append(sprite_ref)
+        return sid
+
+    def spawn(self, start_pos, direction, speed: float = 960.0, sprite=None, damage: float = 10.0, owner=None,
+              sprite_heading: float = 0.0, max_distance: float = 2400.0, layer: int = LAYER_MIDAIR,
+              sprite_ref=None) -> int:
+        """
+        Allocate a slot for a new projectile and return its index. sprite_ref (image name, scale)
+        names the sprite for pack(); sprite is loaded from it when not given.
+        """
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.count += 1
+        dx, dy = float(direction[0]), float(direction[1])
+        length = math.hypot(dx, dy)
+        if length == 0:
+            dx, dy, length = 1.0, 0.0, 1.0
+        speed = float(speed)
+        self.position[i] = start_pos
+        self.prev_position[i] = start_pos
+        self.velocity[i] = (dx / length * speed, dy / length * speed)
+        self.speed[i] = abs(speed)
+        self.distance_traveled[i] = 0.0
+        self.max_distance[i] = float(max_distance)
+        self.damage[i] = float(damage)
+        self.angle[i] = -math.degrees(math.atan2(dy, dx)) - float(sprite_heading)
+        self.layer[i] = int(layer)
+        self.owner[i] = self.owner_id(owner)
+        self.sprite[i] = self._sprite_id(sprite, sprite_ref)
+        self.alive[i] = True
+        self.ident[i] = self.next_id
+        self.next_id = (self.next_id + 1) & 0xFFFFFFFF
+        return i
+
+    def step(self, dt: float):
+        """
+        Advance every live projectile by one tick of dt seconds. A projectile reaching max_distance
+        stops exactly there and stays alive for this tick's collision pass over its last segment;
+        compact() drops it afterwards.
+        """
+        n = self.count
+        alive = self.alive[:n]
+        self.prev_position[:n] = self.position[:n]
+        full = self.speed[:n][alive] * dt
+        traveled = self.distance_traveled[:n][alive]
+        remaining = self.max_distance[:n][alive] - traveled
+        # Fraction of a full step left in range (1 for all but a projectile's last step)
+        scale = np.where(full > remaining, np.divide(remaining, full, out=np.zeros_like(full), where=full > 0), 1.0)
+        self.position[:n][alive] += self.velocity[:n][alive] * (dt * scale)[:, None]
+        self.distance_traveled[:n][alive] = np.minimum(traveled + full, self.max_distance[:n][alive])
+
+    def live_indices(self):
+        return np.flatnonzero(self.alive[:self.count])
+
+    def stop_at(self, indices, toi):
+        """Move projectiles back along this tick's path to fraction toi and kill them there."""
+        t = np.clip(np.asarray(toi, dtype=np.float64), 0.0, 1.0)[:, None]
+        prev = self.prev_position[indices]
+        self.position[indices] = prev + (self.position[indices] - prev) * t
+        self.alive[indices] = False
+
+    def compact(self):
+        """Drop dead slots and those at the end of their range, keeping the survivors in spawn order."""
+        n = self.count
+        alive = self.alive[:n]
+        alive &= self.distance_traveled[:n] < self.max_distance[:n]
+        keep = np.flatnonzero(alive)
+        if keep.size == n:
+            return
+        m = keep.size
+        for name in self._ARRAYS:
+            array = getattr(self, name)
+            array[:m] = array[keep]
+        self.alive[m:n] = False
+        self.count = m
+
+    def clear(self):
+        self.alive[:self.count] = False
+        self.count = 0
+
+    def pack(self, owner_key) -> bytes:
+        """
+        Live slots as little-endian columns (snapshots). owner_key(owner) maps an owner object to a
+        stable integer (-1 for none); sprite ids index the sprite_refs table written before the
+        columns (sprites spawned without a sprite_ref are written as unnamed and unpack as dots).
+        """
+        n = self.count
+        keys = np.array([owner_key(owner) for owner in self.owners] + [-1], dtype=np.int32)
+        parts = [struct.pack("<H", len(self.sprite_refs))]
+        for ref in self.sprite_refs:
+            name, scale = ref if ref is not None else ("", None)
+            raw = name.encode("utf-8")
+            parts.append(struct.pack("<H", len(raw)) + raw)
+            parts.append(struct.pack("<hh", *(scale if scale is not None else (-1, -1))))
+        parts.append(struct.pack("<II", n, self.next_id))
+        for name in self._ARRAYS:
+            column = getattr(self, name)[:n]
+            if name == "owner":
+                column = keys[column]
+            parts.append(np.ascontiguousarray(column, dtype=column.dtype.newbyteorder("<")).tobytes())
+        return b"".join(parts)
+
+    def unpack(self, data, offset: int, owner_at) -> int:
+        """Replace every slot with a packed pool; owner_at(key) returns the owner object. Returns the end offset."""
+        (refs,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        # Packed sprite id -> this pool's id for the same sprite_ref (-1 for unnamed sprites and none)
+        sprite_ids = []
+        for _ in range(refs):
+            (length,) = struct.unpack_from("<H", data, offset)
+            name = bytes(data[offset + 2:offset + 2 + length]).decode("utf-8")
+            offset += 2 + length
+            w, h = struct.unpack_from("<hh", data, offset)
+            offset += 4
+            sprite_ids.append(self._sprite_id(None, (name, None if w < 0 else (w, h))) if name else -1)
+        sprite_ids = np.array(sprite_ids + [-1], dtype=np.int32)
+        n, next_id = struct.unpack_from("<II", data, offset)
+        offset += 8
+        self.clear()
+        while self.capacity < n:
+            self._grow()
+        for name in self._ARRAYS:
+            array = getattr(self, name)
+            dtype = array.dtype.newbyteorder("<")
+            items = n * (array.shape[1] if array.ndim > 1 else 1)
+            column = np.frombuffer(data, dtype=dtype, count=items, offset=offset).reshape((n,) + array.shape[1:])
+            offset += column.nbytes
+            if name == "owner":
+                column = np.array([self.owner_id(owner_at(key)) for key in column.tolist()], dtype=np.int32)
+            elif name == "sprite":
+                column = sprite_ids[column]
+            array[:n] = column
+        self.count = n
+        self.next_id = next_id
+        return offset
+
+    def draw(self, surface, alpha: float = 1.0, view=None, cull_rect=None):
+        """Draw live projectiles (optionally only those inside cull_rect, in world space)."""
+        n = self.count
+        if n == 0:
+            return
+        alpha = max(0.0, min(1.0, float(alpha)))
+        pos = self.prev_position[:n] + (self.position[:n] - self.prev_position[:n]) * alpha
+        visible = self.alive[:n].copy()
+        if cull_rect is not None:
+            visible &= (pos[:, 0] >= cull_rect.left) & (pos[:, 0] < cull_rect.right)
+            visible &= (pos[:, 1] >= cull_rect.top) & (pos[:, 1] < cull_rect.bottom)
+        scaled = view is not None and not view.is_identity_scale
+        for i in np.flatnonzero(visible):
+            x, y = pos[i]
+            center = (int(x), int(y)) if view is None else view.to_screen((x, y))
+            sid = self.sprite[i]
+            sprite = self.sprites[sid] if sid >= 0 else None
+            if sprite is not None:
+                if scaled:
+                    sprite = get_scaled(sprite, view.scaled_size(sprite.get_size()), view.smooth)
+                sprite = get_rotated(sprite, self.angle[i])
+                surface.blit(sprite, sprite.get_rect(center=center))
+            else:
+                radius = max(1, int(round(self.radius * view.scale))) if scaled else self.radius
+                pygame.draw.circle(surface, self.color, center, radius)
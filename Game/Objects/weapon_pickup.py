@@ -1,7 +1,13 @@
 import pygame
+from Game.assets import get_scaled
+from Game.capabilities import CAP_DRAW, CAP_EVENTS, CAP_EXPIRES, CAP_PICKUP
 
 
 class WeaponPickup:
+    __slots__ = ("weapon", "rect", "alive")
+    # update() is a no-op, so pickups do not declare CAP_UPDATE and are skipped by the update loop
+    CAPABILITIES = CAP_DRAW | CAP_EVENTS | CAP_EXPIRES | CAP_PICKUP
+
     def __init__(self, weapon, center_pos):
         self.weapon = weapon
         w, h = getattr(weapon, 'floor_rect_size', (16, 8))
@@ -13,20 +19,24 @@ class WeaponPickup:
     def update(self):
         pass
 
-    def draw(self, surface):
+    def draw(self, surface, view=None):
         if not self.alive:
             return
+        rect = self.rect if view is None else view.rect_to_screen(self.rect)
         sprite = None
         if hasattr(self.weapon, 'get_floor_sprite'):
             sprite = self.weapon.get_floor_sprite()
         if sprite is not None:
+            if view is not None and not view.is_identity_scale:
+                sprite = get_scaled(sprite, view.scaled_size(sprite.get_size()), view.smooth)
             # center blit
-            rect = sprite.get_rect(center=self.rect.center)
-            surface.blit(sprite, rect)
+            surface.blit(sprite, sprite.get_rect(center=rect.center))
         else:
             color = getattr(self.weapon, 'floor_color', (210, 230, 255))
-            pygame.draw.rect(surface, color, self.rect, border_radius=4)
-            pygame.draw.rect(surface, (40, 46, 58), self.rect, width=1, border_radius=4)
+            radius = 4 if view is None else view.scaled_length(4)
+            width = 1 if view is None else view.scaled_length(1)
+            pygame.draw.rect(surface, color, rect, border_radius=radius)
+            pygame.draw.rect(surface, (40, 46, 58), rect, width=width, border_radius=radius)
 
     def handle_event(self, event):
         pass
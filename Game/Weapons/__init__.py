@@ -1,4 +1,4 @@
-from .weapon import Weapon
+from .weapon import Weapon, make_bow
 
 
 
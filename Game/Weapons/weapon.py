@@ -2,9 +2,10 @@ from Game.assets import load_image
 
 
 class Weapon:
-    def __init__(self, name: str, ammo_per_shot: int = 1, projectile_speed: float = 16.0, floor_rect_size=(18, 8), floor_color=(210, 230, 255), floor_image_name: str | None = None, floor_image_scale: tuple | None = None, projectile_image_name: str | None = None, projectile_image_scale: tuple | None = None, damage: float = 10.0):
+    def __init__(self, name: str, ammo_per_shot: int = 1, projectile_speed: float = 960.0, floor_rect_size=(18, 8), floor_color=(210, 230, 255), floor_image_name: str | None = None, floor_image_scale: tuple | None = None, projectile_image_name: str | None = None, projectile_image_scale: tuple | None = None, damage: float = 10.0, projectile_image_heading: float = 0.0):
         self.name = name
         self.ammo_per_shot = int(ammo_per_shot)
+        # World px / second; the arena moves projectiles by speed * dt each tick
         self.projectile_speed = float(projectile_speed)
         # Visuals when on the floor
         self.floor_rect_size = tuple(floor_rect_size)
@@ -13,6 +14,8 @@ class Weapon:
         self.floor_image_scale = floor_image_scale
         self.projectile_image_name = projectile_image_name
         self.projectile_image_scale = projectile_image_scale
+        # Direction (degrees, counter-clockwise from +x) the unrotated projectile image points in
+        self.projectile_image_heading = float(projectile_image_heading)
         self._floor_sprite = None
         self._projectile_sprite = None
         self.damage = float(damage)
@@ -41,4 +44,6 @@ class Weapon:
         return self._projectile_sprite
 
 
-
+def make_bow(ammo_per_shot: int = 1, projectile_speed: float = 1080.0, damage: float = 10.0) -> Weapon:
+    """The bow golden fields drop."""
+    return Weapon(name="Bow", ammo_per_shot=ammo_per_shot, projectile_speed=projectile_speed, damage=damage, floor_image_name="bow.png", floor_image_scale=(28, 28), projectile_image_name="arrow.png", projectile_image_scale=(18, 18), projectile_image_heading=45.0)
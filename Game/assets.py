@@ -1,23 +1,187 @@
+import json
 import os
+from collections import OrderedDict
 import pygame
 
 
-_CACHE = {}
+# Decoded originals, one per file name; never evicted (the sprite set is small)
+_ORIGINALS = {}
+# Every derived surface (scaled load_image variants, zoomed and rotated copies) shares one LRU:
+# key -> (source or None, surface, nbytes). Id-keyed entries keep their source so a recycled
+# id() can never return another sprite's copy.
+_VARIANTS = OrderedDict()
+# Memory budget for _VARIANTS in bytes; least recently used variants are evicted beyond it
+_BUDGET_BYTES = 48 * 1024 * 1024
+# load_image sizes are snapped to multiples of this many pixels so growth steps share variants
+SCALE_QUANTUM = 2
+# Rotations are snapped to multiples of this many degrees
+ROTATION_STEP_DEG = 5
+# When headless, sprites are never decoded and load_image returns None
+_HEADLESS = False
+
+_STATS = {"hits": 0, "misses": 0, "evictions": 0, "decodes": 0, "bytes": 0, "original_bytes": 0}
+
+
+def set_headless(enabled: bool = True):
+    global _HEADLESS
+    _HEADLESS = bool(enabled)
+
+
+def is_headless() -> bool:
+    return _HEADLESS
+
+
+def set_cache_budget(max_bytes: int):
+    """Change the variant memory budget, evicting immediately if it shrank."""
+    global _BUDGET_BYTES
+    _BUDGET_BYTES = max(0, int(max_bytes))
+    _evict()
+
+
+def cache_stats() -> dict:
+    """Counters: hits, misses, evictions, decodes, bytes (variants), original_bytes, entries."""
+    stats = dict(_STATS)
+    stats["entries"] = len(_VARIANTS)
+    stats["originals"] = len(_ORIGINALS)
+    stats["budget_bytes"] = _BUDGET_BYTES
+    return stats
+
+
+def reset_cache_stats():
+    for key in ("hits", "misses", "evictions", "decodes"):
+        _STATS[key] = 0
+
+
+def clear_cache():
+    _ORIGINALS.clear()
+    _VARIANTS.clear()
+    _STATS["bytes"] = 0
+    _STATS["original_bytes"] = 0
 
 
 def _assets_dir():
     return os.path.join(os.path.dirname(__file__), "Assets")
 
 
-def load_image(name: str, scale: tuple | None = None) -> pygame.Surface:
-    key = (name, scale)
-    if key in _CACHE:
-        return _CACHE[key]
+def _surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_pitch() * surface.get_height()
+
+
+def _variant_get(key, source=None):
+    entry = _VARIANTS.get(key)
+    if entry is not None and entry[0] is source:
+        _VARIANTS.move_to_end(key)
+        _STATS["hits"] += 1
+        return entry[1]
+    _STATS["misses"] += 1
+    return None
+
+
+def _variant_put(key, surface, source=None):
+    old = _VARIANTS.pop(key, None)
+    if old is not None:
+        _STATS["bytes"] -= old[2]
+    nbytes = _surface_bytes(surface)
+    _VARIANTS[key] = (source, surface, nbytes)
+    _STATS["bytes"] += nbytes
+    _evict()
+    return surface
+
+
+def _evict():
+    # Always keep the newest entry, even if it alone exceeds the budget
+    while _STATS["bytes"] > _BUDGET_BYTES and len(_VARIANTS) > 1:
+        _, (_, _, nbytes) = _VARIANTS.popitem(last=False)
+        _STATS["bytes"] -= nbytes
+        _STATS["evictions"] += 1
+
+
+def quantize_size(scale) -> tuple:
+    q = SCALE_QUANTUM
+    return (max(q, int(round(scale[0] / q)) * q), max(q, int(round(scale[1] / q)) * q))
+
+
+def _load_original(name: str) -> pygame.Surface:
+    surf = _ORIGINALS.get(name)
+    if surf is not None:
+        return surf
     path = os.path.join(_assets_dir(), name)
-    surf = pygame.image.load(path).convert_alpha()
-    if scale is not None:
-        surf = pygame.transform.smoothscale(surf, (int(scale[0]), int(scale[1])))
-    _CACHE[key] = surf
+    surf = pygame.image.load(path)
+    # convert_alpha needs a display mode; without one keep the decoded surface as is
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        surf = surf.convert_alpha()
+    _ORIGINALS[name] = surf
+    _STATS["decodes"] += 1
+    _STATS["original_bytes"] += _surface_bytes(surf)
     return surf
 
 
+def load_image(name: str, scale: tuple | None = None) -> pygame.Surface | None:
+    if _HEADLESS:
+        return None
+    original = _load_original(name)
+    if scale is None:
+        return original
+    size = quantize_size(scale)
+    key = ("image", name, size)
+    surf = _variant_get(key)
+    if surf is not None:
+        return surf
+    # Scale from the decoded original; the file is never read again
+    return _variant_put(key, pygame.transform.smoothscale(original, size))
+
+
+def preload(manifest_path: str | None = None) -> int:
+    """
+    Decode every sprite (and listed sizes) from the manifest in one batch, so gameplay never
+    hits the disk. Call after the display mode is set. Returns the number of surfaces loaded.
+    Manifest: {"images": [{"name": "cow.png", "sizes": [[50, 50]]}, ...]}
+    """
+    if _HEADLESS:
+        return 0
+    if manifest_path is None:
+        manifest_path = os.path.join(_assets_dir(), "manifest.json")
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    count = 0
+    for entry in manifest.get("images", []):
+        name = entry["name"]
+        load_image(name)
+        count += 1
+        for size in entry.get("sizes", []):
+            load_image(name, tuple(size))
+            count += 1
+    return count
+
+
+def get_scaled(surface: pygame.Surface, size, smooth: bool = True) -> pygame.Surface:
+    """Cached scaled copy of surface; smooth=False uses the faster nearest-neighbour scale."""
+    size = (int(size[0]), int(size[1]))
+    if surface.get_size() == size:
+        return surface
+    key = ("scaled", id(surface), size, bool(smooth))
+    scaled = _variant_get(key, surface)
+    if scaled is not None:
+        return scaled
+    if smooth and surface.get_bitsize() in (24, 32):
+        scaled = pygame.transform.smoothscale(surface, size)
+    else:
+        scaled = pygame.transform.scale(surface, size)
+    return _variant_put(key, scaled, surface)
+
+
+def quantize_angle(angle: float, step: float = ROTATION_STEP_DEG) -> float:
+    """Snap angle (degrees) to the rotation cache grid, normalized to [0, 360)."""
+    return (round(float(angle) / step) * step) % 360
+
+
+def get_rotated(surface: pygame.Surface, angle: float, step: float = ROTATION_STEP_DEG) -> pygame.Surface:
+    """Cached copy of surface rotated by angle degrees (counter-clockwise), quantized to step."""
+    q = quantize_angle(angle, step)
+    if q == 0:
+        return surface
+    key = ("rotated", id(surface), q)
+    rotated = _variant_get(key, surface)
+    if rotated is not None:
+        return rotated
+    return _variant_put(key, pygame.transform.rotate(surface, q), surface)
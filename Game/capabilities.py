@@ -0,0 +1,72 @@
+"""Capability flags declared per entity type.
+
+Each entity class sets CAPABILITIES to the bit flags below, so the arena can
+dispatch on a per-type lookup instead of probing every object with hasattr /
+getattr each frame. Types that do not declare flags get them inferred once
+from their attributes.
+"""
+
+CAP_UPDATE       = 1 << 0   # needs update() every tick
+CAP_DRAW         = 1 << 1   # draw(surface, ...)
+CAP_EVENTS       = 1 << 2   # handle_event(event)
+CAP_BODY         = 1 << 3   # position, layer and get_world_rect()
+CAP_INTERPOLATED = 1 << 4   # prev_position / render_position(alpha)
+CAP_CLOCK        = 1 << 5   # clock attribute the arena points at its simulation clock
+CAP_DAMAGEABLE   = 1 << 6   # take_damage(amount)
+CAP_ARMED        = 1 << 7   # weapon / ammo API and set_aim_direction()
+CAP_EATS         = 1 << 8   # eat(), poop(), set_eating_intent()
+CAP_EXPIRES      = 1 << 9   # alive flag; dead objects are removed by the arena
+CAP_COLLIDE      = 1 << 10  # on_character_collide(character, arena)
+CAP_PICKUP       = 1 << 11  # weapon pickup consumed on contact
+CAP_CAMERA       = 1 << 12  # create_camera_surface() / set_camera_size()
+CAP_LIFETIME     = 1 << 13  # spawn_time / ttl_ms; the arena removes it on a scheduler timer at spawn_time + ttl_ms
+CAP_TIMERS       = 1 << 14  # attach_scheduler(scheduler): cooldowns end on scheduler events
+CAP_RANDOM       = 1 << 15  # attach_rng(rng_service): draws from the arena's named RNG streams
+CAP_COARSE       = 1 << 16  # update_coarse(ticks): catches up several skipped ticks in one call
+CAP_AI           = 1 << 17  # attach_ai(director): decisions scheduled by the arena's AI director
+
+_INFERRED = (
+    (CAP_UPDATE, ("update",)),
+    (CAP_DRAW, ("draw",)),
+    (CAP_EVENTS, ("handle_event",)),
+    (CAP_BODY, ("position", "get_world_rect")),
+    (CAP_INTERPOLATED, ("prev_position", "render_position")),
+    (CAP_CLOCK, ("clock",)),
+    (CAP_DAMAGEABLE, ("take_damage",)),
+    (CAP_ARMED, ("has_weapon", "set_aim_direction")),
+    (CAP_EATS, ("eat", "poop", "set_eating_intent")),
+    (CAP_EXPIRES, ("alive",)),
+    (CAP_COLLIDE, ("on_character_collide",)),
+    (CAP_CAMERA, ("create_camera_surface", "set_camera_size")),
+    (CAP_LIFETIME, ("spawn_time", "ttl_ms")),
+    (CAP_TIMERS, ("attach_scheduler",)),
+    (CAP_RANDOM, ("attach_rng",)),
+    (CAP_COARSE, ("update_coarse",)),
+    (CAP_AI, ("attach_ai",)),
+)
+
+_CACHE = {}
+
+
+def capabilities_of(obj) -> int:
+    """Capability flags of obj's type (declared CAPABILITIES, else inferred from obj once per type)."""
+    cls = type(obj)
+    caps = _CACHE.get(cls)
+    if caps is None:
+        caps = getattr(cls, "CAPABILITIES", None)
+        if caps is None:
+            caps = infer_capabilities(obj)
+        _CACHE[cls] = caps
+    return caps
+
+
+def has_capability(obj, capability: int) -> bool:
+    return (capabilities_of(obj) & capability) == capability
+
+
+def infer_capabilities(obj) -> int:
+    caps = 0
+    for flag, names in _INFERRED:
+        if all(hasattr(obj, name) for name in names):
+            caps |= flag
+    return caps
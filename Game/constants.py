@@ -29,4 +29,14 @@ ZOOM = 1.3  # >1.0 means zoomed-in (see less of the world)
 ZOOM_STEP = 0.2
 ZOOM_MAX = 8.0
 
+# Fixed-timestep simulation: ticks per second, and render frame cap (0 = uncapped)
+TICK_RATE = 60
+MAX_FPS = 0
+# Number of local (split-screen) players
+LOCAL_PLAYERS = 1
+# Longest real frame time fed to the simulation; avoids a spiral of death after stalls
+MAX_FRAME_TIME = 0.25
+# Match seed: fixes world layout, loot rolls, AI and weapon drops (Game/rng.py streams)
+MATCH_SEED = 42
+
 COLLISION_EVENT = pygame.USEREVENT + 1
\ No newline at end of file
@@ -0,0 +1,35 @@
+import pygame
+
+# Keyboard layout per local player (split screen); each action lists the keys that trigger it
+PLAYER_KEY_BINDINGS = [
+    {
+        "right": (pygame.K_d,),
+        "left": (pygame.K_a,),
+        "up": (pygame.K_w,),
+        "down": (pygame.K_s,),
+        # Camera zoom controls (keyboard)
+        "zoom_in": (pygame.K_e, pygame.K_EQUALS),
+        "zoom_out": (pygame.K_q, pygame.K_MINUS),
+        "eat": (pygame.K_SPACE,),
+        "poop": (pygame.K_p,),
+    },
+    {
+        "right": (pygame.K_RIGHT,),
+        "left": (pygame.K_LEFT,),
+        "up": (pygame.K_UP,),
+        "down": (pygame.K_DOWN,),
+        "zoom_in": (pygame.K_PAGEUP,),
+        "zoom_out": (pygame.K_PAGEDOWN,),
+        "eat": (pygame.K_RETURN,),
+        "poop": (pygame.K_RSHIFT,),
+    },
+]
+
+def convert_key_to_string(key, bindings=None):
+    if bindings is None:
+        bindings = PLAYER_KEY_BINDINGS[0]
+    keys = []
+    for action, codes in bindings.items():
+        if any(key[code] for code in codes):
+            keys.append(action)
+    return keys
@@ -0,0 +1,155 @@
+"""Benchmark for the slotted entity classes and capability dispatch.
+
+Compares every hot entity type against a dict-backed clone of the same class
+(bytes per instance), reports the bytes per projectile slot of ProjectilePool,
+and times the arena's per-frame dispatch loops written with hasattr/getattr
+probing against the declared-capability lookup.
+
+Run: python -m Game.entity_benchmark [--count N] [--frames N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from Game.headless import init_headless
+
+
+def _dict_backed(cls):
+    """Same class body without __slots__, so instances carry a regular __dict__."""
+    slots = set(cls.__dict__.get("__slots__", ()))
+    namespace = {k: v for k, v in cls.__dict__.items() if k not in slots and k not in ("__slots__", "__dict__", "__weakref__")}
+    return type(cls.__name__ + "Dict", cls.__bases__, namespace)
+
+
+def _bytes_per_instance(factory, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    items = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del items
+    return total / count
+
+
+def _entity_factories():
+    from Game.Character.cow import Cow
+    from Game.Objects import Poop, WeaponPickup, GrassField, GoldenField, Obstacle
+    from Game.Weapons import Weapon
+
+    weapon = Weapon("Bow")
+    return [
+        (Cow, lambda cls, i: cls((0, 0, 50, 50), "cow", (i, i), camera_display_size=(900, 600), world_display_size=(2400, 1800))),
+        (Poop, lambda cls, i: cls((i, i), clock=lambda: 0)),
+        (WeaponPickup, lambda cls, i: cls(weapon, (i, i))),
+        (GrassField, lambda cls, i: cls((i, i, 40, 40))),
+        (GoldenField, lambda cls, i: cls((i, i, 40, 40))),
+        (Obstacle, lambda cls, i: cls((i, i, 40, 40))),
+    ]
+
+
+def memory_report(count: int = 2000):
+    rows = []
+    for cls, make in _entity_factories():
+        plain = _dict_backed(cls)
+        slotted_bytes = _bytes_per_instance(lambda i: make(cls, i), count)
+        dict_bytes = _bytes_per_instance(lambda i: make(plain, i), count)
+        rows.append((cls.__name__, dict_bytes, slotted_bytes))
+    return rows
+
+
+def pool_bytes_per_projectile(count: int = 2000) -> float:
+    """Array bytes per slot of a ProjectilePool holding count projectiles."""
+    from Game.Objects import ProjectilePool
+
+    pool = ProjectilePool(count)
+    return sum(getattr(pool, name).nbytes for name in ProjectilePool._ARRAYS) / pool.capacity
+
+
+def _probing_frame(arena):
+    # Per-frame dispatch as written before capabilities were declared
+    for character in arena.characters:
+        if hasattr(character, "update"):
+            pass
+        if hasattr(character, "prev_position"):
+            pass
+        if hasattr(character, "get_world_rect") and hasattr(character, "position"):
+            getattr(character, "layer", 0)
+        if hasattr(character, "has_weapon"):
+            pass
+    for obj in arena.objects:
+        if hasattr(obj, "update"):
+            pass
+        if hasattr(obj, "on_character_collide") and getattr(obj, "alive", True):
+            pass
+        getattr(obj, "alive", True)
+    for entity in arena.grass_fields + arena.golden_fields + arena.obstacles:
+        if hasattr(entity, "update"):
+            pass
+
+
+def _capability_frame(arena):
+    from Game.capabilities import capabilities_of, CAP_UPDATE, CAP_INTERPOLATED, CAP_BODY, CAP_ARMED, CAP_COLLIDE, CAP_EXPIRES
+    from Game.ECS import ACTOR
+
+    for character in arena.characters:
+        caps = capabilities_of(character)
+        if caps & CAP_UPDATE:
+            pass
+        if caps & CAP_INTERPOLATED:
+            pass
+        if caps & CAP_BODY:
+            character.layer
+        if caps & CAP_ARMED:
+            pass
+    for obj in arena.objects:
+        caps = capabilities_of(obj)
+        if caps & CAP_UPDATE:
+            pass
+        if caps & CAP_COLLIDE and (not caps & CAP_EXPIRES or obj.alive):
+            pass
+    # Fields and obstacles live in tables without ACTOR, so the update system never visits them
+    for table in arena.world.query(ACTOR):
+        for entity in table.objects[:table.count]:
+            pass
+
+
+def dispatch_report(count: int = 2000, frames: int = 200):
+    from Game.headless import create_headless_arena
+    from Game.Character.ai_cow import AICow
+    from Game.Objects import Poop
+
+    arena = create_headless_arena()
+    w, h = arena.world_dimensions
+    for i in range(count):
+        arena.add_new_character(AICow((0, 0, 50, 50), f"bot{i}", (i * 7 % w, i * 13 % h), camera_display_size=(900, 600), world_display_size=(w, h)))
+        arena.add_new_object(Poop((i * 11 % w, i * 5 % h), clock=arena.now_ms))
+    results = []
+    for name, frame in (("hasattr probing", _probing_frame), ("capabilities", _capability_frame)):
+        start = time.perf_counter()
+        for _ in range(frames):
+            frame(arena)
+        results.append((name, (time.perf_counter() - start) / frames * 1000.0))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000, help="entities per type")
+    parser.add_argument("--frames", type=int, default=200, help="dispatch frames to time")
+    args = parser.parse_args(argv)
+
+    init_headless()
+    print(f"{'entity':<14}{'dict B':>10}{'slots B':>10}{'saved':>8}")
+    for name, dict_bytes, slotted_bytes in memory_report(args.count):
+        saved = 1.0 - slotted_bytes / dict_bytes if dict_bytes else 0.0
+        print(f"{name:<14}{dict_bytes:>10.0f}{slotted_bytes:>10.0f}{saved:>8.0%}")
+    print(f"{'projectile':<14}{'':>10}{pool_bytes_per_projectile(args.count):>10.0f}  (ProjectilePool slot)")
+    print()
+    for name, ms in dispatch_report(args.count, args.frames):
+        print(f"{name:<18}{ms:>8.3f} ms/frame ({args.count} cows + {args.count} poops)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+from Game.constants import TICK_RATE, MAX_FRAME_TIME
+
+
+class FixedTimestep:
+    """
+    Accumulator for a fixed-timestep loop.
+    Feed it the real time of each frame; it says how many simulation ticks to run
+    and how far between the last two ticks the renderer should interpolate.
+    """
+
+    def __init__(self, tick_rate: int = TICK_RATE, max_frame_time: float = MAX_FRAME_TIME):
+        self.tick_rate = int(tick_rate)
+        self.dt = 1.0 / self.tick_rate
+        self.max_frame_time = float(max_frame_time)
+        self.accumulator = 0.0
+
+    def advance(self, frame_time: float) -> int:
+        """Add frame_time seconds and return the number of whole ticks now due."""
+        self.accumulator += max(0.0, min(float(frame_time), self.max_frame_time))
+        ticks = int(self.accumulator / self.dt)
+        self.accumulator -= ticks * self.dt
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a tick left in the accumulator, in [0, 1)."""
+        return self.accumulator / self.dt
@@ -0,0 +1,37 @@
+"""Headless simulation helpers.
+
+A headless arena has no screen or world surface: it only runs update(), never
+decodes sprites and keeps time with the simulation clock instead of
+pygame.time.get_ticks(), so it works without pygame.init() or a display.
+"""
+
+import os
+
+from Game.assets import set_headless
+from Game.constants import SCREEN_W, SCREEN_H, WORLD_W, WORLD_H, MATCH_SEED
+
+
+def init_headless():
+    """Switch the process to headless mode. Call before creating any Arena or Cow."""
+    # Dummy drivers keep any accidental pygame.display/mixer use from opening a window
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    set_headless(True)
+
+
+def create_headless_arena(world_size=(WORLD_W, WORLD_H), camera_size=(SCREEN_W, SCREEN_H), seed: int = MATCH_SEED):
+    from Game.Arena.arena import Arena
+
+    init_headless()
+    return Arena((0, 0, camera_size[0], camera_size[1]), world_size, seed=seed)
+
+
+def run_ticks(arena, ticks: int, key_source=None):
+    """
+    Advance the arena by ticks fixed steps as fast as possible.
+    key_source(tick) -> list of key strings, or None for no input.
+    """
+    for _ in range(int(ticks)):
+        keys = key_source(arena.tick_count) if key_source is not None else ()
+        arena.tick(keys)
+    return arena
@@ -0,0 +1,17 @@
+from Game.Character.cow import Cow
+from Game.Character.ai_cow import AICow
+
+
+def populate_match(arena, local_players: int = 1):
+    """Spawn the standard match roster: local players side by side at the world centre, then two AI cows."""
+    world_w, world_h = arena.world_dimensions
+    camera_size = arena.rect.size
+    world_size = (world_w, world_h)
+    for i in range(local_players):
+        player = Cow((0, 0, 50, 50), "muuu" if i == 0 else f"muuu{i + 1}", (world_w * 0.5 + i * 80, world_h * 0.5), camera_display_size=camera_size, world_display_size=world_size, ammo_find_probability=0.2, move_speed=240)
+        arena.add_player(player)
+    npc1 = AICow((0, 0, 50, 50), "npc1", (world_w * 0.5 + 120, world_h * 0.5), camera_display_size=camera_size, world_display_size=world_size, ammo_find_probability=0.1, move_speed=180)
+    npc2 = AICow((0, 0, 50, 50), "npc2", (world_w * 0.5 - 160, world_h * 0.5 + 80), camera_display_size=camera_size, world_display_size=world_size, ammo_find_probability=0.1, move_speed=180)
+    arena.add_new_character(npc1)
+    arena.add_new_character(npc2)
+    return arena
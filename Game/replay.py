@@ -0,0 +1,290 @@
+"""Match recording and headless replay.
+
+InputRecorder logs what main.py feeds the arena (each tick's pressed actions per
+local player, and the mouse events handled between ticks, with the world point each
+one mapped to) into a compact binary log. Replay rebuilds the match from the log's seed and roster and feeds the same
+inputs back into a headless Arena as fast as it can tick; keyframes (Arena.snapshot()
+bytes) taken every keyframe_interval ticks let seek() jump without re-simulating
+from the start.
+
+Run: python -m Game.replay LOG [--seek TICK] [--ticks N]
+"""
+
+import argparse
+import bisect
+import math
+import struct
+import time
+
+import pygame
+
+from Game.headless import create_headless_arena
+from Game.match import populate_match
+
+MAGIC = b"SYNR"
+VERSION = 2
+
+# Action vocabulary: a tick's key list is stored as one bit per action, in this order
+ACTIONS = ("right", "left", "up", "down", "zoom_in", "zoom_out", "eat", "poop")
+_ACTION_BITS = {action: 1 << i for i, action in enumerate(ACTIONS)}
+_MASK_KEYS = [tuple(a for i, a in enumerate(ACTIONS) if mask >> i & 1) for mask in range(1 << len(ACTIONS))]
+
+# magic, version, seed, world w/h, camera w/h, tick rate, local players (0: one key list shared by every character)
+_HEADER = struct.Struct("<4sHqHHHHHB")
+_EVENT = struct.Struct("<Bhhbdd")  # kind, x, y (wheel: dx, dy), button, world x, y (NaN: none)
+_RUN = struct.Struct("<H")
+
+# Record tags
+_TAG_KEYS = 1   # key masks (one per player) held from the next tick on
+_TAG_EVENT = 2  # mouse event handled before the next tick
+_TAG_TICKS = 3  # run of ticks with the current key masks
+
+_EVENT_KINDS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL)
+
+
+def keys_to_mask(key_list) -> int:
+    mask = 0
+    for key in key_list:
+        bit = _ACTION_BITS.get(key)
+        if bit is None:
+            raise ValueError(f"unknown action {key!r}; replays record only {ACTIONS}")
+        mask |= bit
+    return mask
+
+
+def mask_to_keys(mask: int) -> tuple:
+    return _MASK_KEYS[mask]
+
+
+class InputRecorder:
+    """
+    Records a match from its first tick. Call record_event(event) for every event passed to
+    arena.handle_event (before handling it) and record_tick(...) with the same keys passed to arena.tick.
+    Mouse events keep the world point the arena maps them to, so replays aim and fire at the same
+    spot whatever camera the replaying arena would compute.
+    Held keys are run-length encoded, so an idle or steady tick costs nothing until input changes.
+    """
+
+    def __init__(self, arena):
+        if arena.tick_count != 0:
+            raise ValueError("recording must start before the arena's first tick")
+        self.arena = arena
+        self.players = len(arena.players)
+        self.ticks = 0
+        self._keys = struct.Struct(f"<{max(1, self.players)}H")
+        self._header = _HEADER.pack(MAGIC, VERSION, arena.rng.seed, *arena.world_dimensions, *arena.rect.size,
+                                    arena.tick_rate, self.players)
+        self._records = bytearray()
+        self._masks = None
+        self._run = 0
+
+    def record_event(self, event):
+        if event.type not in _EVENT_KINDS:
+            return
+        self._end_run()
+        if event.type == pygame.MOUSEWHEEL:
+            x, y, button = event.x, event.y, 0
+        else:
+            x, y = event.pos
+            button = getattr(event, "button", 0)
+        world = self.arena.mouse_world_pos(event)
+        world_x, world_y = (math.nan, math.nan) if world is None else world
+        self._records.append(_TAG_EVENT)
+        self._records += _EVENT.pack(_EVENT_KINDS.index(event.type), x, y, button, world_x, world_y)
+
+    def record_tick(self, key_list=(), player_keys=None):
+        lists = list(player_keys) if player_keys is not None else [key_list]
+        count = max(1, self.players)
+        masks = tuple(keys_to_mask(keys) for keys in lists[:count]) + (0,) * (count - len(lists))
+        if masks != self._masks:
+            self._end_run()
+            self._records.append(_TAG_KEYS)
+            self._records += self._keys.pack(*masks)
+            self._masks = masks
+        self._run += 1
+        if self._run == 0xFFFF:
+            self._end_run()
+        self.ticks += 1
+
+    def _end_run(self):
+        if self._run:
+            self._records.append(_TAG_TICKS)
+            self._records += _RUN.pack(self._run)
+            self._run = 0
+
+    def to_bytes(self) -> bytes:
+        self._end_run()
+        return self._header + bytes(self._records)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+class ReplayLog:
+    """A parsed recording: header fields plus the raw record stream."""
+
+    def __init__(self, data: bytes):
+        if len(data) < _HEADER.size:
+            raise ValueError("replay log is truncated")
+        magic, version, seed, world_w, world_h, camera_w, camera_h, tick_rate, players = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a replay log")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay log version {version}")
+        self.data = bytes(data)
+        self.seed = seed
+        self.world_size = (world_w, world_h)
+        self.camera_size = (camera_w, camera_h)
+        self.tick_rate = tick_rate
+        self.players = players
+        self.keys = struct.Struct(f"<{max(1, players)}H")
+        self.start = _HEADER.size
+        self.ticks = self._count_ticks()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def _count_ticks(self) -> int:
+        data = self.data
+        offset = self.start
+        ticks = 0
+        while offset < len(data):
+            tag = data[offset]
+            offset += 1
+            if tag == _TAG_TICKS:
+                ticks += _RUN.unpack_from(data, offset)[0]
+                offset += _RUN.size
+            elif tag == _TAG_KEYS:
+                offset += self.keys.size
+            elif tag == _TAG_EVENT:
+                offset += _EVENT.size
+            else:
+                raise ValueError(f"corrupt replay log: unknown record tag {tag} at byte {offset - 1}")
+        if offset != len(data):
+            raise ValueError("replay log is truncated")
+        return ticks
+
+
+class Replay:
+    """
+    Drives a headless arena from a ReplayLog at uncapped speed.
+    setup(arena, players) spawns the match roster (default: the same populate_match main.py uses).
+    """
+
+    def __init__(self, log, setup=populate_match, keyframe_interval: int = 600):
+        self.log = log if isinstance(log, ReplayLog) else ReplayLog(log)
+        self.setup = setup
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self.keyframes = []       # (tick, snapshot bytes, cursor), ordered by tick
+        self._keyframe_ticks = []
+        self.arena = create_headless_arena(self.log.world_size, self.log.camera_size, seed=self.log.seed)
+        self.arena.tick_rate = self.log.tick_rate
+        self.setup(self.arena, self.log.players)
+        self._cursor = (self.log.start, (0,) * max(1, self.log.players), 0)
+        self._keyframe()
+
+    @property
+    def tick(self) -> int:
+        return self.arena.tick_count
+
+    def _keyframe(self):
+        tick = self.arena.tick_count
+        if self._keyframe_ticks and self._keyframe_ticks[-1] >= tick:
+            return
+        self._keyframe_ticks.append(tick)
+        self.keyframes.append((tick, self.arena.snapshot(), self._cursor))
+
+    def step(self) -> bool:
+        """Run the next recorded tick. Returns False once the log is exhausted."""
+        log = self.log
+        data = log.data
+        offset, masks, run = self._cursor
+        while run == 0:
+            if offset >= len(data):
+                self._cursor = (offset, masks, run)
+                return False
+            tag = data[offset]
+            offset += 1
+            if tag == _TAG_TICKS:
+                run = _RUN.unpack_from(data, offset)[0]
+                offset += _RUN.size
+            elif tag == _TAG_KEYS:
+                masks = log.keys.unpack_from(data, offset)
+                offset += log.keys.size
+            else:
+                kind, x, y, button, world_x, world_y = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                self.arena.handle_event(_make_event(kind, x, y, button, world_x, world_y))
+        self._cursor = (offset, masks, run - 1)
+        keys = [mask_to_keys(mask) for mask in masks]
+        if log.players:
+            self.arena.tick(player_keys=keys)
+        else:
+            self.arena.tick(keys[0])
+        if self.arena.tick_count % self.keyframe_interval == 0:
+            self._keyframe()
+        return True
+
+    def run(self, ticks=None) -> int:
+        """Replay up to ticks ticks (default: to the end of the log); returns how many ran."""
+        ran = 0
+        while (ticks is None or ran < ticks) and self.step():
+            ran += 1
+        return ran
+
+    def seek(self, tick: int):
+        """
+        Move to the state after tick ticks. Backwards (or past a later keyframe) it restores the
+        closest keyframe at or before tick, then replays the remaining ticks.
+        """
+        tick = max(0, min(int(tick), self.log.ticks))
+        index = bisect.bisect_right(self._keyframe_ticks, tick) - 1
+        frame_tick, snapshot, cursor = self.keyframes[index]
+        if tick < self.arena.tick_count or frame_tick > self.arena.tick_count:
+            self.arena.restore(snapshot)
+            self._cursor = cursor
+        self.run(tick - self.arena.tick_count)
+        return self.arena
+
+
+def _make_event(kind, x, y, button, world_x, world_y):
+    event_type = _EVENT_KINDS[kind]
+    if event_type == pygame.MOUSEWHEEL:
+        return pygame.event.Event(event_type, x=x, y=y)
+    fields = {"pos": (x, y)}
+    if not math.isnan(world_x):
+        fields["world_pos"] = (world_x, world_y)
+    if event_type != pygame.MOUSEMOTION:
+        fields["button"] = button
+    return pygame.event.Event(event_type, **fields)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", help="replay log written by InputRecorder (main.py --record PATH)")
+    parser.add_argument("--seek", type=int, default=None, help="jump to this tick before replaying")
+    parser.add_argument("--ticks", type=int, default=None, help="ticks to replay (default: to the end)")
+    parser.add_argument("--keyframe-interval", type=int, default=600, help="ticks between seek keyframes")
+    args = parser.parse_args(argv)
+
+    log = ReplayLog.load(args.log)
+    print(f"seed {log.seed}, {log.ticks} ticks at {log.tick_rate} Hz, {log.players} local player(s), {len(log.data)} bytes")
+    replay = Replay(log, keyframe_interval=args.keyframe_interval)
+    if args.seek is not None:
+        start = time.perf_counter()
+        replay.seek(args.seek)
+        print(f"seek to {replay.tick}: {(time.perf_counter() - start) * 1000.0:.1f} ms")
+    start = time.perf_counter()
+    ran = replay.run(args.ticks)
+    elapsed = time.perf_counter() - start
+    rate = ran / elapsed if elapsed > 0 else 0.0
+    print(f"replayed {ran} ticks in {elapsed * 1000.0:.1f} ms ({rate:.0f} ticks/s), now at tick {replay.tick}")
+    for character in replay.arena.characters:
+        print(f"  {character.username:<10} pos ({character.position.x:.0f}, {character.position.y:.0f})  hp {character.health}  ammo {character.ammo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import heapq
+
+
+class Timer:
+    """Handle for a scheduled callback; pass it to Scheduler.cancel()."""
+
+    __slots__ = ("due_ms", "seq", "callback", "args", "cancelled")
+
+    def __init__(self, due_ms: int, seq: int, callback, args):
+        self.due_ms = int(due_ms)
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.due_ms, self.seq) < (other.due_ms, other.seq)
+
+
+class Scheduler:
+    """
+    Min-heap of timers on the simulation clock (milliseconds).
+    advance(now_ms) fires every timer due at or before now_ms in (due, scheduling) order, so the
+    same inputs always fire the same callbacks in the same order, headless or not.
+    Nothing is polled per object: an idle entity costs nothing until its timer fires.
+    """
+
+    def __init__(self, now_ms: int = 0):
+        self.now_ms = int(now_ms)
+        self._heap = []
+        self._seq = 0
+        self._live = 0
+
+    def __len__(self):
+        return self._live
+
+    def schedule(self, due_ms: int, callback, *args) -> Timer:
+        timer = Timer(due_ms, self._seq, callback, args)
+        self._seq += 1
+        heapq.heappush(self._heap, timer)
+        self._live += 1
+        return timer
+
+    def schedule_in(self, delay_ms: int, callback, *args) -> Timer:
+        return self.schedule(self.now_ms + int(delay_ms), callback, *args)
+
+    def cancel(self, timer: Timer):
+        # Lazy deletion: the entry is dropped when it reaches the top of the heap
+        if timer is not None and not timer.cancelled:
+            timer.cancelled = True
+            self._live -= 1
+
+    def next_due(self):
+        """Due time of the earliest pending timer, or None."""
+        heap = self._heap
+        while heap and heap[0].cancelled:
+            heapq.heappop(heap)
+        return heap[0].due_ms if heap else None
+
+    def advance(self, now_ms: int) -> int:
+        """Move the clock to now_ms and fire every due timer (including ones scheduled while firing). Returns the count fired."""
+        self.now_ms = int(now_ms)
+        heap = self._heap
+        fired = 0
+        while heap and heap[0].due_ms <= self.now_ms:
+            timer = heapq.heappop(heap)
+            if timer.cancelled:
+                continue
+            timer.cancelled = True
+            self._live -= 1
+            timer.callback(*timer.args)
+            fired += 1
+        return fired
+
+    def clear(self):
+        self._heap.clear()
+        self._live = 0
@@ -0,0 +1,400 @@
+"""Versioned binary snapshots of a running Arena.
+
+A snapshot is a header followed by length-prefixed sections (clock, RNG streams,
+weapons, characters, obstacles, objects, projectiles), packed with struct and
+NumPy column bytes; nothing pygame-specific is pickled. Restoring needs an arena
+with the same roster and world layout (same seed and setup), which is what
+replay seeking, rollback and crash recovery have. Scheduler timers are not
+stored: restore rebuilds them from entity state (poop spawn time + TTL, cow
+cooldown timestamps), since every timer the game sets is derived from those.
+
+A delta snapshot stores, per section, nothing (unchanged), the whole section
+(its size changed) or only the byte runs that differ from a baseline snapshot.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+from Game.Objects import Poop, WeaponPickup
+from Game.Weapons import Weapon
+
+MAGIC = b"SYNS"
+VERSION = 6
+
+_KIND_FULL = 0
+_KIND_DELTA = 1
+
+_HEADER = struct.Struct("<4sHBI")      # magic, version, kind, tick count
+_DELTA_BASE = struct.Struct("<II")     # baseline crc32, baseline length
+_SECTION = struct.Struct("<BI")        # tag, payload length
+_DELTA_SECTION = struct.Struct("<BBI")  # tag, mode, payload length
+_RUN = struct.Struct("<II")            # patch offset, length
+
+# Section tags, in write order (weapons come before the characters and pickups that reference them)
+SECTION_CLOCK = 1
+SECTION_RNG = 2
+SECTION_WEAPONS = 3
+SECTION_CHARACTERS = 4
+SECTION_OBSTACLES = 5
+SECTION_OBJECTS = 6
+SECTION_PROJECTILES = 7
+
+# Delta section modes
+_SAME = 0
+_FULL = 1
+_PATCH = 2
+# Changed byte runs closer than this are sent as one run (a run header costs 8 bytes)
+_RUN_GAP = 8
+
+_CLOCK = struct.Struct("<I?ii")                 # tick count, has mouse position, mouse x, y
+_WEAPON = struct.Struct("<iddd2H3B4h")          # ammo/shot, speed, damage, heading, floor size, colour, image scales
+_POOP = struct.Struct("<iiHHqid3B")             # rect, spawn time, ttl, amount, colour
+_PICKUP = struct.Struct("<iiHHh")               # rect, weapon index
+_OBJECT_POOP = 1
+_OBJECT_PICKUP = 2
+
+
+def is_delta(data) -> bool:
+    return _read_header(data)[1] == _KIND_DELTA
+
+
+def snapshot_tick(data) -> int:
+    return _read_header(data)[2]
+
+
+def capture(arena) -> bytes:
+    """Full snapshot of arena's simulation state."""
+    weapons = []
+    weapon_index = {}
+
+    def index_of(weapon):
+        if weapon is None:
+            return -1
+        index = weapon_index.get(id(weapon))
+        if index is None:
+            index = weapon_index[id(weapon)] = len(weapons)
+            weapons.append(weapon)
+        return index
+
+    characters = _pack_characters(arena, index_of)
+    objects = _pack_objects(arena, index_of)
+    sections = (
+        (SECTION_CLOCK, _pack_clock(arena)),
+        (SECTION_RNG, _pack_rng(arena.rng)),
+        (SECTION_WEAPONS, _pack_weapons(weapons)),
+        (SECTION_CHARACTERS, characters),
+        (SECTION_OBSTACLES, _pack_obstacles(arena)),
+        (SECTION_OBJECTS, objects),
+        (SECTION_PROJECTILES, _pack_projectiles(arena)),
+    )
+    parts = [_HEADER.pack(MAGIC, VERSION, _KIND_FULL, arena.tick_count)]
+    for tag, payload in sections:
+        parts.append(_SECTION.pack(tag, len(payload)))
+        parts.append(payload)
+    return b"".join(parts)
+
+
+def restore(arena, data):
+    """Put arena back into the state of a full snapshot."""
+    _, kind, _ = _read_header(data)
+    if kind != _KIND_FULL:
+        raise ValueError("delta snapshot: resolve it with apply_delta(baseline, delta) first")
+    sections = _read_sections(data)
+    missing = {SECTION_CLOCK, SECTION_RNG, SECTION_WEAPONS, SECTION_CHARACTERS, SECTION_OBSTACLES,
+               SECTION_OBJECTS, SECTION_PROJECTILES} - sections.keys()
+    if missing:
+        raise ValueError(f"snapshot is missing sections {sorted(missing)}")
+    weapons = _unpack_weapons(sections[SECTION_WEAPONS])
+    _unpack_clock(arena, sections[SECTION_CLOCK])
+    _unpack_rng(arena.rng, sections[SECTION_RNG])
+    # Timers are rebuilt below from the restored objects and cows
+    arena.scheduler.clear()
+    arena.scheduler.now_ms = arena.now_ms()
+    _unpack_characters(arena, sections[SECTION_CHARACTERS], weapons)
+    _unpack_obstacles(arena, sections[SECTION_OBSTACLES])
+    _unpack_objects(arena, sections[SECTION_OBJECTS], weapons)
+    arena.projectiles.unpack(sections[SECTION_PROJECTILES], 0, lambda key: arena.characters[key] if key >= 0 else None)
+    for character in arena.characters:
+        if getattr(character, "scheduler", None) is not None:
+            character.attach_scheduler(arena.scheduler)
+    # Pending AI decisions are part of the agents' state
+    arena.ai.rebuild()
+    arena._sync_character_grid()
+
+
+def make_delta(baseline, data) -> bytes:
+    """Delta from full snapshot baseline to full snapshot data."""
+    if _read_header(baseline)[1] != _KIND_FULL or _read_header(data)[1] != _KIND_FULL:
+        raise ValueError("deltas are taken between two full snapshots")
+    old = _read_sections(baseline)
+    parts = [_HEADER.pack(MAGIC, VERSION, _KIND_DELTA, snapshot_tick(data)),
+             _DELTA_BASE.pack(zlib.crc32(baseline), len(baseline))]
+    for tag, payload in _read_sections(data).items():
+        before = old.get(tag)
+        if before == payload:
+            mode, body = _SAME, b""
+        elif before is None or len(before) != len(payload):
+            mode, body = _FULL, payload
+        else:
+            mode, body = _PATCH, _patch(before, payload)
+            if len(body) >= len(payload):
+                mode, body = _FULL, payload
+        parts.append(_DELTA_SECTION.pack(tag, mode, len(body)))
+        parts.append(body)
+    return b"".join(parts)
+
+
+def apply_delta(baseline, delta) -> bytes:
+    """Rebuild the full snapshot a delta was taken from, given the same baseline."""
+    _, kind, tick = _read_header(delta)
+    if kind != _KIND_DELTA:
+        raise ValueError("not a delta snapshot")
+    crc, length = _DELTA_BASE.unpack_from(delta, _HEADER.size)
+    if len(baseline) != length or zlib.crc32(baseline) != crc:
+        raise ValueError("delta snapshot was taken against a different baseline")
+    old = _read_sections(baseline)
+    parts = [_HEADER.pack(MAGIC, VERSION, _KIND_FULL, tick)]
+    offset = _HEADER.size + _DELTA_BASE.size
+    while offset < len(delta):
+        tag, mode, size = _DELTA_SECTION.unpack_from(delta, offset)
+        offset += _DELTA_SECTION.size
+        body = delta[offset:offset + size]
+        offset += size
+        if mode == _SAME:
+            payload = old[tag]
+        elif mode == _FULL:
+            payload = body
+        else:
+            payload = _apply_patch(old[tag], body)
+        parts.append(_SECTION.pack(tag, len(payload)))
+        parts.append(payload)
+    return b"".join(parts)
+
+
+# ------- Framing -------
+def _read_header(data):
+    if len(data) < _HEADER.size:
+        raise ValueError("snapshot is truncated")
+    magic, version, kind, tick = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not an arena snapshot")
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    return version, kind, tick
+
+
+def _read_sections(data) -> dict:
+    sections = {}
+    offset = _HEADER.size
+    while offset < len(data):
+        tag, size = _SECTION.unpack_from(data, offset)
+        offset += _SECTION.size
+        if offset + size > len(data):
+            raise ValueError("snapshot is truncated")
+        sections[tag] = bytes(data[offset:offset + size])
+        offset += size
+    return sections
+
+
+def _patch(old, new) -> bytes:
+    changed = np.flatnonzero(np.frombuffer(old, np.uint8) != np.frombuffer(new, np.uint8))
+    breaks = np.flatnonzero(np.diff(changed) > _RUN_GAP)
+    starts = np.concatenate((changed[:1], changed[breaks + 1])).tolist()
+    ends = (np.concatenate((changed[breaks], changed[-1:])) + 1).tolist()
+    parts = []
+    for start, end in zip(starts, ends):
+        parts.append(_RUN.pack(start, end - start))
+        parts.append(new[start:end])
+    return b"".join(parts)
+
+
+def _apply_patch(old, body) -> bytes:
+    payload = bytearray(old)
+    offset = 0
+    while offset < len(body):
+        start, size = _RUN.unpack_from(body, offset)
+        offset += _RUN.size
+        payload[start:start + size] = body[offset:offset + size]
+        offset += size
+    return bytes(payload)
+
+
+def _pack_str(value) -> bytes:
+    if value is None:
+        return struct.pack("<H", 0xFFFF)
+    raw = value.encode("utf-8")
+    return struct.pack("<H", len(raw)) + raw
+
+
+def _unpack_str(data, offset):
+    (size,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+    if size == 0xFFFF:
+        return None, offset
+    return data[offset:offset + size].decode("utf-8"), offset + size
+
+
+# ------- Sections -------
+def _pack_clock(arena) -> bytes:
+    mouse = arena._last_mouse_pos
+    if mouse is None:
+        return _CLOCK.pack(arena.tick_count, False, 0, 0)
+    return _CLOCK.pack(arena.tick_count, True, int(mouse[0]), int(mouse[1]))
+
+
+def _unpack_clock(arena, payload):
+    tick_count, has_mouse, x, y = _CLOCK.unpack(payload)
+    arena.tick_count = tick_count
+    arena._last_mouse_pos = (x, y) if has_mouse else None
+
+
+def _pack_rng(rng) -> bytes:
+    state = rng.snapshot()
+    parts = [struct.pack("<qH", state["seed"], len(state["streams"]))]
+    for name, (version, internal, gauss) in sorted(state["streams"].items()):
+        parts.append(_pack_str(name))
+        parts.append(struct.pack("<BH?d", version, len(internal), gauss is not None, gauss or 0.0))
+        parts.append(np.asarray(internal, dtype="<u4").tobytes())
+    return b"".join(parts)
+
+
+def _unpack_rng(rng, payload):
+    seed, count = struct.unpack_from("<qH", payload)
+    offset = struct.calcsize("<qH")
+    streams = {}
+    for _ in range(count):
+        name, offset = _unpack_str(payload, offset)
+        version, size, has_gauss, gauss = struct.unpack_from("<BH?d", payload, offset)
+        offset += struct.calcsize("<BH?d")
+        internal = tuple(np.frombuffer(payload, dtype="<u4", count=size, offset=offset).tolist())
+        offset += size * 4
+        streams[name] = (version, internal, gauss if has_gauss else None)
+    rng.restore({"seed": seed, "streams": streams})
+
+
+def _pack_weapons(weapons) -> bytes:
+    parts = [struct.pack("<H", len(weapons))]
+    for weapon in weapons:
+        floor_scale = weapon.floor_image_scale or (-1, -1)
+        projectile_scale = weapon.projectile_image_scale or (-1, -1)
+        parts.append(_pack_str(weapon.name))
+        parts.append(_pack_str(weapon.floor_image_name))
+        parts.append(_pack_str(weapon.projectile_image_name))
+        parts.append(_WEAPON.pack(weapon.ammo_per_shot, weapon.projectile_speed, weapon.damage,
+                                  weapon.projectile_image_heading, *weapon.floor_rect_size, *weapon.floor_color,
+                                  *floor_scale, *projectile_scale))
+    return b"".join(parts)
+
+
+def _unpack_weapons(payload) -> list:
+    (count,) = struct.unpack_from("<H", payload)
+    offset = 2
+    weapons = []
+    for _ in range(count):
+        name, offset = _unpack_str(payload, offset)
+        floor_image, offset = _unpack_str(payload, offset)
+        projectile_image, offset = _unpack_str(payload, offset)
+        (ammo_per_shot, speed, damage, heading, floor_w, floor_h, r, g, b,
+         floor_sw, floor_sh, proj_sw, proj_sh) = _WEAPON.unpack_from(payload, offset)
+        offset += _WEAPON.size
+        weapons.append(Weapon(name, ammo_per_shot=ammo_per_shot, projectile_speed=speed, damage=damage,
+                              projectile_image_heading=heading, floor_rect_size=(floor_w, floor_h),
+                              floor_color=(r, g, b), floor_image_name=floor_image,
+                              floor_image_scale=(floor_sw, floor_sh) if floor_sw >= 0 else None,
+                              projectile_image_name=projectile_image,
+                              projectile_image_scale=(proj_sw, proj_sh) if proj_sw >= 0 else None))
+    return weapons
+
+
+def _pack_characters(arena, weapon_index) -> bytes:
+    parts = [struct.pack("<H", len(arena.characters))]
+    for character in arena.characters:
+        row = type(character).STATE.pack(*character.get_state())
+        parts.append(struct.pack("<hH", weapon_index(getattr(character, "weapon", None)), len(row)))
+        parts.append(row)
+    return b"".join(parts)
+
+
+def _unpack_characters(arena, payload, weapons):
+    (count,) = struct.unpack_from("<H", payload)
+    if count != len(arena.characters):
+        raise ValueError(f"snapshot has {count} characters, arena has {len(arena.characters)}")
+    offset = 2
+    for character in arena.characters:
+        weapon, size = struct.unpack_from("<hH", payload, offset)
+        offset += 4
+        layout = type(character).STATE
+        if size != layout.size:
+            raise ValueError(f"snapshot row for {type(character).__name__} does not match its state layout")
+        character.set_state(layout.unpack_from(payload, offset))
+        offset += size
+        character.weapon = weapons[weapon] if weapon >= 0 else None
+
+
+def _pack_obstacles(arena) -> bytes:
+    health = [obstacle.health for obstacle in arena.obstacles]
+    return struct.pack(f"<H{len(health)}i", len(health), *health)
+
+
+def _unpack_obstacles(arena, payload):
+    (count,) = struct.unpack_from("<H", payload)
+    if count != len(arena.obstacles):
+        raise ValueError(f"snapshot has {count} obstacles, arena has {len(arena.obstacles)}")
+    # The health setter invalidates the arena's obstacle caches and navigation for changed obstacles
+    for obstacle, health in zip(arena.obstacles, struct.unpack_from(f"<{count}i", payload, 2)):
+        obstacle.health = health
+
+
+def _pack_objects(arena, weapon_index) -> bytes:
+    # Object grid order is spawn order, which decides who reaches an overlapping pickup first
+    removed = {id(obj) for obj in arena._removed_objects}
+    parts = []
+    count = 0
+    for obj in arena.object_grid.objects():
+        if id(obj) in removed:
+            continue
+        rect = obj.rect
+        if isinstance(obj, Poop):
+            parts.append(struct.pack("<B", _OBJECT_POOP))
+            parts.append(_POOP.pack(rect.left, rect.top, rect.width, rect.height, obj.spawn_time, obj.ttl_ms,
+                                    obj.amount_percent, *obj.color))
+        elif isinstance(obj, WeaponPickup):
+            parts.append(struct.pack("<B", _OBJECT_PICKUP))
+            parts.append(_PICKUP.pack(rect.left, rect.top, rect.width, rect.height, weapon_index(obj.weapon)))
+        else:
+            raise TypeError(f"{type(obj).__name__} objects cannot be snapshotted")
+        count += 1
+    return struct.pack("<I", count) + b"".join(parts)
+
+
+def _unpack_objects(arena, payload, weapons):
+    current = [obj for obj in arena.object_grid.objects()]
+    for obj in current:
+        arena.object_grid.remove(obj)
+    arena.world.despawn_objects(current)
+    arena._removed_objects = []
+    (count,) = struct.unpack_from("<I", payload)
+    offset = 4
+    for _ in range(count):
+        kind = payload[offset]
+        offset += 1
+        if kind == _OBJECT_POOP:
+            left, top, w, h, spawn_time, ttl_ms, amount, r, g, b = _POOP.unpack_from(payload, offset)
+            offset += _POOP.size
+            obj = Poop((0, 0), size=(w, h), ttl_ms=ttl_ms, color=(r, g, b), amount_percent=amount, clock=arena.now_ms)
+            obj.spawn_time = spawn_time
+        elif kind == _OBJECT_PICKUP:
+            left, top, w, h, weapon = _PICKUP.unpack_from(payload, offset)
+            offset += _PICKUP.size
+            obj = WeaponPickup(weapons[weapon], (0, 0))
+        else:
+            raise ValueError(f"unknown object kind {kind} in snapshot")
+        obj.rect.update(left, top, w, h)
+        arena.add_new_object(obj)
+
+
+def _pack_projectiles(arena) -> bytes:
+    index = {id(character): i for i, character in enumerate(arena.characters)}
+    return arena.projectiles.pack(lambda owner: index.get(id(owner), -1))
@@ -0,0 +1,222 @@
+"""Balance sweeps over the MatchConfig knobs.
+
+A sweep is a list of MatchConfigs, built from a grid (every combination of the listed values) or a
+random search (uniform ranges / value choices, seeded), each played for the same number of headless
+matches on the tournament process pool (Game/tournament.py). Match i of every config uses seed
+seed + i, so configs are compared on the same worlds and spawns.
+
+Results go to a cache directory shared by every sweep run against it: one columnar ResultsStore whose
+rows carry a config_key (hash of the config and the seed), plus configs.json mapping keys back to
+configs. Matches already in the cache are never replayed, so rerunning, widening a grid or raising
+--matches only plays what is missing, and an interrupted sweep resumes where it stopped.
+
+Run: python -m Game.sweep CACHE --grid damage=5,10,20 --grid projectile_speed=720,1080,1440 [--matches 16] [--jobs N]
+     python -m Game.sweep CACHE --random 40 --range damage=5:20 --range move_speed=120:300 --choice ammo_per_shot=1,2
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+from Game.tournament import COLUMNS, MatchConfig, ResultsStore, parse_knob, play_matches, read_results, summarize
+
+SWEEP_COLUMNS = {"config_key": "<u8", **COLUMNS}
+# Knobs sampled as integers by random search
+INTEGER_KNOBS = ("ammo_per_shot",)
+
+
+def config_key(config: MatchConfig, seed: int) -> int:
+    """Cache key of a config played from seed (64-bit)."""
+    text = json.dumps({"config": config.to_dict(), "seed": int(seed)}, sort_keys=True)
+    return int(hashlib.sha1(text.encode()).hexdigest()[:16], 16)
+
+
+def grid_configs(base: MatchConfig, grid: dict) -> list:
+    """base with every combination of grid's knob values (name -> list of values)."""
+    names = list(grid)
+    return [base.with_knobs(**dict(zip(names, values))) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def random_configs(base: MatchConfig, samples: int, ranges: dict = None, choices: dict = None, seed: int = 0) -> list:
+    """
+    samples configs drawn from ranges (name -> (low, high), uniform) and choices (name -> list of values).
+    Drawn values are rounded to 4 decimals so repeated draws hit the cache; duplicates are dropped.
+    """
+    ranges = ranges or {}
+    choices = choices or {}
+    rng = random.Random(seed)
+    configs = []
+    seen = set()
+    for _ in range(int(samples)):
+        knobs = {}
+        for name, (low, high) in ranges.items():
+            if name in INTEGER_KNOBS:
+                knobs[name] = rng.randint(int(low), int(high))
+            else:
+                knobs[name] = round(rng.uniform(low, high), 4)
+        for name, values in choices.items():
+            knobs[name] = rng.choice(values)
+        config = base.with_knobs(**knobs)
+        fingerprint = config.fingerprint()
+        if fingerprint not in seen:
+            seen.add(fingerprint)
+            configs.append(config)
+    return configs
+
+
+def _load_configs(path) -> dict:
+    configs_path = os.path.join(path, "configs.json")
+    if not os.path.exists(configs_path):
+        return {}
+    with open(configs_path) as f:
+        return json.load(f)
+
+
+def _save_configs(path, configs: dict):
+    configs_path = os.path.join(path, "configs.json")
+    with open(configs_path + ".tmp", "w") as f:
+        json.dump(configs, f, indent=1, sort_keys=True)
+    os.replace(configs_path + ".tmp", configs_path)
+
+
+def run_sweep(path, configs, matches: int, seed: int = 1, jobs: int = None, on_result=None) -> int:
+    """
+    Play matches 0 .. matches - 1 of every config into the cache at path, skipping the ones it already
+    holds. on_result(config, row) is called as each match finishes. Returns how many matches ran now.
+    """
+    keyed = [(config_key(config, seed), config) for config in configs]
+    ran = 0
+    with ResultsStore(path, {"kind": "sweep"}, SWEEP_COLUMNS) as store:
+        known = _load_configs(path)
+        added = {f"{key:016x}": {"seed": int(seed), "config": config.to_dict()} for key, config in keyed}
+        if not added.keys() <= known.keys():
+            _save_configs(path, {**known, **added})
+        done = set(zip(store.column("config_key").tolist(), store.column("match_id").tolist()))
+        tasks = ((key, i, int(seed) + i, config) for key, config in keyed
+                 for i in range(int(matches)) if (key, i) not in done)
+        by_key = dict(keyed)
+        for key, row in play_matches(tasks, jobs):
+            row["config_key"] = key
+            store.append(row)
+            ran += 1
+            if on_result is not None:
+                on_result(by_key[key], row)
+    return ran
+
+
+def aggregate(path, configs, matches: int, seed: int = 1) -> list:
+    """
+    Per config (in order): its knobs, summarize() of its first matches cached matches, and the
+    standard error of the mean duration (s).
+    """
+    results = read_results(path)
+    keys = results["config_key"]
+    rows = []
+    for config in configs:
+        mask = (keys == np.uint64(config_key(config, seed))) & (results["match_id"] < matches)
+        subset = {name: values[mask] for name, values in results.items()}
+        row = {name: getattr(config, name) for name in MatchConfig.KNOBS if getattr(config, name) is not None}
+        row.update(summarize(subset))
+        durations = subset["duration_s"]
+        row["duration_sem"] = float(durations.std(ddof=1) / np.sqrt(len(durations))) if len(durations) > 1 else 0.0
+        rows.append(row)
+    return rows
+
+
+def marginals(rows: list, knob: str, metric: str) -> dict:
+    """Mean of metric over the configs sharing each value of knob."""
+    groups = {}
+    for row in rows:
+        if knob in row and metric in row:
+            groups.setdefault(row[knob], []).append(row[metric])
+    return {value: float(np.mean(values)) for value, values in sorted(groups.items())}
+
+
+def _parse_values(text: str) -> tuple:
+    # 'name=a,b,c' -> (name, [a, b, c])
+    name, sep, values = text.partition("=")
+    if not sep:
+        raise ValueError(f"expected KNOB=V1,V2,..., got {text!r}")
+    return name.strip(), [float(v) for v in values.split(",")]
+
+
+def _parse_range(text: str) -> tuple:
+    # 'name=low:high' -> (name, (low, high))
+    name, sep, bounds = text.partition("=")
+    low, colon, high = bounds.partition(":")
+    if not sep or not colon:
+        raise ValueError(f"expected KNOB=LOW:HIGH, got {text!r}")
+    return name.strip(), (float(low), float(high))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cache", help="results cache directory (created, or reused if it exists)")
+    parser.add_argument("--grid", action="append", default=[], metavar="KNOB=V1,V2,...", help="grid search values")
+    parser.add_argument("--random", type=int, default=0, metavar="N", help="random search: sample N configs")
+    parser.add_argument("--range", action="append", default=[], metavar="KNOB=LOW:HIGH", help="random search range")
+    parser.add_argument("--choice", action="append", default=[], metavar="KNOB=V1,V2,...", help="random search choices")
+    parser.add_argument("--sample-seed", type=int, default=0, help="seed of the random search")
+    parser.add_argument("--matches", type=int, default=16, help="matches per config")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=1, help="seed of match 0 of every config")
+    parser.add_argument("--bots", type=int, default=8)
+    parser.add_argument("--world", type=int, nargs=2, default=(1600, 1200), metavar=("W", "H"))
+    parser.add_argument("--ticks", type=int, default=7200, help="time limit per match (ticks)")
+    parser.add_argument("--starting-ammo", type=int, default=0)
+    parser.add_argument("--set", action="append", default=[], metavar="KNOB=VALUE", help="knob fixed for every config")
+    parser.add_argument("--metric", default="duration_s", help="metric for the per-knob marginals and sorting")
+    parser.add_argument("--sort", action="store_true", help="list configs by --metric instead of sweep order")
+    args = parser.parse_args(argv)
+
+    try:
+        base = MatchConfig(args.bots, args.world, args.ticks, args.starting_ammo)
+        base = base.with_knobs(**dict(parse_knob(text) for text in args.set))
+        if args.random:
+            configs = random_configs(base, args.random, dict(_parse_range(t) for t in args.range),
+                                     dict(_parse_values(t) for t in args.choice), args.sample_seed)
+        else:
+            if args.range or args.choice:
+                parser.error("--range / --choice need --random N")
+            configs = grid_configs(base, dict(_parse_values(t) for t in args.grid))
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    total = len(configs) * args.matches
+    print(f"{len(configs)} configs x {args.matches} matches")
+    progress = [0]
+
+    def report(config, row):
+        progress[0] += 1
+        if progress[0] % 10 == 0:
+            print(f"  {progress[0]} matches played")
+
+    start = time.perf_counter()
+    try:
+        ran = run_sweep(args.cache, configs, args.matches, args.seed, args.jobs, on_result=report)
+    except ValueError as exc:
+        parser.error(str(exc))
+    print(f"ran {ran} matches in {time.perf_counter() - start:.1f} s ({total - ran} from cache)")
+
+    rows = aggregate(args.cache, configs, args.matches, args.seed)
+    varied = [name for name in MatchConfig.KNOBS if len({row.get(name) for row in rows}) > 1]
+    if args.sort:
+        rows.sort(key=lambda row: row.get(args.metric, 0.0))
+    metrics = ("matches", "decided", "duration_s", "duration_sem", "kills", "damage_dealt", "pickups")
+    columns = [(name, max(12, len(name))) for name in varied + list(metrics)]
+    print("  ".join(f"{name:>{width}}" for name, width in columns))
+    for row in rows:
+        print("  ".join(f"{row.get(name, float('nan')):>{width}.4g}" for name, width in columns))
+    for knob in varied:
+        means = ", ".join(f"{value:g}: {mean:.4g}" for value, mean in marginals(rows, knob, args.metric).items())
+        print(f"{args.metric} by {knob}: {means}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""Headless bot tournaments on a process pool.
+
+Every match is an AI-only Arena built from its own seed and a MatchConfig (roster size, world size,
+time limit and balance knobs), simulated without rendering until one cow is left or the time limit
+hits. Matches fan out over a concurrent.futures process pool; the parent streams each finished
+match as one row into a columnar results directory (ResultsStore: one little-endian binary file per
+column plus schema.json), so an interrupted tournament resumes by skipping the match ids already
+stored. Columns load as NumPy arrays with read_results(path).
+
+Run: python -m Game.tournament OUT [--matches 100] [--jobs N] [--bots 8] [--seed 1] [--ticks 7200]
+     [--set damage=15 --set projectile_speed=1200 ...]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from Game.headless import init_headless, create_headless_arena
+from Game.Weapons import make_bow
+
+SCHEMA_VERSION = 3
+
+
+class MatchConfig:
+    """
+    Setup of one tournament match. Knobs left at None keep the game's own values (constructor
+    defaults, the bow from make_bow, or the per-field drop chance rolled by world generation).
+    """
+
+    # Balance knobs, grouped by what they tune; all are stored as result columns (NaN where unset)
+    COW_KNOBS = ("move_speed", "ammo_find_probability", "eating_slowdown_pct", "eat_growth_percent",
+                 "scale_health_factor", "scale_speed_factor")
+    FIELD_KNOBS = ("drop_probability",)
+    WEAPON_KNOBS = ("ammo_per_shot", "projectile_speed", "damage")
+    KNOBS = COW_KNOBS + FIELD_KNOBS + WEAPON_KNOBS
+    __slots__ = ("bots", "world_size", "max_ticks", "starting_ammo") + KNOBS
+    DEFAULT_MOVE_SPEED = 180.0  # px / second
+
+    def __init__(self, bots: int = 8, world_size=(1600, 1200), max_ticks: int = 7200, starting_ammo: int = 0,
+                 move_speed: float = None, ammo_find_probability: float = None, eating_slowdown_pct: float = None,
+                 eat_growth_percent: float = None, scale_health_factor: float = None, scale_speed_factor: float = None,
+                 drop_probability: float = None, ammo_per_shot: int = None, projectile_speed: float = None,
+                 damage: float = None):
+        self.bots = int(bots)
+        self.world_size = (int(world_size[0]), int(world_size[1]))
+        self.max_ticks = int(max_ticks)
+        self.starting_ammo = int(starting_ammo)
+        self.move_speed = move_speed
+        self.ammo_find_probability = ammo_find_probability
+        self.eating_slowdown_pct = eating_slowdown_pct
+        self.eat_growth_percent = eat_growth_percent
+        self.scale_health_factor = scale_health_factor
+        self.scale_speed_factor = scale_speed_factor
+        self.drop_probability = drop_probability
+        self.ammo_per_shot = ammo_per_shot
+        self.projectile_speed = projectile_speed
+        self.damage = damage
+
+    def with_knobs(self, **knobs):
+        """Copy of this config with some knobs replaced."""
+        for name in knobs:
+            if name not in self.KNOBS:
+                raise ValueError(f"unknown knob {name!r} (expected one of {', '.join(self.KNOBS)})")
+        return MatchConfig.from_dict({**self.to_dict(), **knobs})
+
+    def to_dict(self) -> dict:
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values["world_size"] = list(self.world_size)
+        return values
+
+    @classmethod
+    def from_dict(cls, values: dict):
+        return cls(**values)
+
+    def fingerprint(self) -> str:
+        """Stable hash of the config, used to refuse resuming a results directory with a different setup."""
+        return hashlib.sha1(json.dumps(self.to_dict(), sort_keys=True).encode()).hexdigest()[:16]
+
+
+class MatchStats:
+    """Per-cow damage dealt, kills and pickups, fed by the arena's on_damage / on_pickup hooks."""
+
+    def __init__(self, arena):
+        self.index = {id(c): i for i, c in enumerate(arena.characters)}
+        count = len(arena.characters)
+        self.damage = [0.0] * count
+        self.kills = [0] * count
+        self.pickups = [0] * count
+        self.dead = [False] * count
+        arena.on_damage = self.on_damage
+        arena.on_pickup = self.on_pickup
+
+    def on_damage(self, attacker, victim, amount):
+        attacker_index = self.index.get(id(attacker), -1)
+        victim_index = self.index[id(victim)]
+        if attacker_index >= 0:
+            self.damage[attacker_index] += amount
+        if victim.is_dead() and not self.dead[victim_index]:
+            self.dead[victim_index] = True
+            if attacker_index >= 0:
+                self.kills[attacker_index] += 1
+
+    def on_pickup(self, character, pickup):
+        self.pickups[self.index[id(character)]] += 1
+
+
+def build_match(seed: int, config: MatchConfig):
+    """Headless arena for one match: world generated from seed, config.bots AI cows at seeded spots."""
+    from Game.Character.ai_cow import AICow
+    from Game.rng import STREAM_WORLD
+
+    arena = create_headless_arena(world_size=config.world_size, seed=seed)
+    if config.drop_probability is not None:
+        for field in arena.golden_fields:
+            field.drop_probability = float(config.drop_probability)
+    weapon = {name: getattr(config, name) for name in MatchConfig.WEAPON_KNOBS if getattr(config, name) is not None}
+    if weapon:
+        arena.make_drop_weapon = partial(make_bow, **weapon)
+    move_speed = MatchConfig.DEFAULT_MOVE_SPEED if config.move_speed is None else config.move_speed
+    w, h = arena.world_dimensions
+    spawn = arena.rng.stream(STREAM_WORLD)
+    for i in range(config.bots):
+        cow = AICow((0, 0, 50, 50), f"bot{i + 1}", (spawn.randint(40, w - 40), spawn.randint(40, h - 40)),
+                    camera_display_size=(900, 600), world_display_size=(w, h), move_speed=move_speed,
+                    starting_ammo=config.starting_ammo)
+        for name in MatchConfig.COW_KNOBS[1:]:
+            value = getattr(config, name)
+            if value is not None:
+                setattr(cow, name, float(value))
+        arena.add_new_character(cow)
+    return arena
+
+
+def run_match(match_id: int, seed: int, config: MatchConfig) -> dict:
+    """Simulate one match to its end; returns its result row."""
+    start = time.perf_counter()
+    arena = build_match(seed, config)
+    stats = MatchStats(arena)
+    characters = arena.characters
+    alive = len(characters)
+    while arena.tick_count < config.max_ticks and alive > 1:
+        arena.tick()
+        alive = sum(1 for c in characters if not c.is_dead())
+    survivors = [i for i, c in enumerate(characters) if not c.is_dead()]
+    # The last cow standing wins; at the time limit, the survivor with the most kills, then health
+    decided = len(survivors) == 1
+    if survivors:
+        winner = max(survivors, key=lambda i: (stats.kills[i], characters[i].health, -i))
+    else:
+        winner = -1
+    row = {
+        "match_id": match_id,
+        "seed": seed,
+        "winner": winner,
+        "decided": decided,
+        "survivors": len(survivors),
+        "duration_ticks": arena.tick_count,
+        "duration_s": arena.tick_count / arena.tick_rate,
+        "damage_dealt": sum(stats.damage),
+        "kills": sum(stats.kills),
+        "pickups": sum(stats.pickups),
+        "winner_damage_dealt": stats.damage[winner] if winner >= 0 else 0.0,
+        "winner_kills": stats.kills[winner] if winner >= 0 else 0,
+        "top_kills": max(stats.kills, default=0),
+        "wall_ms": (time.perf_counter() - start) * 1000.0,
+    }
+    for knob in MatchConfig.KNOBS:
+        value = getattr(config, knob)
+        row[knob] = np.nan if value is None else float(value)
+    return row
+
+
+# Result columns in file order: name -> little-endian dtype
+COLUMNS = {
+    "match_id": "<i8", "seed": "<i8", "winner": "<i4", "decided": "?", "survivors": "<i4", "duration_ticks": "<i4",
+    "duration_s": "<f8", "damage_dealt": "<f8", "kills": "<i4", "pickups": "<i4", "winner_damage_dealt": "<f8", "winner_kills": "<i4",
+    "top_kills": "<i4", "wall_ms": "<f8",
+    **{knob: "<f8" for knob in MatchConfig.KNOBS},
+}
+
+
+class ResultsStore:
+    """
+    Append-only columnar results: path/schema.json plus one raw little-endian file per column.
+    A row is appended to every column file and flushed before the next; on open, columns are cut
+    back to the shortest one, so a row half-written when the process died is dropped and rerun.
+    """
+
+    def __init__(self, path, meta: dict = None, columns: dict = COLUMNS):
+        self.path = path
+        self.columns = columns
+        os.makedirs(path, exist_ok=True)
+        schema_path = os.path.join(path, "schema.json")
+        if os.path.exists(schema_path):
+            with open(schema_path) as f:
+                schema = json.load(f)
+            if schema.get("columns") != columns or schema.get("version") != SCHEMA_VERSION:
+                raise ValueError(f"{path} holds results in a different format")
+            if meta is not None and schema.get("meta") != meta:
+                raise ValueError(f"{path} holds results of a different tournament setup")
+            self.meta = schema.get("meta")
+        else:
+            self.meta = meta
+            with open(schema_path, "w") as f:
+                json.dump({"version": SCHEMA_VERSION, "columns": columns, "meta": meta}, f, indent=1)
+        self.rows = self._truncate_to_complete_rows()
+        self._files = {name: open(self._column_path(name), "ab") for name in columns}
+
+    def _column_path(self, name):
+        return os.path.join(self.path, name + ".col")
+
+    def _truncate_to_complete_rows(self) -> int:
+        counts = []
+        for name, dtype in self.columns.items():
+            path = self._column_path(name)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            counts.append(size // np.dtype(dtype).itemsize)
+        rows = min(counts)
+        for name, dtype in self.columns.items():
+            path = self._column_path(name)
+            with open(path, "ab") as f:
+                f.truncate(rows * np.dtype(dtype).itemsize)
+        return rows
+
+    def column(self, name) -> np.ndarray:
+        """One stored column (flushed rows only)."""
+        return np.fromfile(self._column_path(name), dtype=self.columns[name])[:self.rows]
+
+    def completed(self) -> set:
+        """Match ids already stored."""
+        return set(self.column("match_id").tolist())
+
+    def append(self, row: dict):
+        for name, dtype in self.columns.items():
+            f = self._files[name]
+            f.write(np.asarray(row[name], dtype=dtype).tobytes())
+            f.flush()
+        self.rows += 1
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def read_results(path) -> dict:
+    """Every column of a results directory as a NumPy array (complete rows only)."""
+    with open(os.path.join(path, "schema.json")) as f:
+        columns = json.load(f)["columns"]
+    data = {name: np.fromfile(os.path.join(path, name + ".col"), dtype=dtype) for name, dtype in columns.items()}
+    rows = min((len(values) for values in data.values()), default=0)
+    return {name: values[:rows] for name, values in data.items()}
+
+
+def _init_worker():
+    init_headless()
+
+
+def play_matches(tasks, jobs: int = None):
+    """
+    Play (tag, match_id, seed, config) tasks on jobs worker processes, yielding (tag, row) as each
+    match finishes (in completion order). Only a few matches per worker are queued at a time.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    tasks = iter(tasks)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        running = {}
+        while True:
+            while len(running) < jobs * 2:
+                task = next(tasks, None)
+                if task is None:
+                    break
+                tag, match_id, seed, config = task
+                running[pool.submit(run_match, match_id, seed, config)] = tag
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield running.pop(future), future.result()
+
+
+def run_tournament(path, matches: int, config: MatchConfig, seed: int = 1, jobs: int = None, on_result=None) -> int:
+    """
+    Run matches seed, seed + 1, ... (match_id 0 .. matches - 1) on jobs worker processes, appending
+    each result to the store at path as it finishes. Matches already stored are skipped, so rerunning
+    after an interruption completes the tournament. Returns how many matches ran now.
+    """
+    meta = {"seed": int(seed), "config": config.to_dict()}
+    ran = 0
+    with ResultsStore(path, meta) as store:
+        completed = store.completed()
+        tasks = ((None, i, int(seed) + i, config) for i in range(int(matches)) if i not in completed)
+        for _, row in play_matches(tasks, jobs):
+            store.append(row)
+            ran += 1
+            if on_result is not None:
+                on_result(row)
+    return ran
+
+
+def summarize(results: dict) -> dict:
+    matches = len(results["match_id"])
+    if not matches:
+        return {"matches": 0}
+    return {
+        "matches": matches,
+        "decided": float(results["decided"].mean()),
+        "duration_s": float(results["duration_s"].mean()),
+        "kills": float(results["kills"].mean()),
+        "damage_dealt": float(results["damage_dealt"].mean()),
+        "pickups": float(results["pickups"].mean()),
+        "wall_s": float(results["wall_ms"].mean()) / 1000.0,
+    }
+
+
+def parse_knob(text: str) -> tuple:
+    """'name=value' -> (name, float value)."""
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise ValueError(f"expected KNOB=VALUE, got {text!r}")
+    return name.strip(), float(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out", help="results directory (created, or resumed if it exists)")
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=1, help="seed of match 0; match i uses seed + i")
+    parser.add_argument("--bots", type=int, default=8)
+    parser.add_argument("--world", type=int, nargs=2, default=(1600, 1200), metavar=("W", "H"))
+    parser.add_argument("--ticks", type=int, default=7200, help="time limit per match (ticks)")
+    parser.add_argument("--starting-ammo", type=int, default=0)
+    parser.add_argument("--ammo-find", type=float, default=None, help="Cow.ammo_find_probability")
+    parser.add_argument("--eat-growth", type=float, default=None, help="Cow.eat_growth_percent")
+    parser.add_argument("--scale-speed", type=float, default=None, help="Cow.scale_speed_factor")
+    parser.add_argument("--drop-probability", type=float, default=None, help="GoldenField.drop_probability")
+    parser.add_argument("--set", action="append", default=[], metavar="KNOB=VALUE",
+                        help=f"any other knob ({', '.join(MatchConfig.KNOBS)}); repeatable")
+    args = parser.parse_args(argv)
+
+    config = MatchConfig(args.bots, args.world, args.ticks, starting_ammo=args.starting_ammo,
+                         ammo_find_probability=args.ammo_find, eat_growth_percent=args.eat_growth,
+                         scale_speed_factor=args.scale_speed, drop_probability=args.drop_probability)
+    try:
+        config = config.with_knobs(**dict(parse_knob(text) for text in args.set))
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    def report(row):
+        winner = f"bot{row['winner'] + 1}" if row["winner"] >= 0 else "none"
+        if not row["decided"]:
+            winner += "*"
+        print(f"match {row['match_id']:>5}: winner {winner:<6} {row['duration_s']:7.1f} s, "
+              f"kills {row['kills']}, damage {row['damage_dealt']:.0f}, pickups {row['pickups']} ({row['wall_ms'] / 1000.0:.1f} s)")
+
+    start = time.perf_counter()
+    try:
+        ran = run_tournament(args.out, args.matches, config, args.seed, args.jobs, on_result=report)
+    except ValueError as exc:
+        parser.error(str(exc))
+    elapsed = time.perf_counter() - start
+    print(f"ran {ran} matches in {elapsed:.1f} s")
+    summary = summarize(read_results(args.out))
+    print(", ".join(f"{name} {value:.3g}" if isinstance(value, float) else f"{name} {value}" for name, value in summary.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,18 @@ import math
 import os
 import random
 import sys
+import time
 
 import pygame
 from Agent.Helpers.handle_backup import save_backup
 from Agent.agent_main import AgentMain
 from Game.Arena.arena import Arena
-from Game.Character.cow import Cow
-from Game.Character.ai_cow import AICow
+from Game.match import populate_match
+from Game.replay import InputRecorder
+from Game.controls import PLAYER_KEY_BINDINGS, convert_key_to_string
 from Game.UI_Components.menu import Menu
+from Game.game_loop import FixedTimestep
+from Game.assets import preload as preload_assets
 import logging
 
 from Game.constants import BORDER, FONT
@@ -27,27 +31,6 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s"
 )
 
-def convert_key_to_string(key):
-    keys = []
-    if key[pygame.K_d]:
-        keys.append("right")
-    if key[pygame.K_a]:
-        keys.append("left")
-    if key[pygame.K_w]:
-        keys.append("up")
-    if key[pygame.K_s]:
-        keys.append("down")
-    # Camera zoom controls (keyboard)
-    if key[pygame.K_e] or key[pygame.K_EQUALS]:
-        keys.append("zoom_in")
-    if key[pygame.K_q] or key[pygame.K_MINUS]:
-        keys.append("zoom_out")
-    if key[pygame.K_SPACE]:
-        keys.append("eat")
-    if key[pygame.K_p]:
-        keys.append("poop")
-    return keys
-
 if __name__ == "__main__":
 
     save_backup()
@@ -64,6 +47,8 @@ if __name__ == "__main__":
     pygame.display.set_caption("Test")
 
     world_surf = pygame.Surface(world_size).convert_alpha()
+    # Decode every sprite up front instead of lazily during gameplay
+    preload_assets()
 
     FONT = pygame.font.SysFont(None, 22)
     BIG_FONT = pygame.font.SysFont(None, 28)
@@ -74,31 +59,42 @@ if __name__ == "__main__":
 
     arena = Arena((0,0, camera_size[0], camera_size[1]), world_size, screen, world_surf, "Arena")
 
-    player = Cow((0, 0, 50, 50), "muuu", (WORLD_W * 0.5, WORLD_H * 0.5), camera_display_size=camera_size, world_display_size=world_size, ammo_find_probability=0.2, move_step=4)
-
-    arena.add_new_character(player)
-    # Spawn some AI cows
-    npc1 = AICow((0, 0, 50, 50), "npc1", (WORLD_W * 0.5 + 120, WORLD_H * 0.5), camera_display_size=camera_size, world_display_size=world_size, ammo_find_probability=0.1, move_step=3)
-    npc2 = AICow((0, 0, 50, 50), "npc2", (WORLD_W * 0.5 - 160, WORLD_H * 0.5 + 80), camera_display_size=camera_size, world_display_size=world_size, ammo_find_probability=0.1, move_step=3)
-    arena.add_new_character(npc1)
-    arena.add_new_character(npc2)
+    # Local players share the window in split screen, one key binding set each; then the AI cows
+    populate_match(arena, max(1, min(C.LOCAL_PLAYERS, len(PLAYER_KEY_BINDINGS))))
+    # python main.py --record PATH logs every input for headless replay (python -m Game.replay PATH)
+    recorder = InputRecorder(arena) if "--record" in sys.argv else None
+    record_path = sys.argv[sys.argv.index("--record") + 1] if recorder is not None else None
 
+    # Simulation runs at a fixed tick rate; rendering runs as often as MAX_FPS allows and interpolates
+    timestep = FixedTimestep(C.TICK_RATE)
+    last_time = time.perf_counter()
     while True:
+        now = time.perf_counter()
+        frame_time = now - last_time
+        last_time = now
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if recorder is not None:
+                    recorder.save(record_path)
                 pygame.quit()
                 sys.exit()
-            
+
+            if recorder is not None:
+                recorder.record_event(event)
             arena.handle_event(event)
 
+        for _ in range(timestep.advance(frame_time)):
+            pressed = pygame.key.get_pressed()
+            player_keys = [convert_key_to_string(pressed, PLAYER_KEY_BINDINGS[i]) for i in range(len(arena.players))]
+            if recorder is not None:
+                recorder.record_tick(player_keys=player_keys)
+            arena.tick(player_keys=player_keys)
 
-        keys = convert_key_to_string(pygame.key.get_pressed())
-        arena.handle_key_event(keys)
-        
-        arena.step()
+        arena.render(timestep.alpha)
         
         pygame.display.flip()
-        pygame.time.wait(10)
+        clock.tick(C.MAX_FPS)
 
 
 